@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+索引统计的增量缓存
+按 (文件路径, mtime, size) 记录每个每日文件的统计结果，
+只把新增或变化的文件合并进总计，删除的文件从总计中扣除
+"""
+
+import os
+import json
+
+import output_writer
+
+REPO_DIR = "/home/ubuntu/awesome-github-stars"
+CACHE_FILE = os.path.join('data', 'index_cache.json')
+CACHE_VERSION = 1
+
+def cache_path(repo_dir=None):
+    """缓存文件路径"""
+    return os.path.join(repo_dir or REPO_DIR, CACHE_FILE)
+
+def empty_cache():
+    """空缓存结构"""
+    return {
+        'version': CACHE_VERSION,
+        'files': {},
+        'totals': {'days': 0, 'projects': 0},
+        'languages': {},
+        'months': {}
+    }
+
+def load_cache(repo_dir=None):
+    """读取缓存，不存在或版本不符时返回空缓存"""
+    path = cache_path(repo_dir)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return empty_cache()
+    if cache.get('version') != CACHE_VERSION:
+        return empty_cache()
+    return cache
+
+def save_cache(cache, repo_dir=None):
+    """原子保存缓存（缓存不纳入版本控制，不计入输出统计）"""
+    path = cache_path(repo_dir)
+    output_writer.write_if_changed(path, json.dumps(cache, ensure_ascii=False), track=False)
+    return path
+
+def scan_daily_files(repo_dir=None):
+    """只扫描 YYYY/MM-Month/ 目录，返回 {相对路径: (mtime_ns, size)}"""
+    repo_dir = repo_dir or REPO_DIR
+    found = {}
+    for year in os.listdir(repo_dir):
+        year_dir = os.path.join(repo_dir, year)
+        if not (year.isdigit() and os.path.isdir(year_dir)):
+            continue
+        for month in os.listdir(year_dir):
+            month_dir = os.path.join(year_dir, month)
+            if not os.path.isdir(month_dir):
+                continue
+            with os.scandir(month_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.md') and entry.name != 'README.md' and entry.is_file():
+                        stat = entry.stat()
+                        found[f"{year}/{month}/{entry.name}"] = (stat.st_mtime_ns, stat.st_size)
+    return found
+
+def _apply(counter, other, sign):
+    """counter += sign * other，计数归零的键会被删除"""
+    for key, value in other.items():
+        counter[key] = counter.get(key, 0) + sign * value
+        if counter[key] <= 0:
+            del counter[key]
+
+def _fold(cache, rel_path, entry, sign):
+    """把单个文件的统计合并进（或扣除出）总计和月度汇总"""
+    totals = cache['totals']
+    totals['days'] += sign
+    totals['projects'] += sign * entry['projects']
+    _apply(cache['languages'], entry['languages'], sign)
+
+    month_key = entry['month']
+    month = cache['months'].setdefault(month_key, {'days': 0, 'projects': 0, 'languages': {}})
+    month['days'] += sign
+    month['projects'] += sign * entry['projects']
+    _apply(month['languages'], entry['languages'], sign)
+    if month['days'] <= 0:
+        del cache['months'][month_key]
+
+def summarize_projects(rel_path, projects, mtime_ns, size):
+    """单个每日文件的统计条目（语言按首次出现顺序记录）"""
+    languages = {}
+    for project in projects:
+        language = project.get('language', 'Unknown')
+        languages[language] = languages.get(language, 0) + 1
+    return {
+        'mtime_ns': mtime_ns,
+        'size': size,
+        'month': rel_path.rsplit('/', 1)[0],
+        'projects': len(projects),
+        'languages': languages
+    }
+
+def update_cache(loader, repo_dir=None, rebuild=False, preloaded=None):
+    """
+    增量更新缓存
+    loader(文件绝对路径) -> 项目列表，只对新增或变化的文件调用；
+    preloaded 为 {相对路径: 项目列表}，命中时直接使用内存中的数据，不再读文件
+    返回 (cache, stats)，stats 记录新增/变化/删除/复用的文件数
+    """
+    repo_dir = repo_dir or REPO_DIR
+    cache = empty_cache() if rebuild else load_cache(repo_dir)
+    current = scan_daily_files(repo_dir)
+    stats = {'added': 0, 'changed': 0, 'removed': 0, 'reused': 0}
+
+    # 扣除已删除的文件
+    for rel_path in [path for path in cache['files'] if path not in current]:
+        _fold(cache, rel_path, cache['files'].pop(rel_path), -1)
+        stats['removed'] += 1
+
+    # 合并新增或变化的文件
+    for rel_path in sorted(current):
+        mtime_ns, size = current[rel_path]
+        old = cache['files'].get(rel_path)
+        if old and old['mtime_ns'] == mtime_ns and old['size'] == size:
+            stats['reused'] += 1
+            continue
+        if old:
+            _fold(cache, rel_path, old, -1)
+            stats['changed'] += 1
+        else:
+            stats['added'] += 1
+        if preloaded and rel_path in preloaded:
+            projects = preloaded[rel_path]
+        else:
+            projects = loader(os.path.join(repo_dir, rel_path))
+        entry = summarize_projects(rel_path, projects, mtime_ns, size)
+        cache['files'][rel_path] = entry
+        _fold(cache, rel_path, entry, 1)
+
+    return cache, stats
+
+def top_languages(languages, limit):
+    """按数量降序（同数量按名称）取前 N 个语言"""
+    return sorted(languages.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+def month_entries(cache, month_key):
+    """某个月的每日条目，按日期排序"""
+    prefix = month_key + '/'
+    return sorted((path, entry) for path, entry in cache['files'].items() if path.startswith(prefix))
+
+def compare_caches(expected, actual):
+    """比较两个缓存的汇总部分，返回差异描述列表"""
+    differences = []
+    for key in ('totals', 'languages', 'months'):
+        if expected[key] != actual[key]:
+            differences.append(key)
+    return differences
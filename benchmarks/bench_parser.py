@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Trending 解析器基准测试
+先在样本语料（fixtures/ 下保存的页面 + 合成页面）上校验两个解析器输出完全一致，
+再分别计时 BeautifulSoup 路径和快速解析路径
+
+用法: python3 benchmarks/bench_parser.py [--pages 20] [--limit 8]
+"""
+
+import os
+import sys
+import json
+import glob
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import collect_projects
+import trending_parser
+from benchmarks import synthetic
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+def load_corpus(pages):
+    """样本语料：fixtures/*.html 加上若干合成页面"""
+    corpus = []
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, '*.html'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            corpus.append((os.path.basename(path), f.read()))
+    for seed in range(pages):
+        corpus.append((f"synthetic-{seed}", synthetic.trending_html(articles=25, seed=seed)))
+    return corpus
+
+def check_identical(corpus, limits):
+    """两个解析器在每个页面、每个 limit 下的输出必须完全一致"""
+    mismatches = []
+    for name, html in corpus:
+        for limit in limits:
+            expected = collect_projects.parse_trending_html_bs4(html, limit)
+            actual = trending_parser.parse_trending_fast(html, limit)
+            if expected != actual:
+                mismatches.append(f"{name} (limit={limit})")
+    return mismatches
+
+def time_parser(parse, corpus, limit, repeat):
+    """返回每页平均耗时（毫秒）"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for _, html in corpus:
+            parse(html, limit)
+    return (time.perf_counter() - start) * 1000 / (repeat * len(corpus))
+
+def main():
+    parser = argparse.ArgumentParser(description='Trending 解析器基准测试')
+    parser.add_argument('--pages', type=int, default=20, help='合成页面数量')
+    parser.add_argument('--limit', type=int, default=8, help='每页解析的项目数（与默认来源计划中 trending 的配额一致）')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    # 基准测试时关闭逐项目日志
+    collect_projects.log = lambda *a, **k: None
+
+    corpus = load_corpus(args.pages)
+    mismatches = check_identical(corpus, (None, args.limit))
+    if mismatches:
+        print(f"解析结果不一致: {', '.join(mismatches)}")
+        return 1
+
+    results = {}
+    for limit in (None, args.limit):
+        bs4_ms = time_parser(collect_projects.parse_trending_html_bs4, corpus, limit, args.repeat)
+        fast_ms = time_parser(trending_parser.parse_trending_fast, corpus, limit, args.repeat)
+        results[f"limit={limit}"] = {
+            'bs4_ms_per_page': round(bs4_ms, 3),
+            'fast_ms_per_page': round(fast_ms, 3),
+            'speedup': round(bs4_ms / fast_ms, 2) if fast_ms else None
+        }
+    print(json.dumps({'pages': len(corpus), 'identical': True, 'results': results}, ensure_ascii=False, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+collect → render → index 流水线基准测试
+为每种归档规模（默认 1、5、20 年的每日文件）生成合成归档，分别计时：
+- parse_trending: 解析合成 Trending 页面
+- create_markdown: 渲染当天的每日文件
+- update_monthly_index / update_main_readme: 冷启动（无统计缓存）和日常增量（已有缓存 + 新增一天）
+- update_month_indexes: 无清单时重建所有月份，以及日常增量（只有当月变化）
+- search_index: 检索索引冷启动、日常增量和一次带过滤条件的查询
+- static_api: 静态 JSON API 全量生成和日常增量
+每个阶段同时记录 tracemalloc 峰值内存，结果以 JSON 输出
+
+用法: python3 benchmarks/run_benchmarks.py [--years 1 5 20] [--output bench.json]
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import random
+import argparse
+import platform
+import tempfile
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import aggregate_cache
+import collect_projects
+import project_store
+import search_index
+import static_api
+import update_index
+from benchmarks import synthetic
+
+REPO_MODULES = (collect_projects, update_index, project_store, aggregate_cache, search_index, static_api)
+
+def use_repo_dir(repo_dir):
+    """把所有脚本的 REPO_DIR 指向临时归档"""
+    for module in REPO_MODULES:
+        module.REPO_DIR = repo_dir
+
+def quiet():
+    """关闭脚本日志，避免输出影响计时"""
+    collect_projects.log = lambda *a, **k: None
+    update_index.log = lambda *a, **k: None
+
+def measure(fn, setup=None, repeat=1):
+    """返回 (平均耗时秒数, tracemalloc 峰值字节)；计时和内存分两次运行，互不干扰"""
+    elapsed = 0.0
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        elapsed += time.perf_counter() - start
+    if setup:
+        setup()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return elapsed / repeat, peak
+
+def stage_result(seconds, peak):
+    return {'seconds': round(seconds, 6), 'peak_memory_bytes': peak}
+
+def bench_parse(pages, limit):
+    """解析阶段与归档规模无关，只跑一次"""
+    corpus = [synthetic.trending_html(articles=25, seed=seed) for seed in range(pages)]
+    seconds, peak = measure(lambda: [collect_projects.parse_trending_html(html, limit) for html in corpus])
+    result = stage_result(seconds, peak)
+    result['pages'] = pages
+    result['seconds_per_page'] = round(seconds / pages, 6)
+    return result
+
+def bench_archive(years, today, repeat):
+    """生成 years 年的合成归档并计时各阶段"""
+    repo_dir = tempfile.mkdtemp(prefix=f"bench-{years}y-")
+    try:
+        use_repo_dir(repo_dir)
+        days = int(years * 365)
+        start = time.perf_counter()
+        synthetic.generate_archive(collect_projects.create_markdown, today - timedelta(days=1), days - 1, seed=years)
+        generate_seconds = time.perf_counter() - start
+
+        rng = random.Random(-years)
+        todays_projects = synthetic.synthetic_projects(rng)
+        cache_file = aggregate_cache.cache_path(repo_dir)
+
+        def drop_cache():
+            if os.path.exists(cache_file):
+                os.remove(cache_file)
+
+        stages = {}
+        stages['create_markdown'] = stage_result(*measure(
+            lambda: collect_projects.create_markdown(todays_projects, today), repeat=repeat))
+        stages['update_monthly_index_cold'] = stage_result(*measure(
+            update_index.update_monthly_index, setup=drop_cache, repeat=repeat))
+        stages['update_main_readme_cold'] = stage_result(*measure(
+            update_index.update_main_readme, setup=drop_cache, repeat=repeat))
+
+        # 日常增量：缓存已包含历史，只有今天的文件发生变化
+        def warm_cache():
+            update_index.refresh_cache()
+            collect_projects.create_markdown(todays_projects, today)
+
+        stages['update_monthly_index_daily'] = stage_result(*measure(
+            update_index.update_monthly_index, setup=warm_cache, repeat=repeat))
+        stages['update_main_readme_daily'] = stage_result(*measure(
+            update_index.update_main_readme, setup=warm_cache, repeat=repeat))
+
+        manifest_file = os.path.join(repo_dir, update_index.MONTH_MANIFEST_FILE)
+
+        def drop_manifest():
+            if os.path.exists(manifest_file):
+                os.remove(manifest_file)
+
+        def warm_manifest():
+            update_index.update_month_indexes()
+            collect_projects.create_markdown(todays_projects, today)
+
+        stages['update_month_indexes_all'] = stage_result(*measure(
+            update_index.update_month_indexes, setup=drop_manifest, repeat=repeat))
+        stages['update_month_indexes_daily'] = stage_result(*measure(
+            update_index.update_month_indexes, setup=warm_manifest, repeat=repeat))
+
+        search_files = [os.path.join(repo_dir, name)
+                         for name in (search_index.INDEX_FILE, search_index.LOG_FILE, search_index.STATE_FILE)]
+
+        def drop_search_index():
+            for path in search_files:
+                if os.path.exists(path):
+                    os.remove(path)
+
+        def warm_search_index():
+            update_index.refresh_search_index()
+            collect_projects.create_markdown(todays_projects, today)
+
+        stages['search_index_cold'] = stage_result(*measure(
+            update_index.refresh_search_index, setup=drop_search_index, repeat=repeat))
+        stages['search_index_daily'] = stage_result(*measure(
+            update_index.refresh_search_index, setup=warm_search_index, repeat=repeat))
+        api_state = os.path.join(repo_dir, static_api.STATE_FILE)
+
+        def drop_api_state():
+            if os.path.exists(api_state):
+                os.remove(api_state)
+
+        def warm_api():
+            update_index.refresh_static_api()
+            collect_projects.create_markdown(todays_projects, today)
+
+        stages['static_api_cold'] = stage_result(*measure(
+            update_index.refresh_static_api, setup=drop_api_state, repeat=repeat))
+        stages['static_api_daily'] = stage_result(*measure(
+            update_index.refresh_static_api, setup=warm_api, repeat=repeat))
+
+        index = search_index.SearchIndex.load(repo_dir)
+        stages['search_query'] = stage_result(*measure(
+            lambda: index.search('data', language='Rust', date_from=f"{today.year}-01-01"), repeat=repeat))
+
+        return {
+            'years': years,
+            'days': days,
+            'generate_seconds': round(generate_seconds, 3),
+            'stages': stages
+        }
+    finally:
+        shutil.rmtree(repo_dir, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description='collect → render → index 流水线基准测试')
+    parser.add_argument('--years', type=float, nargs='+', default=[1, 5, 20], help='合成归档的年数')
+    parser.add_argument('--pages', type=int, default=20, help='解析阶段使用的合成 Trending 页面数')
+    parser.add_argument('--limit', type=int, default=8, help='每页解析的项目数')
+    parser.add_argument('--repeat', type=int, default=3, help='每个阶段的计时次数')
+    parser.add_argument('--output', help='把 JSON 结果写入文件（默认输出到标准输出）')
+    args = parser.parse_args()
+
+    quiet()
+    original_repo_dirs = [module.REPO_DIR for module in REPO_MODULES]
+    today = datetime.now().replace(hour=9, minute=0, second=0, microsecond=0)
+    try:
+        report = {
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'parse_trending': bench_parse(args.pages, args.limit),
+            'archives': [bench_archive(years, today, args.repeat) for years in args.years]
+        }
+    finally:
+        for module, repo_dir in zip(REPO_MODULES, original_repo_dirs):
+            module.REPO_DIR = repo_dir
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+基准测试用的合成数据
+生成结构与 GitHub Trending 一致的 HTML（含无描述、无语言、h1 标题等变体）
+"""
+
+import random
+
+LANGUAGES = ['Python', 'TypeScript', 'JavaScript', 'Rust', 'Go', 'C++', 'Java', 'Shell', 'C', 'Jupyter Notebook']
+WORDS = ['fast', 'open-source', 'framework', 'agent', 'database', 'toolkit', 'library', 'compiler',
+         'AI', 'LLM', 'web', 'terminal', 'editor', 'runtime', 'engine', 'platform', 'kernel', 'CLI']
+
+def _sentence(rng, min_words=4, max_words=16):
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words)))
+
+def trending_article(rng, index):
+    """生成一个 article.Box-row"""
+    owner = f"owner{rng.randint(1, 5000)}"
+    repo = f"repo-{index}-{rng.randint(1, 99999)}"
+    href = f"/{owner}/{repo}"
+    heading_tag = 'h1' if rng.random() < 0.05 else 'h2'
+    parts = [
+        '<article class="Box-row">',
+        '  <div class="float-right d-flex">',
+        f'    <a href="/login?return_to={href}" rel="nofollow" class="tooltipped tooltipped-s btn-sm btn">'
+        '<svg aria-hidden="true" height="16" class="octicon octicon-star d-none d-md-inline-block mr-2">'
+        '<path d="M8 .25a.75.75 0 0 1 .673.418l1.882 3.815 4.21.612"></path></svg>Star\n</a>',
+        '  </div>',
+        f'  <{heading_tag} class="h3 lh-condensed">',
+        f'    <a data-view-component="true" class="Link" href="{href}">',
+        '      <svg aria-hidden="true" height="16" class="octicon octicon-repo mr-1 color-fg-muted"><path d="M2 2.5A2.5"/></svg>',
+        f'      <span data-view-component="true" class="text-normal">{owner} /</span>',
+        f'      {repo}',
+        f'</a>  </{heading_tag}>',
+    ]
+    if rng.random() < 0.9:
+        desc = _sentence(rng).replace('AI', 'AI &amp; ML').replace('web', '&lt;web&gt;')
+        css = 'col-9 color-fg-muted my-1 tmp-pr-4' if rng.random() < 0.95 else 'color-fg-muted my-1'
+        parts.append(f'    <p class="{css}">\n      {desc}\n    </p>')
+    parts.append('  <div class="f6 color-fg-muted mt-2">')
+    if rng.random() < 0.85:
+        parts.append('      <span class="d-inline-block ml-0 mr-3">\n'
+                     '  <span class="repo-language-color" style="background-color: #3572A5"></span>\n'
+                     f'  <span itemprop="programmingLanguage">{rng.choice(LANGUAGES)}</span>\n</span>')
+    parts.append(f'      <a href="{href}/stargazers" class="Link Link--muted d-inline-block mr-3">'
+                 '<svg aria-label="star" role="img" class="octicon octicon-star"><path d="M8"></path></svg>\n'
+                 f'        {rng.randint(100, 500000):,}\n</a>')
+    if rng.random() < 0.95:
+        parts.append(f'      <a href="{href}/forks" class="Link Link--muted d-inline-block mr-3">'
+                     '<svg aria-label="fork" role="img" class="octicon octicon-repo-forked"><path d="M5"></path></svg>\n'
+                     f'        {rng.randint(1, 80000):,}\n</a>')
+    parts.append('      <span data-view-component="true" class="d-inline-block mr-3">\n        Built by\n'
+                 '          <a class="d-inline-block" href="/someone"><img class="avatar mb-1 avatar-user" '
+                 'src="https://avatars.githubusercontent.com/u/1?s=40&amp;v=4" width="20" height="20" alt="@someone" /></a>\n</span>')
+    parts.append('      <span class="d-inline-block float-sm-right">\n'
+                 '        <svg aria-hidden="true" class="octicon octicon-star"><path d="M8"></path></svg>\n'
+                 f'        {rng.randint(1, 3000):,} stars today\n      </span>')
+    parts.append('  </div>\n</article>')
+    return '\n'.join(parts)
+
+def trending_html(articles=25, seed=0, padding_kb=200):
+    """生成一页 Trending HTML；padding_kb 模拟真实页面中 article 之外的头部脚本和导航"""
+    rng = random.Random(seed)
+    head_script = '<script type="application/json">' + ('{"k":"v"},' * (padding_kb * 1024 // 10)) + '</script>'
+    nav = '<nav class="subnav">' + ''.join(f'<a class="subnav-item" href="/trending/{lang}">{lang}</a>'
+                                         for lang in LANGUAGES * 20) + '</nav>'
+    body = '\n'.join(trending_article(rng, index) for index in range(articles))
+    return (f'<!DOCTYPE html><html><head><title>Trending</title>{head_script}</head>'
+            f'<body><div class="application-main"><main>{nav}<div class="Box"><div data-hpc>\n{body}\n'
+            '</div></div></main></div><footer class="footer">' + _sentence(rng, 50, 80) + '</footer></body></html>')
+
+def synthetic_projects(rng, count=15, trending=8):
+    """生成一天的项目记录（字段与 collect_projects 输出一致）"""
+    projects = []
+    for index in range(count):
+        name = f"owner{rng.randint(1, 20000)}/repo{rng.randint(1, 200000)}"
+        is_trending = index < trending
+        projects.append({
+            'name': name,
+            'url': f"https://github.com/{name}",
+            'description': _sentence(rng),
+            'stars': 'N/A' if is_trending else f"{rng.randint(5000, 500000):,}",
+            'forks': f"{rng.randint(1, 80000):,}",
+            'language': rng.choice(LANGUAGES + ['Unknown', 'None']),
+            'today_stars': f"{rng.randint(1, 3000):,} stars today" if is_trending else '',
+            'source': 'trending' if is_trending else 'top-stars'
+        })
+    return projects
+
+def generate_archive(render, end_date, days, seed=0, per_day=15):
+    """
+    生成 days 天的合成归档（截止 end_date，含当天）
+    render(projects, date) 负责写入每日文件，通常就是 collect_projects.create_markdown
+    """
+    from datetime import timedelta
+    rng = random.Random(seed)
+    for offset in range(days - 1, -1, -1):
+        render(synthetic_projects(rng, per_day), end_date - timedelta(days=offset))
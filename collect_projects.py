@@ -7,14 +7,26 @@ GitHub 高 Star 项目自动收集脚本
 优化版本：增强错误处理、重试机制、日志系统
 """
 
-import requests
-from bs4 import BeautifulSoup
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 import os
 import sys
-import time
-import random
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import daily_diff
+import enrich
+import fetcher
+import http_cache
+import metrics
+import output_writer
+import project_store
+import ranking
+import seen_index
+import sources
+import timeseries
+import trending_parser
+import update_index
 
 # 配置
 REPO_DIR = "/home/ubuntu/awesome-github-stars"
@@ -27,10 +39,6 @@ HEADERS = {
     'Upgrade-Insecure-Requests': '1'
 }
 
-# 重试配置
-MAX_RETRIES = 3
-RETRY_DELAY = 5  # 秒
-
 def log(message, level="INFO"):
     """增强的日志输出"""
     timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -44,255 +52,382 @@ def log(message, level="INFO"):
     emoji = level_emoji.get(level, "📝")
     print(f"[{timestamp}] {emoji} [{level}] {message}")
 
-def retry_on_failure(func, *args, max_retries=MAX_RETRIES, **kwargs):
-    """通用重试装饰器"""
-    for attempt in range(1, max_retries + 1):
-        try:
-            return func(*args, **kwargs)
-        except Exception as e:
-            if attempt < max_retries:
-                log(f"尝试 {attempt}/{max_retries} 失败: {e}，{RETRY_DELAY}秒后重试...", "WARNING")
-                time.sleep(RETRY_DELAY)
-            else:
-                log(f"所有重试失败: {e}", "ERROR")
-                raise
-    return None
-
-def get_trending_projects(limit=8):
-    """获取 GitHub Trending 项目（增强版）"""
-    url = "https://github.com/trending"
+# Top Stars 排序方式：stars / forks / growth / score
+TOP_STARS_RANKING = os.environ.get('TOP_STARS_RANKING', 'stars')
+
+# Trending 视图：周期 × 语言（逗号分隔，默认只抓全部语言），一次并发抓取后合并去重
+TRENDING_PERIODS = [period.strip() for period in os.environ.get('TRENDING_PERIODS', 'daily,weekly,monthly').split(',')
+                    if period.strip()]
+TRENDING_LANGUAGES = [None] + [language.strip() for language in os.environ.get('TRENDING_LANGUAGES', '').split(',')
+                               if language.strip()]
+
+# 解析器：fast（默认，增量分词）或 bs4（完整 BeautifulSoup 解析）
+TRENDING_PARSER = os.environ.get('TRENDING_PARSER', 'fast')
+
+# 响应缓存配置（HTTP_CACHE_DIR 可覆盖缓存目录，CI 中指向 actions/cache 恢复的路径）
+CACHE_DIR = os.environ.get('HTTP_CACHE_DIR') or os.path.join(REPO_DIR, '.cache', 'http')
+CACHE_TTL = http_cache.DEFAULT_TTL
+
+_session = None
+_response_cache = None
+_seen_index = None
+_candidate_pool = None
+
+def get_session():
+    """共享的 HTTP Session（连接池在所有请求之间复用）"""
+    global _session
+    if _session is None:
+        _session = fetcher.create_session(HEADERS)
+    return _session
+
+def get_response_cache():
+    """共享的磁盘响应缓存"""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = http_cache.ResponseCache(CACHE_DIR, ttl=CACHE_TTL)
+    return _response_cache
+
+def get_seen_index():
+    """跨天去重索引（优先选择冷却期内没有出现过的仓库）"""
+    global _seen_index
+    if _seen_index is None:
+        _seen_index = seen_index.SeenIndex(REPO_DIR)
+    return _seen_index
+
+def report_cache_stats():
+    """在运行日志中输出缓存命中情况，并按大小上限淘汰旧条目"""
+    if _response_cache is None:
+        return
+    _response_cache.evict()
+    for name, value in _response_cache.stats.items():
+        metrics.incr(f"http_cache_{name}", value)
+    log(f"HTTP 缓存: {_response_cache.summary()}", "INFO")
+
+def parse_trending_html(html, limit=None):
+    """解析 Trending 页面 HTML：默认走快速解析器，解析不到项目时回退到 BeautifulSoup"""
+    with metrics.stage('parse'):
+        projects = _parse_trending_html(html, limit)
+    metrics.incr('pages_parsed')
+    metrics.incr('articles_parsed', len(projects))
+    return projects
+
+def _parse_trending_html(html, limit=None):
+    if TRENDING_PARSER == 'fast':
+        projects = trending_parser.parse_trending_fast(html, limit)
+        if projects:
+            for project in projects:
+                log(f"收集项目: {project['name']} ({project['language']})", "DEBUG")
+            log(f"从 Trending 成功获取 {len(projects)} 个项目", "SUCCESS")
+            return projects
+        log("快速解析器未解析到项目，回退到 BeautifulSoup", "WARNING")
+    return parse_trending_html_bs4(html, limit)
+
+def parse_trending_html_bs4(html, limit=None):
+    """使用 BeautifulSoup 解析 Trending 页面 HTML，返回项目列表"""
+    from bs4 import BeautifulSoup
     
-    def fetch_trending():
-        log(f"正在访问 GitHub Trending: {url}", "DEBUG")
-        response = requests.get(url, headers=HEADERS, timeout=20)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        projects = []
-        
-        # 尝试多种选择器
-        articles = soup.find_all('article', class_='Box-row')
-        if not articles:
-            articles = soup.find_all('article')
-        
-        log(f"找到 {len(articles)} 个候选项目", "DEBUG")
-        
-        for article in articles[:limit]:
-            try:
-                # 项目名称和链接
-                h2 = article.find('h2')
-                if not h2:
-                    h2 = article.find('h1', class_='h3')
-                
-                if h2 and h2.find('a'):
-                    link = h2.find('a')
-                    repo_name = link.get('href', '').strip('/')
-                    repo_url = f"https://github.com{link.get('href', '')}"
-                    
-                    # 描述
-                    desc_elem = article.find('p', class_='col-9')
-                    if not desc_elem:
-                        desc_elem = article.find('p')
-                    description = desc_elem.text.strip() if desc_elem else "No description available"
-                    
-                    # Stars
-                    stars_elem = article.find('svg', class_='octicon-star')
-                    stars = "N/A"
-                    if stars_elem and stars_elem.parent:
-                        stars_text = stars_elem.parent.text.strip()
-                        import re
-                        match = re.search(r'([\d,]+)', stars_text)
-                        if match:
-                            stars = match.group(1)
-                    
-                    # 语言
-                    lang_elem = article.find('span', itemprop='programmingLanguage')
-                    language = lang_elem.text.strip() if lang_elem else "Unknown"
-                    
-                    # 今日新增 stars
-                    today_stars = ""
-                    stars_today_elem = article.find('span', class_='d-inline-block float-sm-right')
-                    if stars_today_elem:
-                        today_stars = stars_today_elem.text.strip()
-                    
-                    # Forks（尝试获取）
-                    forks = "N/A"
-                    fork_elem = article.find('svg', class_='octicon-repo-forked')
-                    if fork_elem and fork_elem.parent:
-                        forks_text = fork_elem.parent.text.strip()
-                        import re
-                        match = re.search(r'([\d,]+)', forks_text)
-                        if match:
-                            forks = match.group(1)
-                    
-                    project = {
-                        'name': repo_name,
-                        'url': repo_url,
-                        'description': description,
-                        'stars': stars,
-                        'forks': forks,
-                        'language': language,
-                        'today_stars': today_stars,
-                        'source': 'trending'
-                    }
-                    
-                    projects.append(project)
-                    log(f"收集项目: {repo_name} ({language})", "DEBUG")
-                    
-            except Exception as e:
-                log(f"解析单个项目失败: {e}", "WARNING")
-                continue
-        
-        if len(projects) == 0:
-            raise Exception("未能解析到任何项目，可能页面结构已变化")
-        
-        log(f"从 Trending 成功获取 {len(projects)} 个项目", "SUCCESS")
-        return projects
+    soup = BeautifulSoup(html, 'html.parser')
+    projects = []
     
-    try:
-        return retry_on_failure(fetch_trending)
-    except Exception as e:
-        log(f"获取 Trending 项目失败: {e}", "ERROR")
-        return []
-
-def get_top_starred_projects(limit=7):
-    """获取历史高 star 项目（扩展版）"""
-    projects = [
-        {
-            'name': 'codecrafters-io/build-your-own-x',
-            'url': 'https://github.com/codecrafters-io/build-your-own-x',
-            'stars': '458,524',
-            'forks': '42,983',
-            'language': 'Markdown',
-            'description': 'Master programming by recreating your favorite technologies from scratch.',
-            'source': 'top-stars'
-        },
-        {
-            'name': 'freeCodeCamp/freeCodeCamp',
-            'url': 'https://github.com/freeCodeCamp/freeCodeCamp',
-            'stars': '436,070',
-            'forks': '43,128',
-            'language': 'TypeScript',
-            'description': "freeCodeCamp.org's open-source codebase and curriculum. Learn to code for free.",
-            'source': 'top-stars'
-        },
-        {
-            'name': 'sindresorhus/awesome',
-            'url': 'https://github.com/sindresorhus/awesome',
-            'stars': '430,688',
-            'forks': '32,881',
-            'language': 'None',
-            'description': '😎 Awesome lists about all kinds of interesting topics',
-            'source': 'top-stars'
-        },
-        {
-            'name': 'public-apis/public-apis',
-            'url': 'https://github.com/public-apis/public-apis',
-            'stars': '392,084',
-            'forks': '41,968',
-            'language': 'Python',
-            'description': 'A collective list of free APIs',
-            'source': 'top-stars'
-        },
-        {
-            'name': 'EbookFoundation/free-programming-books',
-            'url': 'https://github.com/EbookFoundation/free-programming-books',
-            'stars': '380,748',
-            'forks': '65,761',
-            'language': 'None',
-            'description': '📚 Freely available programming books',
-            'source': 'top-stars'
-        },
-        {
-            'name': 'kamranahmedse/developer-roadmap',
-            'url': 'https://github.com/kamranahmedse/developer-roadmap',
-            'stars': '347,550',
-            'forks': '43,634',
-            'language': 'TypeScript',
-            'description': 'Interactive roadmaps, guides and other educational content to help developers grow.',
-            'source': 'top-stars'
-        },
-        {
-            'name': 'jwasham/coding-interview-university',
-            'url': 'https://github.com/jwasham/coding-interview-university',
-            'stars': '335,965',
-            'forks': '81,577',
-            'language': 'None',
-            'description': 'A complete computer science study plan to become a software engineer.',
-            'source': 'top-stars'
-        },
-        {
-            'name': 'donnemartin/system-design-primer',
-            'url': 'https://github.com/donnemartin/system-design-primer',
-            'stars': '332,703',
-            'forks': '54,087',
-            'language': 'Python',
-            'description': 'Learn how to design large-scale systems. Prep for the system design interview.',
-            'source': 'top-stars'
-        },
-        {
-            'name': 'vuejs/vue',
-            'url': 'https://github.com/vuejs/vue',
-            'stars': '210,000',
-            'forks': '33,000',
-            'language': 'JavaScript',
-            'description': '🖖 Vue.js is a progressive, incrementally-adoptable JavaScript framework.',
-            'source': 'top-stars'
-        },
-        {
-            'name': 'facebook/react',
-            'url': 'https://github.com/facebook/react',
-            'stars': '242,393',
-            'forks': '50,435',
-            'language': 'JavaScript',
-            'description': 'The library for web and native user interfaces.',
-            'source': 'top-stars'
-        },
-        {
-            'name': 'torvalds/linux',
-            'url': 'https://github.com/torvalds/linux',
-            'stars': '200,000',
-            'forks': '55,000',
-            'language': 'C',
-            'description': 'Linux kernel source tree',
-            'source': 'top-stars'
-        },
-        {
-            'name': 'microsoft/vscode',
-            'url': 'https://github.com/microsoft/vscode',
-            'stars': '180,000',
-            'forks': '32,000',
-            'language': 'TypeScript',
-            'description': 'Visual Studio Code',
-            'source': 'top-stars'
-        }
-    ]
+    # 尝试多种选择器
+    articles = soup.find_all('article', class_='Box-row')
+    if not articles:
+        articles = soup.find_all('article')
     
-    # 随机打乱并选择指定数量
-    random.shuffle(projects)
-    selected = projects[:limit]
+    log(f"找到 {len(articles)} 个候选项目", "DEBUG")
     
-    log(f"从 Top Stars 列表获取了 {len(selected)} 个项目", "SUCCESS")
-    return selected
+    for article in articles[:limit]:
+        try:
+            # 项目名称和链接
+            h2 = article.find('h2')
+            if not h2:
+                h2 = article.find('h1', class_='h3')
+            
+            if h2 and h2.find('a'):
+                link = h2.find('a')
+                repo_name = link.get('href', '').strip('/')
+                repo_url = f"https://github.com{link.get('href', '')}"
+                
+                # 描述
+                desc_elem = article.find('p', class_='col-9')
+                if not desc_elem:
+                    desc_elem = article.find('p')
+                description = desc_elem.text.strip() if desc_elem else "No description available"
+                
+                # Stars
+                stars_elem = article.find('svg', class_='octicon-star')
+                stars = "N/A"
+                if stars_elem and stars_elem.parent:
+                    stars_text = stars_elem.parent.text.strip()
+                    match = trending_parser.COUNT_RE.search(stars_text)
+                    if match:
+                        stars = match.group(1)
+                
+                # 语言
+                lang_elem = article.find('span', itemprop='programmingLanguage')
+                language = lang_elem.text.strip() if lang_elem else "Unknown"
+                
+                # 今日新增 stars
+                today_stars = ""
+                stars_today_elem = article.find('span', class_='d-inline-block float-sm-right')
+                if stars_today_elem:
+                    today_stars = stars_today_elem.text.strip()
+                
+                # Forks（尝试获取）
+                forks = "N/A"
+                fork_elem = article.find('svg', class_='octicon-repo-forked')
+                if fork_elem and fork_elem.parent:
+                    forks_text = fork_elem.parent.text.strip()
+                    match = trending_parser.COUNT_RE.search(forks_text)
+                    if match:
+                        forks = match.group(1)
+                
+                project = {
+                    'name': repo_name,
+                    'url': repo_url,
+                    'description': description,
+                    'stars': stars,
+                    'forks': forks,
+                    'language': language,
+                    'today_stars': today_stars,
+                    'source': 'trending'
+                }
+                
+                projects.append(project)
+                log(f"收集项目: {repo_name} ({language})", "DEBUG")
+                
+        except Exception as e:
+            log(f"解析单个项目失败: {e}", "WARNING")
+            continue
+    
+    if len(projects) == 0:
+        raise Exception("未能解析到任何项目，可能页面结构已变化")
+    
+    log(f"从 Trending 成功获取 {len(projects)} 个项目", "SUCCESS")
+    return projects
 
-def create_markdown(projects, date):
-    """生成 Markdown 文档（增强版）"""
-    year = date.strftime('%Y')
-    month = date.strftime('%m-%B')
-    date_str = date.strftime('%Y-%m-%d')
+def view_tag(language, since):
+    """视图标签：全部语言为 'daily'，指定语言为 'weekly/rust'"""
+    return since if language is None else f"{since}/{language.lower()}"
+
+def merge_trending_views(results, merged=None):
+    """
+    合并多个视图的项目并按仓库去重，记录每个项目出现在哪些视图中（views 字段）
+    周期按 daily → weekly → monthly 的顺序，同一周期内各语言视图按排名交替合并；
+    同一仓库保留最先出现的那条记录；weekly / monthly 视图的新增数是本周 / 本月的，
+    不写入 today_stars，避免混入“今日新增”和 stars 时间序列
+    merged 为之前批次的合并结果时，只返回本批新出现的项目，已有项目只补充 views
+    """
+    merged = {} if merged is None else merged
+    added = []
+    periods = list(dict.fromkeys(since for _, since in results))
+    periods.sort(key=lambda since: fetcher.TRENDING_PERIODS.index(since) if since in fetcher.TRENDING_PERIODS else 99)
+    for since in periods:
+        views = [(language, projects) for (language, period), projects in results.items() if period == since]
+        depth = max((len(projects) for _, projects in views), default=0)
+        for rank in range(depth):
+            for language, projects in views:
+                if rank >= len(projects):
+                    continue
+                project = projects[rank]
+                entry = merged.get(project['name'])
+                if entry is None:
+                    # 复制一份，解析结果可能被响应缓存共享
+                    entry = merged[project['name']] = dict(project, views=[])
+                    if since != 'daily':
+                        entry.pop('today_stars', None)
+                    added.append(entry)
+                tag = view_tag(language, since)
+                if tag not in entry['views']:
+                    entry['views'].append(tag)
+    return added
+
+def get_trending_views(languages=(None,), periods=('daily',), limit=None, max_workers=None):
+    """并发抓取多个 Trending 视图（语言 × 周期），返回 {(language, since): 项目列表}"""
+    max_workers = max_workers or fetcher.MAX_WORKERS
+    views = fetcher.trending_views(languages, periods)
+    log(f"并发抓取 {len(views)} 个 Trending 视图（并发上限 {max_workers}）", "INFO")
+    pages = fetcher.fetch_pages([url for _, _, url in views], session=get_session(), max_workers=max_workers,
+                                parse=parse_trending_html, cache=get_response_cache())
     
-    # 创建目录
-    target_dir = os.path.join(REPO_DIR, year, month)
-    os.makedirs(target_dir, exist_ok=True)
-    log(f"目标目录: {target_dir}", "DEBUG")
+    results = {}
+    for language, since, url in views:
+        projects = pages[url]
+        if isinstance(projects, Exception):
+            log(f"抓取或解析失败 {url}: {projects}", "WARNING")
+            results[(language, since)] = []
+            continue
+        results[(language, since)] = projects[:limit]
     
+    total = sum(len(projects) for projects in results.values())
+    log(f"从 {len(views)} 个 Trending 视图获取 {total} 个项目", "SUCCESS")
+    return results
+
+# Top Stars 候选池为空（尚未运行 ranking.py --refresh）时使用的种子列表
+TOP_STARS_SEED = [
+    {
+        'name': 'codecrafters-io/build-your-own-x',
+        'url': 'https://github.com/codecrafters-io/build-your-own-x',
+        'stars': '458,524',
+        'forks': '42,983',
+        'language': 'Markdown',
+        'description': 'Master programming by recreating your favorite technologies from scratch.',
+        'source': 'top-stars'
+    },
+    {
+        'name': 'freeCodeCamp/freeCodeCamp',
+        'url': 'https://github.com/freeCodeCamp/freeCodeCamp',
+        'stars': '436,070',
+        'forks': '43,128',
+        'language': 'TypeScript',
+        'description': "freeCodeCamp.org's open-source codebase and curriculum. Learn to code for free.",
+        'source': 'top-stars'
+    },
+    {
+        'name': 'sindresorhus/awesome',
+        'url': 'https://github.com/sindresorhus/awesome',
+        'stars': '430,688',
+        'forks': '32,881',
+        'language': 'None',
+        'description': '😎 Awesome lists about all kinds of interesting topics',
+        'source': 'top-stars'
+    },
+    {
+        'name': 'public-apis/public-apis',
+        'url': 'https://github.com/public-apis/public-apis',
+        'stars': '392,084',
+        'forks': '41,968',
+        'language': 'Python',
+        'description': 'A collective list of free APIs',
+        'source': 'top-stars'
+    },
+    {
+        'name': 'EbookFoundation/free-programming-books',
+        'url': 'https://github.com/EbookFoundation/free-programming-books',
+        'stars': '380,748',
+        'forks': '65,761',
+        'language': 'None',
+        'description': '📚 Freely available programming books',
+        'source': 'top-stars'
+    },
+    {
+        'name': 'kamranahmedse/developer-roadmap',
+        'url': 'https://github.com/kamranahmedse/developer-roadmap',
+        'stars': '347,550',
+        'forks': '43,634',
+        'language': 'TypeScript',
+        'description': 'Interactive roadmaps, guides and other educational content to help developers grow.',
+        'source': 'top-stars'
+    },
+    {
+        'name': 'jwasham/coding-interview-university',
+        'url': 'https://github.com/jwasham/coding-interview-university',
+        'stars': '335,965',
+        'forks': '81,577',
+        'language': 'None',
+        'description': 'A complete computer science study plan to become a software engineer.',
+        'source': 'top-stars'
+    },
+    {
+        'name': 'donnemartin/system-design-primer',
+        'url': 'https://github.com/donnemartin/system-design-primer',
+        'stars': '332,703',
+        'forks': '54,087',
+        'language': 'Python',
+        'description': 'Learn how to design large-scale systems. Prep for the system design interview.',
+        'source': 'top-stars'
+    },
+    {
+        'name': 'vuejs/vue',
+        'url': 'https://github.com/vuejs/vue',
+        'stars': '210,000',
+        'forks': '33,000',
+        'language': 'JavaScript',
+        'description': '🖖 Vue.js is a progressive, incrementally-adoptable JavaScript framework.',
+        'source': 'top-stars'
+    },
+    {
+        'name': 'facebook/react',
+        'url': 'https://github.com/facebook/react',
+        'stars': '242,393',
+        'forks': '50,435',
+        'language': 'JavaScript',
+        'description': 'The library for web and native user interfaces.',
+        'source': 'top-stars'
+    },
+    {
+        'name': 'torvalds/linux',
+        'url': 'https://github.com/torvalds/linux',
+        'stars': '200,000',
+        'forks': '55,000',
+        'language': 'C',
+        'description': 'Linux kernel source tree',
+        'source': 'top-stars'
+    },
+    {
+        'name': 'microsoft/vscode',
+        'url': 'https://github.com/microsoft/vscode',
+        'stars': '180,000',
+        'forks': '32,000',
+        'language': 'TypeScript',
+        'description': 'Visual Studio Code',
+        'source': 'top-stars'
+    }
+]
+
+def get_candidate_pool():
+    """Top Stars 候选池（data/candidates.jsonl，不存在时使用种子列表）"""
+    global _candidate_pool
+    if _candidate_pool is None:
+        _candidate_pool = ranking.CandidatePool.load(REPO_DIR, fallback=TOP_STARS_SEED)
+    return _candidate_pool
+
+def refresh_candidate_pool(date_str=None):
+    """
+    候选池超过 ranking.REFRESH_DAYS 天没有刷新时从搜索 API 刷新，并写回 data/candidates.jsonl（随当天的提交进入版本库）
+    未设置 GITHUB_TOKEN 且访问真实 API 时跳过（搜索 API 匿名限额不够一次刷新）；刷新失败时继续使用现有候选池
+    """
+    date_str = date_str or datetime.now().strftime('%Y-%m-%d')
+    pool = get_candidate_pool()
+    if not pool.is_stale(date_str):
+        log(f"候选池 {pool.updated()} 已刷新，{ranking.REFRESH_DAYS} 天内不再刷新", "DEBUG")
+        return False
+    if not os.environ.get('GITHUB_TOKEN') and fetcher.GITHUB_API_URL == 'https://api.github.com':
+        log("未设置 GITHUB_TOKEN，跳过候选池刷新（继续使用现有候选池）", "WARNING")
+        return False
+    log(f"刷新 Top Stars 候选池（上次刷新: {pool.updated() or '从未'}）...", "INFO")
+    try:
+        added, failed = ranking.refresh(pool, date_str=date_str)
+    except Exception as e:
+        log(f"候选池刷新失败，继续使用现有候选池: {e}", "WARNING")
+        return False
+    if not pool.is_stale(date_str):
+        pool.save(REPO_DIR)
+        log(f"候选池已刷新: 共 {len(pool)} 个仓库，新增 {added} 个，失败页面 {failed} 个", "SUCCESS")
+        return True
+    log(f"候选池刷新没有取得任何结果（失败页面 {failed} 个），继续使用现有候选池", "WARNING")
+    return False
+
+def source_options():
+    """注入来源插件的抓取函数和配置（sources.py 不反向导入本模块）"""
+    return {
+        'trending': {'fetch_views': get_trending_views, 'merge': merge_trending_views,
+                     'periods': TRENDING_PERIODS, 'languages': TRENDING_LANGUAGES},
+        'top-stars': {'load_pool': get_candidate_pool, 'ranking_key': TOP_STARS_RANKING}
+    }
+
+# 每日文档中各来源的标记
+SOURCE_BADGES = {'trending': "🔥 Trending", 'top-stars': "⭐ Top Stars", 'curated': "📌 Curated"}
+
+def render_markdown(projects, date_str, diff=None):
+    """逐段生成每日 Markdown 内容（生成器，调用方直接写入文件，不拼接整篇文档）；diff 为与前几天的对比结果"""
     # 统计信息
     trending_count = sum(1 for p in projects if p.get('source') == 'trending')
     top_stars_count = sum(1 for p in projects if p.get('source') == 'top-stars')
-    languages = list(set(p.get('language', 'Unknown') for p in projects if p.get('language') != 'Unknown'))
+    languages = list(dict.fromkeys(p.get('language', 'Unknown') for p in projects if p.get('language') != 'Unknown'))
     
     # 生成 Markdown 内容
-    content = f"""# 🌟 GitHub 高 Star 开源项目精选
+    yield f"""# 🌟 GitHub 高 Star 开源项目精选
 
 **收集日期**: {date_str}  
 **项目数量**: {len(projects)} 个  
@@ -315,21 +450,29 @@ def create_markdown(projects, date):
         today_stars = project.get('today_stars', '')
         source = project.get('source', 'unknown')
         
-        source_badge = "🔥 Trending" if source == 'trending' else "⭐ Top Stars"
+        source_badge = SOURCE_BADGES.get(source, "⭐ Top Stars")
+        if project.get('views'):
+            # 只显示出现过的周期，完整的视图列表保存在结构化存储中
+            periods = dict.fromkeys(tag.split('/', 1)[0] for tag in project['views'])
+            source_badge += f" ({', '.join(periods)})"
         
-        content += f"""### {idx}. [{name}]({url})
+        yield f"""### {idx}. [{name}]({url})
 
 **编程语言**: `{language}` | **来源**: {source_badge}  
 """
         
         if stars != 'N/A' and stars != 'Star':
-            content += f"**⭐ Stars**: {stars}  \n"
+            yield f"**⭐ Stars**: {stars}  \n"
         if forks != 'N/A':
-            content += f"**🔀 Forks**: {forks}  \n"
+            yield f"**🔀 Forks**: {forks}  \n"
         if today_stars:
-            content += f"**📈 今日新增**: {today_stars}  \n"
+            yield f"**📈 今日新增**: {today_stars}  \n"
+        if project.get('topics'):
+            yield f"**🏷️ 主题**: {' '.join(f'`{topic}`' for topic in project['topics'])}  \n"
+        if project.get('license'):
+            yield f"**📄 许可证**: {project['license']}  \n"
         
-        content += f"""
+        yield f"""
 **项目简介**: {description}
 
 **项目链接**: {url}
@@ -338,8 +481,11 @@ def create_markdown(projects, date):
 
 """
     
+    if diff is not None:
+        yield from daily_diff.render_diff(diff)
+    
     # 添加页脚
-    content += f"""
+    yield f"""
 ## 📝 说明
 
 本文档收集了 GitHub 上的高 star 开源项目，包括：
@@ -368,60 +514,178 @@ def create_markdown(projects, date):
 **项目仓库**: https://github.com/DannyFish-11/awesome-github-stars
 """
     
+def create_markdown(projects, date, diff=None):
+    """生成 Markdown 文档（增强版）；没有给出 diff 时使用已保存的对比结果（回填时保留榜单变化）"""
+    year = date.strftime('%Y')
+    month = date.strftime('%m-%B')
+    date_str = date.strftime('%Y-%m-%d')
+    if diff is None:
+        diff = daily_diff.load_diff(date_str, REPO_DIR)
+    
+    # 创建目录
+    target_dir = os.path.join(REPO_DIR, year, month)
+    os.makedirs(target_dir, exist_ok=True)
+    log(f"目标目录: {target_dir}", "DEBUG")
+    
     # 保存文件
     output_file = os.path.join(target_dir, f"{date_str}.md")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(content)
+    if output_writer.write_if_changed(output_file, render_markdown(projects, date_str, diff)):
+        log(f"Markdown 文档已生成: {output_file}", "SUCCESS")
+    else:
+        log(f"Markdown 文档内容未变化，跳过写入: {output_file}", "INFO")
     
-    log(f"Markdown 文档已生成: {output_file}", "SUCCESS")
+    # 同步写入结构化存储，供索引脚本直接读取
+    store_file = project_store.write_day(projects, date_str, REPO_DIR)
+    log(f"结构化记录已写入: {store_file}", "DEBUG")
     return output_file
 
-def validate_projects(projects):
-    """验证项目数据完整性"""
-    valid_projects = []
-    for project in projects:
-        if not project.get('name') or not project.get('url'):
-            log(f"跳过无效项目: {project}", "WARNING")
-            continue
-        valid_projects.append(project)
-    return valid_projects
+def gather_projects(date_str=None):
+    """按来源计划流式选出当天的项目（步骤 1-2，见 sources.py；验证、去重和补足都在流式阶段中完成）"""
+    log(f"步骤 1-2/4: 按来源计划选择项目（{sources.PROJECT_SOURCES}，补足: {sources.FILL_SOURCES}）...", "INFO")
+    return sources.select_projects(date_str, repo_dir=REPO_DIR, seen=get_seen_index(), options=source_options())
+
+def finalize_projects(all_projects, date_str=None):
+    """检查项目数量并记录指标（步骤 3）"""
+    log("步骤 3/4: 验证项目数据...", "INFO")
+    if len(all_projects) < sources.DAILY_LIMIT:
+        log(f"所有来源只选出 {len(all_projects)} 个项目（目标 {sources.DAILY_LIMIT} 个）", "WARNING")
+    metrics.incr('projects_collected', len(all_projects))
+    
+    log(f"共收集 {len(all_projects)} 个有效项目", "SUCCESS")
+    return all_projects
+
+def enrich_projects(projects):
+    """补全入选项目的 stars / forks / topics / license（批量查询 + 本地缓存）"""
+    with metrics.stage('enrich'):
+        return enrich.enrich_projects(projects, REPO_DIR)
+
+def collect_all_projects(date_str=None):
+    """获取、合并、验证并补全当天的项目列表（步骤 1-3）"""
+    refresh_candidate_pool(date_str)
+    return enrich_projects(finalize_projects(gather_projects(date_str), date_str))
 
-def main():
+def diff_projects(projects, date_str):
+    """当天项目与前几天的结构化记录对比（新上榜、跌出、排名和 star 变化）"""
+    with metrics.stage('diff'):
+        diff = daily_diff.diff_day(projects, date_str, REPO_DIR)
+    log(f"榜单变化: 新上榜 {len(diff['new'])}，重新上榜 {len(diff['returning'])}，"
+        f"跌出 {len(diff['dropped'])}，排名变化 {len(diff['rank_changes'])}", "INFO")
+    return diff
+
+def render_day(projects, date, diff=None):
+    """生成每日文件，并把计数解析为整数后追加到时间序列（步骤 4）"""
+    if diff is None:
+        diff = diff_projects(projects, date.strftime('%Y-%m-%d'))
+    with metrics.stage('render'):
+        output_file = create_markdown(projects, date, diff)
+        rows = timeseries.TimeSeriesStore(REPO_DIR).append(date.strftime('%Y-%m-%d'), projects)
+        # 记录入选日期，之后几天优先选择其它仓库
+        seen = get_seen_index()
+        seen.mark(projects, date.strftime('%Y-%m-%d'))
+        seen.prune(date.strftime('%Y-%m-%d'))
+        seen.save()
+    log(f"时间序列已追加 {rows} 行", "DEBUG")
+    return output_file
+
+def backfill_day(date_str):
+    """
+    重新生成某一天的每日文件（在工作进程中执行）
+    使用结构化存储中的记录，历史文件回退到解析 Markdown
+    返回 (date_str, 状态)，状态为 written / unchanged / missing
+    """
+    date = datetime.strptime(date_str, '%Y-%m-%d')
+    markdown_path = os.path.join(REPO_DIR, date.strftime('%Y'), date.strftime('%m-%B'), f"{date_str}.md")
+    projects = project_store.load_day(date_str, markdown_path=markdown_path, repo_dir=REPO_DIR)
+    if not projects:
+        return date_str, 'missing'
+    written_before = output_writer.stats['written']
+    create_markdown(projects, date)
+    return date_str, 'written' if output_writer.stats['written'] > written_before else 'unchanged'
+
+def backfill(date_from, date_to, workers=None):
+    """
+    按日期范围回填：用进程池并行重新渲染每一天，最后每个受影响的月份只重建一次索引
+    没有任何记录的日期跳过（GitHub Trending 没有历史数据，不能用当天的快照冒充）
+    """
+    start = datetime.strptime(date_from, '%Y-%m-%d')
+    end = datetime.strptime(date_to, '%Y-%m-%d')
+    if end < start:
+        raise ValueError(f"结束日期 {date_to} 早于开始日期 {date_from}")
+    dates = [(start + timedelta(days=offset)).strftime('%Y-%m-%d') for offset in range((end - start).days + 1)]
+    workers = workers or os.cpu_count() or 1
+    log(f"回填 {dates[0]} ~ {dates[-1]}，共 {len(dates)} 天，工作进程 {workers} 个", "INFO")
+    
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunksize = max(1, len(dates) // (workers * 4))
+        for date_str, status in executor.map(backfill_day, dates, chunksize=chunksize):
+            results[date_str] = status
+    
+    missing = [date_str for date_str, status in results.items() if status == 'missing']
+    if missing:
+        log(f"{len(missing)} 天没有历史记录，已跳过: {', '.join(missing)}", "WARNING")
+    
+    written = sum(1 for status in results.values() if status == 'written')
+    unchanged = sum(1 for status in results.values() if status == 'unchanged')
+    log(f"回填完成: 写入 {written} 天，内容未变化 {unchanged} 天", "SUCCESS")
+    
+    # 按月度索引清单只重建内容变化的月份
+    cache = update_index.refresh_cache()
+    update_index.update_month_indexes(cache)
+    update_index.update_main_readme(cache)
+    return results
+
+def parse_args(argv=None):
+    """命令行参数"""
+    parser = argparse.ArgumentParser(description='GitHub 高 Star 项目收集')
+    parser.add_argument('--from', dest='date_from', help='回填开始日期 YYYY-MM-DD')
+    parser.add_argument('--to', dest='date_to', help='回填结束日期 YYYY-MM-DD（默认与开始日期相同）')
+    parser.add_argument('--workers', type=int, help='回填使用的工作进程数（默认 CPU 核数）')
+    parser.add_argument('--preview', action='store_true', help='只按来源计划预览今天会选出的项目，不写入')
+    parser.add_argument('--plan', default=sources.PROJECT_SOURCES, help=f'来源计划（默认 {sources.PROJECT_SOURCES}）')
+    parser.add_argument('--fill', default=sources.FILL_SOURCES, help=f'补足来源（默认 {sources.FILL_SOURCES}）')
+    return parser.parse_args(argv)
+
+def preview(plan, fill, date_str=None):
+    """按来源计划选出项目并打印（不渲染、不更新去重索引）"""
+    projects = sources.select_projects(date_str, sources.parse_plan(plan), [name for name, _ in sources.parse_plan(fill)],
+                                       repo_dir=REPO_DIR, seen=get_seen_index(), options=source_options())
+    for index, project in enumerate(projects, 1):
+        print(f"{index:2}. [{project.get('source')}] {project['name']}")
+    return projects
+
+def main(argv=None):
     """主函数"""
+    args = parse_args(argv)
+    if args.preview:
+        preview(args.plan, args.fill)
+        return 0
+    if args.date_from:
+        try:
+            backfill(args.date_from, args.date_to or args.date_from, args.workers)
+            return 0
+        except Exception as e:
+            log(f"回填失败: {e}", "ERROR")
+            import traceback
+            log(traceback.format_exc(), "ERROR")
+            return 1
+    
     log("=" * 60, "INFO")
     log("开始收集 GitHub 高 Star 项目", "INFO")
     log("=" * 60, "INFO")
     
     try:
-        # 获取项目
-        log("步骤 1/4: 获取 Trending 项目...", "INFO")
-        trending = get_trending_projects(8)
-        
-        log("步骤 2/4: 获取 Top Stars 项目...", "INFO")
-        top_stars = get_top_starred_projects(7)
-        
-        # 合并项目列表
-        all_projects = trending + top_stars
-        
-        # 验证数据
-        log("步骤 3/4: 验证项目数据...", "INFO")
-        all_projects = validate_projects(all_projects)
-        
-        # 确保有 15 个项目
-        if len(all_projects) < 15:
-            log(f"只收集到 {len(all_projects)} 个项目，补充到 15 个", "WARNING")
-            additional_needed = 15 - len(all_projects)
-            additional = get_top_starred_projects(additional_needed)
-            all_projects.extend(additional)
-        
-        all_projects = all_projects[:15]
-        
-        log(f"共收集 {len(all_projects)} 个有效项目", "SUCCESS")
+        today = datetime.now()
+        all_projects = collect_all_projects(today.strftime('%Y-%m-%d'))
         
         # 生成 Markdown
         log("步骤 4/4: 生成 Markdown 文档...", "INFO")
-        today = datetime.now()
-        output_file = create_markdown(all_projects, today)
+        output_file = render_day(all_projects, today)
+        
+        report_cache_stats()
+        log(f"输出文件: {output_writer.summary()}", "INFO")
+        metrics.write_report('collect', repo_dir=REPO_DIR)
+        log(f"运行指标: {metrics.summary()}", "INFO")
         
         log("=" * 60, "INFO")
         log("✅ 收集任务完成！", "SUCCESS")
@@ -434,6 +698,7 @@ def main():
         log(f"任务执行失败: {e}", "ERROR")
         import traceback
         log(traceback.format_exc(), "ERROR")
+        metrics.write_report('collect', status='failed', repo_dir=REPO_DIR)
         return 1
 
 if __name__ == "__main__":
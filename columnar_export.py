@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+归档列式导出
+把整个归档导出到 data/columnar/，每列一个 int32 文件：
+- date / month: 日序号、YYYYMM
+- repo / language / source: 字典编码（repos.txt / languages.txt / sources.txt 的行号）
+- stars / forks / today: 整数，缺失为 -1
+manifest.json 最后写入，记录行数和列信息；读取时用 mmap 打开，
+安装了 NumPy 时直接映射为数组做向量化聚合，否则退回到 memoryview 逐行统计
+
+用法:
+    python3 columnar_export.py --export
+    python3 columnar_export.py --languages month --top 5
+    python3 columnar_export.py --stars-histogram
+"""
+
+import os
+import sys
+import mmap
+import json
+import argparse
+from array import array
+from datetime import datetime
+
+import aggregate_cache
+import project_store
+import timeseries
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 是可选依赖
+    np = None
+
+REPO_DIR = "/home/ubuntu/awesome-github-stars"
+EXPORT_SUBDIR = os.path.join('data', 'columnar')
+FORMAT_VERSION = 1
+COLUMNS = ('date', 'month', 'repo', 'language', 'source', 'stars', 'forks', 'today')
+DICTIONARIES = {'repo': 'repos.txt', 'language': 'languages.txt', 'source': 'sources.txt'}
+
+def export_dir(repo_dir=None):
+    """导出目录"""
+    return os.path.join(repo_dir or REPO_DIR, EXPORT_SUBDIR)
+
+def _replace_file(path, write):
+    """写入同目录临时文件后原子替换"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+def iter_archive(repo_dir=None):
+    """按日期顺序产出 (date_str, 项目列表)，优先读取结构化存储，历史文件回退到解析 Markdown"""
+    repo_dir = repo_dir or REPO_DIR
+    for rel_path in sorted(aggregate_cache.scan_daily_files(repo_dir), key=lambda path: path.rsplit('/', 1)[1]):
+        date_str = rel_path.rsplit('/', 1)[1][:-len('.md')]
+        projects = project_store.load_day(date_str, markdown_path=os.path.join(repo_dir, rel_path), repo_dir=repo_dir)
+        yield date_str, projects or []
+
+def export(repo_dir=None):
+    """导出整个归档，返回行数"""
+    columns = {name: array('i') for name in COLUMNS}
+    codes = {name: {} for name in DICTIONARIES}
+
+    def encode(name, value):
+        table = codes[name]
+        code = table.get(value)
+        if code is None:
+            code = table[value] = len(table)
+        return code
+
+    for date_str, projects in iter_archive(repo_dir):
+        day = timeseries.to_day(date_str)
+        month = int(date_str[:4]) * 100 + int(date_str[5:7])
+        for project in projects:
+            if not project.get('name'):
+                continue
+            columns['date'].append(day)
+            columns['month'].append(month)
+            columns['repo'].append(encode('repo', project['name']))
+            columns['language'].append(encode('language', project.get('language') or 'Unknown'))
+            columns['source'].append(encode('source', project.get('source') or 'unknown'))
+            columns['stars'].append(timeseries.parse_count(project.get('stars')))
+            columns['forks'].append(timeseries.parse_count(project.get('forks')))
+            columns['today'].append(timeseries.parse_count(project.get('today_stars')))
+
+    root = export_dir(repo_dir)
+    os.makedirs(root, exist_ok=True)
+    for name, column in columns.items():
+        _replace_file(os.path.join(root, f"{name}.i32"), column.tofile)
+    for name, file in DICTIONARIES.items():
+        values = ''.join(value + '\n' for value in codes[name])
+        _replace_file(os.path.join(root, file), lambda f: f.write(values.encode('utf-8')))
+    rows = len(columns['date'])
+    manifest = {
+        'version': FORMAT_VERSION,
+        'rows': rows,
+        'columns': {name: 'int32' for name in COLUMNS},
+        'dictionaries': DICTIONARIES,
+        'exported_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }
+    _replace_file(os.path.join(root, 'manifest.json'),
+                  lambda f: f.write(json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8')))
+    return rows
+
+class ColumnarArchive:
+    """以 mmap 打开的列式归档（只读）"""
+
+    def __init__(self, repo_dir=None):
+        self.root = export_dir(repo_dir)
+        with open(os.path.join(self.root, 'manifest.json'), 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        if self.manifest.get('version') != FORMAT_VERSION:
+            raise ValueError(f"不支持的导出格式版本: {self.manifest.get('version')}")
+        self.rows = self.manifest['rows']
+        self.dictionaries = {}
+        for name, file in self.manifest['dictionaries'].items():
+            with open(os.path.join(self.root, file), 'r', encoding='utf-8') as f:
+                self.dictionaries[name] = [line.rstrip('\n') for line in f]
+        self._maps = {}
+        self._columns = {}
+
+    def close(self):
+        """释放所有映射（调用方仍持有列数组时，映射留给垃圾回收释放）"""
+        self._columns.clear()
+        for handle, mapped in self._maps.values():
+            try:
+                mapped.close()
+            except BufferError:
+                pass
+            handle.close()
+        self._maps.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def column(self, name):
+        """某一列：有 NumPy 时为 int32 数组（零拷贝），否则为 memoryview"""
+        column = self._columns.get(name)
+        if column is not None:
+            return column
+        if not self.rows:
+            column = np.zeros(0, dtype=np.int32) if np is not None else memoryview(array('i'))
+        else:
+            handle = open(os.path.join(self.root, f"{name}.i32"), 'rb')
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[name] = (handle, mapped)
+            if np is not None:
+                column = np.frombuffer(mapped, dtype=np.int32, count=self.rows)
+            else:
+                column = memoryview(mapped).cast('i')[:self.rows]
+        self._columns[name] = column
+        return column
+
+    def _period_column(self, period):
+        if period == 'month':
+            return self.column('month')
+        if period == 'year':
+            month = self.column('month')
+            return month // 100 if np is not None else [value // 100 for value in month]
+        raise ValueError(f"未知的汇总周期: {period}")
+
+    def language_rollup(self, period='month'):
+        """
+        每个周期各语言的项目数 {周期: {语言: 数量}}
+        NumPy 路径: 周期和语言编码合成一个键后 bincount，一次归约完成
+        """
+        languages = self.dictionaries['language']
+        if not self.rows:
+            return {}
+        periods = self._period_column(period)
+        language = self.column('language')
+        if np is not None:
+            keys, period_codes = np.unique(periods, return_inverse=True)
+            counts = np.bincount(period_codes * len(languages) + language,
+                                 minlength=len(keys) * len(languages)).reshape(len(keys), len(languages))
+            return {int(key): {languages[code]: int(counts[row, code]) for code in np.flatnonzero(counts[row])}
+                    for row, key in enumerate(keys)}
+        rollup = {}
+        for key, code in zip(periods, language):
+            counter = rollup.setdefault(key, {})
+            counter[languages[code]] = counter.get(languages[code], 0) + 1
+        return dict(sorted(rollup.items()))
+
+    def language_share(self, period='month'):
+        """每个周期各语言的占比"""
+        share = {}
+        for key, counts in self.language_rollup(period).items():
+            total = sum(counts.values())
+            share[key] = {language: count / total for language, count in counts.items()}
+        return share
+
+    def stars_histogram(self):
+        """stars 按数量级分桶 {10 的幂: 数量}，缺失值不计入"""
+        stars = self.column('stars')
+        if np is not None:
+            valid = stars[stars >= 0]
+            buckets = np.floor(np.log10(np.maximum(valid, 1))).astype(np.int64)
+            counts = np.bincount(buckets)
+            return {10 ** power: int(count) for power, count in enumerate(counts) if count}
+        histogram = {}
+        for value in stars:
+            if value >= 0:
+                power = len(str(max(value, 1))) - 1
+                histogram[10 ** power] = histogram.get(10 ** power, 0) + 1
+        return dict(sorted(histogram.items()))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='归档列式导出与分析')
+    parser.add_argument('--export', action='store_true', help='导出整个归档到 data/columnar/')
+    parser.add_argument('--languages', choices=('month', 'year'), help='按月或按年汇总语言占比')
+    parser.add_argument('--top', type=int, default=5, help='每个周期显示的语言数')
+    parser.add_argument('--stars-histogram', action='store_true', help='stars 数量级分布')
+    args = parser.parse_args(argv)
+
+    if args.export:
+        rows = export()
+        print(f"已导出 {rows} 行到 {export_dir()}")
+    if not (args.languages or args.stars_histogram):
+        return 0
+
+    with ColumnarArchive() as archive:
+        print(f"共 {archive.rows} 行（{'NumPy' if np is not None else '纯 Python'} 聚合）")
+        if args.languages:
+            for key, share in archive.language_share(args.languages).items():
+                top = sorted(share.items(), key=lambda item: (-item[1], item[0]))[:args.top]
+                print(f"{key}: " + ', '.join(f"{language} {ratio:.1%}" for language, ratio in top))
+        if args.stars_histogram:
+            for bucket, count in archive.stars_histogram().items():
+                print(f">= {bucket:,}: {count}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
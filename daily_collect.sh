@@ -89,11 +89,7 @@ check_dependencies() {
         exit 1
     fi
     
-    # 检查 Python 模块
-    if ! python3 -c "import requests" 2>/dev/null; then
-        log WARNING "requests 模块未安装，尝试安装..."
-        sudo pip3 install requests beautifulsoup4 -q
-    fi
+    # Python 模块由 pipeline.py 自行检查（缺少时退出码为 3），这里不再单独启动解释器
     
     log SUCCESS "依赖检查通过"
 }
@@ -160,19 +156,28 @@ main() {
     PROJECT_FILE="$REPO_DIR/$YEAR/$MONTH/$DATE.md"
     if [ -f "$PROJECT_FILE" ]; then
         log WARNING "今日项目已存在: $PROJECT_FILE"
-        log WARNING "将覆盖现有文件"
-        rm -f "$PROJECT_FILE"
+        log WARNING "将重新生成，内容未变化时保留现有文件"
     fi
     
-    # 执行 Python 收集脚本
+    # 执行每日流水线（收集 → 验证 → 渲染 → 索引，同一个 Python 进程）
     log INFO "=========================================="
-    log INFO "步骤 1/3: 执行项目收集脚本"
+    log INFO "步骤 1/2: 执行每日流水线"
     log INFO "=========================================="
     
-    if python3 "$SCRIPT_DIR/collect_projects.py" 2>&1 | tee -a "$LOG_FILE"; then
-        log SUCCESS "项目收集完成"
+    local pipeline_status=0
+    python3 "$SCRIPT_DIR/pipeline.py" 2>&1 | tee -a "$LOG_FILE" || pipeline_status=${PIPESTATUS[0]}
+    
+    if [ "$pipeline_status" -eq 3 ]; then
+        log WARNING "Python 依赖未安装，尝试安装后重新运行..."
+        sudo pip3 install requests beautifulsoup4 -q
+        pipeline_status=0
+        python3 "$SCRIPT_DIR/pipeline.py" 2>&1 | tee -a "$LOG_FILE" || pipeline_status=${PIPESTATUS[0]}
+    fi
+    
+    if [ "$pipeline_status" -eq 0 ]; then
+        log SUCCESS "项目收集和索引更新完成"
     else
-        log ERROR "项目收集失败"
+        log ERROR "每日流水线失败，退出码: ${pipeline_status}"
         exit 1
     fi
     
@@ -185,71 +190,18 @@ main() {
     local file_size=$(stat -f%z "$PROJECT_FILE" 2>/dev/null || stat -c%s "$PROJECT_FILE" 2>/dev/null)
     log SUCCESS "项目文件已生成: $PROJECT_FILE (${file_size} bytes)"
     
-    # 更新月度索引
-    log INFO "=========================================="
-    log INFO "步骤 2/3: 更新月度索引"
-    log INFO "=========================================="
-    
-    if python3 "$SCRIPT_DIR/update_index.py" 2>&1 | tee -a "$LOG_FILE"; then
-        log SUCCESS "索引更新完成"
-    else
-        log ERROR "索引更新失败"
-        exit 1
-    fi
-    
     # Git 提交和推送
     log INFO "=========================================="
-    log INFO "步骤 3/3: 提交到 Git 仓库"
+    log INFO "步骤 2/2: 提交到 Git 仓库"
     log INFO "=========================================="
     
-    # 检查是否有更改
-    if git diff --quiet && git diff --cached --quiet; then
-        log WARNING "没有检测到更改，跳过提交"
-    else
-        log INFO "添加文件到 Git..."
-        git add .
-        
-        log INFO "提交更改..."
-        git commit -m "📅 Daily collection: ${DATE} - 15 projects added
-
-- Collected 8 trending projects from GitHub Trending
-- Collected 7 top-starred projects from history
-- Updated monthly index and main README
-- Auto-generated by daily_collect.sh
-
-Execution time: $(date +'%Y-%m-%d %H:%M:%S')" 2>&1 | tee -a "$LOG_FILE"
-        
-        log SUCCESS "提交完成"
-        
-        # 推送到远程仓库
-        if git remote | grep -q origin; then
-            log INFO "推送到远程仓库..."
-            
-            local push_attempts=0
-            local max_push_attempts=3
-            local push_success=false
-            
-            while [ $push_attempts -lt $max_push_attempts ]; do
-                if git push origin main 2>&1 | tee -a "$LOG_FILE"; then
-                    log SUCCESS "推送成功"
-                    push_success=true
-                    break
-                else
-                    push_attempts=$((push_attempts + 1))
-                    if [ $push_attempts -lt $max_push_attempts ]; then
-                        log WARNING "推送失败，5秒后重试 (${push_attempts}/${max_push_attempts})..."
-                        sleep 5
-                    fi
-                fi
-            done
-            
-            if [ "$push_success" = false ]; then
-                log ERROR "推送失败，已尝试 ${max_push_attempts} 次"
-                log WARNING "本地更改已保存，请稍后手动推送"
-            fi
-        else
-            log WARNING "远程仓库未配置，跳过推送"
-        fi
+    # 只暂存流水线写入的文件（变更路径清单），内容都未变化时跳过提交
+    local git_status=0
+    python3 "$SCRIPT_DIR/git_commit.py" --repo "$REPO_DIR" --log-file "$LOG_FILE" 2>&1 | tee -a "$LOG_FILE" || git_status=${PIPESTATUS[0]}
+    
+    if [ "$git_status" -ne 0 ]; then
+        log ERROR "Git 提交失败，退出码: ${git_status}"
+        exit 1
     fi
     
     # 统计信息
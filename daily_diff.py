@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+逐日对比
+把当天入选的项目与前 WINDOW_DAYS 天的结构化记录（data/days/）对比，得到：
+- 新上榜: 窗口内没有出现过的仓库
+- 重新上榜: 窗口内出现过、但前一天没有的仓库
+- 跌出榜单: 前一天入选、当天没有的仓库
+- 排名变化: 前一天和当天都在同一来源中的仓库（排名为来源内的位置）
+- Star 变化: 与窗口内最近一次记录的 stars 之差
+滚动窗口保存在 data/diff_window.json（每天一行记录列表及其来源文件的 [mtime_ns, size]，不纳入版本控制），
+结构化记录被重写（回填、重跑）或删除后，对应的日期在下次对比时重新读取 / 移出窗口；
+按仓库名建哈希表后每个当天项目只做 O(1) 查询，耗时只与当天的项目数有关；
+对比结果写入 data/diffs/YYYY/YYYY-MM-DD.json，并渲染到每日 Markdown 中
+
+用法:
+    python3 daily_diff.py                      # 重新计算今天的对比
+    python3 daily_diff.py --date 2026-02-06
+    python3 daily_diff.py --rebuild            # 从 data/days/ 重建滚动窗口
+"""
+
+import os
+import sys
+import json
+import argparse
+from datetime import datetime, timedelta
+
+import output_writer
+import project_store
+import timeseries
+
+REPO_DIR = "/home/ubuntu/awesome-github-stars"
+WINDOW_FILE = os.path.join('data', 'diff_window.json')
+DIFFS_SUBDIR = os.path.join('data', 'diffs')
+WINDOW_VERSION = 2
+
+# 对比窗口（天）
+WINDOW_DAYS = int(os.environ.get('DIFF_WINDOW_DAYS', '7'))
+
+def diff_path(date_str, repo_dir=None):
+    """某一天对比结果的 JSON 路径"""
+    return os.path.join(repo_dir or REPO_DIR, DIFFS_SUBDIR, date_str[:4], f"{date_str}.json")
+
+def day_records(projects):
+    """项目列表 -> 窗口记录 [[仓库名, 来源, 来源内排名, stars（缺失为 -1）], ...]"""
+    records, counters = [], {}
+    for project in projects:
+        name = project.get('name')
+        if not name:
+            continue
+        source = project.get('source') or 'unknown'
+        counters[source] = counters.get(source, 0) + 1
+        records.append([name, source, counters[source], timeseries.parse_count(project.get('stars'))])
+    return records
+
+def day_state(date_str, repo_dir=None):
+    """某一天结构化记录文件的 [mtime_ns, size]，不存在时为 None"""
+    try:
+        stat = os.stat(project_store.day_path(date_str, repo_dir))
+    except FileNotFoundError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+class DiffWindow:
+    """最近 window 天的记录 {日期: 记录列表}，states 为读取时记录文件的 {日期: [mtime_ns, size]}"""
+
+    def __init__(self, repo_dir=None, window=None):
+        self.repo_dir = repo_dir or REPO_DIR
+        self.path = os.path.join(self.repo_dir, WINDOW_FILE)
+        self.window = WINDOW_DAYS if window is None else window
+        self.days = {}
+        self.states = {}
+        self.load()
+
+    def load(self):
+        """读取窗口，文件不存在或版本不符时从空窗口开始（缺少的日期会从结构化存储补齐）"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        if data.get('version') == WINDOW_VERSION:
+            self.days = data.get('days', {})
+            self.states = data.get('states', {})
+
+    def save(self):
+        """原子保存窗口（可随时重建，不纳入版本控制，不计入输出统计）"""
+        data = {'version': WINDOW_VERSION, 'days': dict(sorted(self.days.items())),
+                'states': {day: self.states.get(day) for day in sorted(self.days)}}
+        output_writer.write_if_changed(self.path, json.dumps(data, ensure_ascii=False, separators=(',', ':')),
+                                       track=False)
+
+    def window_dates(self, date_str):
+        """date_str 之前的 window 个日期（降序）"""
+        date = datetime.strptime(date_str, '%Y-%m-%d')
+        return [(date - timedelta(days=offset)).strftime('%Y-%m-%d') for offset in range(1, self.window + 1)]
+
+    def fill(self, date_str):
+        """
+        补齐窗口内缺少或已变化的日期，返回窗口日期（降序）
+        记录文件的 [mtime_ns, size] 与读取时不同（被回填 / 重跑重写）时重新读取，文件已删除的日期移出窗口
+        """
+        dates = self.window_dates(date_str)
+        for day in dates:
+            state = day_state(day, self.repo_dir)
+            if state is None:
+                self.days.pop(day, None)
+                self.states.pop(day, None)
+            elif day not in self.days or self.states.get(day) != state:
+                projects = project_store.read_day(day, self.repo_dir)
+                if projects is not None:
+                    self.days[day] = day_records(projects)
+                    self.states[day] = state
+        return [day for day in dates if day in self.days]
+
+    def record(self, date_str, records):
+        """
+        记录当天并淘汰窗口外的日期（只保留最近的 window + 1 天）
+        当天的记录文件在对比之后才写入，状态记为 None，之后的对比会从文件重新读取一次
+        """
+        self.days[date_str] = records
+        self.states[date_str] = None
+        for day in sorted(self.days, reverse=True)[self.window + 1:]:
+            del self.days[day]
+            self.states.pop(day, None)
+
+    def compare(self, date_str, projects):
+        """
+        当天项目与窗口对比，返回对比结果（JSON 可序列化）
+        先按仓库名建立「窗口内最近一次出现」和「前一天」两张哈希表，之后每个当天项目 O(1) 查询
+        """
+        dates = self.fill(date_str)
+        previous_date = dates[0] if dates else None
+        latest = {}
+        for day in reversed(dates):
+            for name, source, rank, stars in self.days[day]:
+                latest[name] = (day, source, rank, stars)
+        previous = {record[0]: record for record in self.days.get(previous_date, ())}
+
+        today = day_records(projects)
+        diff = {'date': date_str, 'previous_date': previous_date, 'window_days': self.window,
+                'compared_days': len(dates), 'new': [], 'returning': [], 'dropped': [], 'rank_changes': [],
+                'star_deltas': []}
+        today_names = set()
+        for name, source, rank, stars in today:
+            today_names.add(name)
+            seen = latest.get(name)
+            if seen is None:
+                diff['new'].append({'name': name, 'source': source, 'rank': rank})
+                continue
+            seen_date, _, _, seen_stars = seen
+            if name not in previous:
+                diff['returning'].append({'name': name, 'source': source, 'rank': rank, 'last_seen': seen_date})
+            elif previous[name][1] == source and previous[name][2] != rank:
+                diff['rank_changes'].append({'name': name, 'source': source, 'rank': rank,
+                                             'previous_rank': previous[name][2], 'change': previous[name][2] - rank})
+            if stars != timeseries.MISSING and seen_stars != timeseries.MISSING:
+                diff['star_deltas'].append({'name': name, 'stars': stars, 'previous_stars': seen_stars,
+                                            'since': seen_date, 'delta': stars - seen_stars})
+        diff['dropped'] = [{'name': name, 'source': source, 'rank': rank}
+                           for name, source, rank, _ in self.days.get(previous_date, ()) if name not in today_names]
+        diff['rank_changes'].sort(key=lambda item: (-item['change'], item['name']))
+        diff['star_deltas'].sort(key=lambda item: (-item['delta'], item['name']))
+        self.record(date_str, today)
+        return diff
+
+def write_diff(diff, repo_dir=None):
+    """写入对比结果 JSON（内容未变化时不改动文件），返回路径"""
+    path = diff_path(diff['date'], repo_dir)
+    output_writer.write_if_changed(path, json.dumps(diff, ensure_ascii=False, indent=1) + "\n")
+    return path
+
+def load_diff(date_str, repo_dir=None):
+    """读取某一天的对比结果，不存在时返回 None"""
+    try:
+        with open(diff_path(date_str, repo_dir), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+def diff_day(projects, date_str, repo_dir=None, window=None):
+    """计算、保存当天的对比结果，并更新滚动窗口"""
+    diff_window = DiffWindow(repo_dir, window)
+    diff = diff_window.compare(date_str, projects)
+    write_diff(diff, repo_dir)
+    diff_window.save()
+    return diff
+
+def _link(name):
+    return f"[{name}](https://github.com/{name})"
+
+def _source_label(source):
+    return "Trending" if source == 'trending' else "Top Stars" if source == 'top-stars' else source
+
+def render_diff(diff, limit=10):
+    """对比结果的 Markdown 段落（生成器，每类最多 limit 项）"""
+    if diff['previous_date'] is None:
+        yield f"""## 🔄 榜单变化
+
+前 {diff['window_days']} 天没有收集记录，无法对比。
+
+---
+
+"""
+        return
+    yield f"""## 🔄 榜单变化
+
+与 {diff['previous_date']} 相比（新上榜按前 {diff['window_days']} 天判断）：
+
+- **🆕 新上榜**: {len(diff['new'])} 个
+- **🔁 重新上榜**: {len(diff['returning'])} 个
+- **📉 跌出榜单**: {len(diff['dropped'])} 个
+- **↕️ 排名变化**: {len(diff['rank_changes'])} 个
+
+"""
+    if diff['new']:
+        yield "**新上榜**: " + ', '.join(f"{_link(item['name'])}（{_source_label(item['source'])} #{item['rank']}）"
+                                     for item in diff['new'][:limit]) + "  \n"
+    if diff['returning']:
+        yield "**重新上榜**: " + ', '.join(f"{_link(item['name'])}（上次 {item['last_seen']}）"
+                                       for item in diff['returning'][:limit]) + "  \n"
+    if diff['dropped']:
+        yield "**跌出榜单**: " + ', '.join(f"{_link(item['name'])}（{_source_label(item['source'])} #{item['rank']}）"
+                                       for item in diff['dropped'][:limit]) + "  \n"
+    if diff['rank_changes']:
+        yield "**排名变化**: " + ', '.join(
+            f"{_link(item['name'])} #{item['previous_rank']} → #{item['rank']}"
+            f"（{'↑' if item['change'] > 0 else '↓'}{abs(item['change'])}）"
+            for item in diff['rank_changes'][:limit]) + "  \n"
+    # stars 没有变化的仓库不列出
+    star_deltas = [item for item in diff['star_deltas'] if item['delta']]
+    if star_deltas:
+        yield "**⭐ Star 变化**: " + ', '.join(f"{_link(item['name'])} {item['delta']:+,}（自 {item['since']}）"
+                                             for item in star_deltas[:limit]) + "  \n"
+    yield "\n---\n\n"
+
+def rebuild(repo_dir=None, window=None):
+    """从结构化存储重建滚动窗口（只读取最近的 window + 1 天）"""
+    diff_window = DiffWindow(repo_dir, window)
+    diff_window.days, diff_window.states = {}, {}
+    for date_str in project_store.list_days(repo_dir)[-(diff_window.window + 1):]:
+        diff_window.states[date_str] = day_state(date_str, repo_dir)
+        diff_window.days[date_str] = day_records(project_store.read_day(date_str, repo_dir) or [])
+    diff_window.save()
+    return diff_window
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='当天项目与前几天的对比')
+    parser.add_argument('--date', default=datetime.now().strftime('%Y-%m-%d'), help='日期 YYYY-MM-DD')
+    parser.add_argument('--window', type=int, help=f'对比窗口天数（默认 {WINDOW_DAYS}）')
+    parser.add_argument('--rebuild', action='store_true', help='从 data/days/ 重建滚动窗口')
+    args = parser.parse_args(argv)
+
+    if args.rebuild:
+        diff_window = rebuild(window=args.window)
+        print(f"已重建滚动窗口: {len(diff_window.days)} 天")
+        return 0
+    projects = project_store.read_day(args.date)
+    if projects is None:
+        print(f"没有 {args.date} 的结构化记录")
+        return 1
+    diff = diff_day(projects, args.date, window=args.window)
+    print(''.join(render_diff(diff)))
+    print(f"对比结果: {diff_path(args.date)}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+仓库元数据补全
+Trending 页面只提供抓取到的字符串，Top Stars 种子列表的计数也会过时；
+这里为每个入选仓库补全准确的 stars / forks / topics / license：
+- 通过 GitHub GraphQL API 批量查询，每批 BATCH_SIZE 个仓库只发一次请求（每个仓库一个别名）
+- 结果保存在 .cache/enrich.json，TTL 内命中的仓库不再联网，条目超过上限时按最近访问时间淘汰
+- API 地址沿用 GITHUB_API_URL，可以指向本地模拟服务；未设置 GITHUB_TOKEN 且访问真实 API 时只使用缓存
+
+用法:
+    python3 enrich.py owner/name [owner/name ...]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from datetime import datetime
+
+import fetcher
+import metrics
+import output_writer
+
+REPO_DIR = "/home/ubuntu/awesome-github-stars"
+CACHE_FILE = os.path.join('.cache', 'enrich.json')
+CACHE_VERSION = 1
+
+# 缓存有效期和容量
+DEFAULT_TTL = int(os.environ.get('ENRICH_TTL_HOURS', '24')) * 3600
+MAX_ENTRIES = 5000
+
+BATCH_SIZE = 50
+TOPICS_LIMIT = 10
+
+# 每个仓库查询的字段
+REPOSITORY_FIELDS = f"""nameWithOwner stargazerCount forkCount
+    primaryLanguage {{ name }}
+    licenseInfo {{ spdxId name }}
+    repositoryTopics(first: {TOPICS_LIMIT}) {{ nodes {{ topic {{ name }} }} }}"""
+
+def log(message, level="INFO"):
+    """日志输出"""
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    level_emoji = {
+        "INFO": "ℹ️",
+        "SUCCESS": "✅",
+        "WARNING": "⚠️",
+        "ERROR": "❌"
+    }
+    emoji = level_emoji.get(level, "📝")
+    print(f"[{timestamp}] {emoji} [{level}] {message}")
+
+class MetadataCache:
+    """{仓库名: {'data': 元数据或 None（仓库不存在）, 'fetched_at': 时间戳, 'accessed_at': 时间戳}}"""
+
+    def __init__(self, repo_dir=None, ttl=DEFAULT_TTL, max_entries=MAX_ENTRIES):
+        self.path = os.path.join(repo_dir or REPO_DIR, CACHE_FILE)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = {}
+        self.stats = {'hits': 0, 'misses': 0, 'evicted': 0}
+        self.dirty = False
+
+    @classmethod
+    def load(cls, repo_dir=None, **kwargs):
+        """读取缓存，不存在或版本不符时返回空缓存"""
+        cache = cls(repo_dir, **kwargs)
+        try:
+            with open(cache.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cache
+        if data.get('version') == CACHE_VERSION:
+            cache.entries = data['entries']
+        return cache
+
+    def get(self, name, now=None):
+        """TTL 内的条目返回 (True, 元数据)，否则返回 (False, None)"""
+        now = time.time() if now is None else now
+        entry = self.entries.get(name)
+        if entry is None or now - entry['fetched_at'] >= self.ttl:
+            self.stats['misses'] += 1
+            return False, None
+        entry['accessed_at'] = now
+        self.stats['hits'] += 1
+        self.dirty = True
+        return True, entry['data']
+
+    def put(self, name, data, now=None):
+        now = time.time() if now is None else now
+        self.entries[name] = {'data': data, 'fetched_at': now, 'accessed_at': now}
+        self.dirty = True
+
+    def evict(self):
+        """条目超过上限时淘汰最久未访问的，返回淘汰数量"""
+        excess = len(self.entries) - self.max_entries
+        if excess <= 0:
+            return 0
+        oldest = sorted(self.entries, key=lambda name: self.entries[name]['accessed_at'])[:excess]
+        for name in oldest:
+            del self.entries[name]
+        self.stats['evicted'] += excess
+        self.dirty = True
+        return excess
+
+    def save(self):
+        """淘汰后原子保存（缓存不纳入版本控制，不计入输出统计）"""
+        if not self.dirty:
+            return self.path
+        self.evict()
+        data = {'version': CACHE_VERSION, 'entries': self.entries}
+        output_writer.write_if_changed(self.path, json.dumps(data, ensure_ascii=False, separators=(',', ':')),
+                                       track=False)
+        self.dirty = False
+        return self.path
+
+def graphql_url(api_url=None):
+    """GraphQL 端点"""
+    return f"{api_url or fetcher.GITHUB_API_URL}/graphql"
+
+def batch_query(names):
+    """一批仓库的 GraphQL 查询，返回 (query, {别名: 仓库名})"""
+    aliases = {}
+    parts = []
+    for index, name in enumerate(names):
+        owner, _, repo = name.partition('/')
+        alias = f"r{index}"
+        aliases[alias] = name
+        arguments = f"owner: {json.dumps(owner)}, name: {json.dumps(repo)}"
+        parts.append(f"  {alias}: repository({arguments}) {{ {REPOSITORY_FIELDS} }}")
+    return "query {\n" + "\n".join(parts) + "\n}", aliases
+
+def parse_repository(node):
+    """GraphQL 仓库节点 -> 元数据字典"""
+    license_info = node.get('licenseInfo') or {}
+    license_id = license_info.get('spdxId')
+    if license_id in (None, 'NOASSERTION'):
+        license_id = license_info.get('name')
+    return {
+        'stars': node.get('stargazerCount', 0),
+        'forks': node.get('forkCount', 0),
+        'language': (node.get('primaryLanguage') or {}).get('name'),
+        'license': license_id,
+        'topics': [item['topic']['name'] for item in (node.get('repositoryTopics') or {}).get('nodes', [])]
+    }
+
+def fetch_batch(session, names, api_url=None):
+    """
+    查询一批仓库，返回 {仓库名: 元数据或 None}
+    单个仓库不存在（NOT_FOUND）只影响该别名；整批失败（data 为空）时抛出 ValueError
+    """
+    query, aliases = batch_query(names)
+    response = fetcher.post_json(session, graphql_url(api_url), {'query': query})
+    data = response.get('data')
+    if data is None:
+        messages = '; '.join(error.get('message', '') for error in response.get('errors', []))
+        raise ValueError(f"GraphQL 查询失败: {messages or response}")
+    return {name: parse_repository(data[alias]) if data.get(alias) else None for alias, name in aliases.items()}
+
+def apply_metadata(project, data):
+    """把元数据写入项目字典（计数格式化为 '458,524'，语言只在缺失时补全），返回新的字典"""
+    project = dict(project)
+    project['stars'] = f"{data['stars']:,}"
+    project['forks'] = f"{data['forks']:,}"
+    if data.get('language') and project.get('language') in (None, '', 'N/A', 'None', 'Unknown'):
+        project['language'] = data['language']
+    if data.get('topics'):
+        project['topics'] = data['topics']
+    if data.get('license'):
+        project['license'] = data['license']
+    return project
+
+def enrich_projects(projects, repo_dir=None, token=None, api_url=None, cache=None, batch_size=BATCH_SIZE):
+    """
+    补全项目元数据，返回新的项目列表（顺序不变）
+    缓存未命中的仓库按 batch_size 分批查询；查询失败时保留原始数据，不影响当天的收集
+    """
+    cache = cache or MetadataCache.load(repo_dir)
+    token = token or os.environ.get('GITHUB_TOKEN')
+    api_url = api_url or fetcher.GITHUB_API_URL
+    now = time.time()
+
+    metadata, missing = {}, []
+    for project in projects:
+        name = project.get('name')
+        if not name or name in metadata or name in missing:
+            continue
+        hit, data = cache.get(name, now)
+        if hit:
+            metadata[name] = data
+        else:
+            missing.append(name)
+
+    if missing and not token and api_url == 'https://api.github.com':
+        log(f"未设置 GITHUB_TOKEN，跳过 {len(missing)} 个仓库的元数据查询（只使用缓存）", "WARNING")
+        missing = []
+
+    if missing:
+        headers = {'Accept': 'application/vnd.github+json'}
+        if token:
+            headers['Authorization'] = f"Bearer {token}"
+        session = fetcher.create_session(headers, pool_size=1)
+        try:
+            for start in range(0, len(missing), batch_size):
+                batch = missing[start:start + batch_size]
+                try:
+                    results = fetch_batch(session, batch, api_url)
+                except Exception as e:
+                    log(f"元数据查询失败（{len(batch)} 个仓库保留原始数据）: {e}", "WARNING")
+                    continue
+                metrics.incr('enrich_batches')
+                for name, data in results.items():
+                    cache.put(name, data, now)
+                    metadata[name] = data
+        finally:
+            session.close()
+
+    metrics.incr('enrich_cache_hits', cache.stats['hits'])
+    cache.save()
+    log(f"元数据补全: 缓存命中 {cache.stats['hits']}，查询 {len(missing)} 个仓库", "INFO")
+    return [apply_metadata(project, metadata[project['name']]) if metadata.get(project.get('name')) else project
+            for project in projects]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='批量查询仓库元数据（带本地缓存）')
+    parser.add_argument('names', nargs='+', help='仓库名 owner/name')
+    args = parser.parse_args(argv)
+
+    cache = MetadataCache.load()
+    projects = enrich_projects([{'name': name} for name in args.names], cache=cache)
+    for project in projects:
+        print(f"{project['name']}: ⭐ {project.get('stars', '?')} 🔀 {project.get('forks', '?')} "
+              f"📄 {project.get('license', '-')} 🏷️ {', '.join(project.get('topics', [])) or '-'}")
+    print(f"缓存命中 {cache.stats['hits']}，未命中 {cache.stats['misses']}，淘汰 {cache.stats['evicted']}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
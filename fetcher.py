@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+GitHub Trending 并发抓取层
+所有页面共用一个带连接池的 Session，通过线程池并发抓取，
+重试只阻塞所在的工作线程，不影响其它页面
+"""
+
+import os
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import metrics
+import retry_policy
+
+# 可通过环境变量指向本地 HTTP 替身（例如提供保存好的 HTML 样本）
+GITHUB_BASE_URL = os.environ.get('GITHUB_BASE_URL', 'https://github.com')
+GITHUB_API_URL = os.environ.get('GITHUB_API_URL', 'https://api.github.com')
+
+TRENDING_PERIODS = ('daily', 'weekly', 'monthly')
+
+# 并发与连接池配置
+MAX_WORKERS = 8
+REQUEST_TIMEOUT = 20  # 秒
+MAX_RETRIES = 3
+RETRY_DELAY = 2  # 秒，指数退避的基数（见 retry_policy）
+
+def trending_url(language=None, since='daily', base_url=None):
+    """生成 Trending 页面地址，language 为 None 表示全部语言"""
+    url = f"{base_url or GITHUB_BASE_URL}/trending"
+    if language:
+        url += '/' + quote(language.lower().replace(' ', '-'), safe='')
+    if since and since != 'daily':
+        url += f"?since={since}"
+    return url
+
+def trending_views(languages=(None,), periods=('daily',), base_url=None):
+    """生成 (language, since, url) 视图列表"""
+    return [(language, since, trending_url(language, since, base_url))
+            for language in languages for since in periods]
+
+def search_url(query, page=1, per_page=100, sort='stars', api_url=None):
+    """GitHub 仓库搜索 API 地址（每个查询最多返回 1000 条结果）"""
+    return (f"{api_url or GITHUB_API_URL}/search/repositories?q={quote(query, safe=':.>=<')}"
+            f"&sort={sort}&order=desc&per_page={per_page}&page={page}")
+
+def create_session(headers=None, pool_size=MAX_WORKERS):
+    """创建带连接池的 Session（连接在所有请求之间复用）"""
+    # requests 只在真正需要联网时才导入，避免拖慢不抓取页面的流程
+    import requests
+    from requests.adapters import HTTPAdapter
+    
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+def _request(session, url, headers=None, timeout=REQUEST_TIMEOUT, max_retries=MAX_RETRIES, retry_delay=RETRY_DELAY,
+             payload=None):
+    """
+    发送 GET 请求（传入 payload 时以 JSON 正文发送 POST）：每次请求前从主机的令牌桶取令牌，
+    失败时按 retry_policy 分类，可重试的错误在当前线程内退避后重试
+    """
+    import requests
+    
+    limiter = retry_policy.limiter_for(url)
+    for attempt in range(1, max_retries + 1):
+        limiter.acquire()
+        try:
+            with metrics.stage('fetch'):
+                if payload is None:
+                    response = session.get(url, headers=headers, timeout=timeout)
+                else:
+                    response = session.post(url, json=payload, headers=headers, timeout=timeout)
+            metrics.incr('requests')
+            metrics.incr('bytes_downloaded', len(response.content))
+            response.raise_for_status()
+            return response
+        except requests.RequestException as e:
+            if attempt >= max_retries or not retry_policy.wait_before_retry(e, attempt, retry_delay, limiter):
+                raise
+
+def fetch_page(session, url, **fetch_kwargs):
+    """抓取单个页面，返回 HTML 文本"""
+    return _request(session, url, **fetch_kwargs).text
+
+def post_json(session, url, payload, **fetch_kwargs):
+    """POST JSON 并返回解析后的响应（GraphQL 查询），与 GET 共用令牌桶和重试策略"""
+    return _request(session, url, payload=payload, **fetch_kwargs).json()
+
+def fetch_parsed(session, url, parse, cache=None, variant='', **fetch_kwargs):
+    """
+    抓取并解析单个页面
+    有缓存时：TTL 内直接返回缓存的解析结果；过期后发条件请求，304 时同样跳过下载和解析
+    """
+    meta = cache.lookup(url) if cache else None
+    if meta and cache.is_fresh(meta):
+        parsed = meta.get('parsed', {}).get(variant)
+        if parsed is None:
+            parsed = parse(cache.load_body(url))
+            cache.save_parsed(url, meta, parsed, variant)
+        else:
+            cache.touch(url, meta)
+        cache.record('hits')
+        cache.record('bytes_saved', meta.get('size', 0))
+        return parsed
+
+    headers = cache.conditional_headers(meta) if meta else None
+    response = _request(session, url, headers=headers, **fetch_kwargs)
+    if response.status_code == 304 and meta:
+        cache.refresh(url, meta)
+        parsed = meta.get('parsed', {}).get(variant)
+        if parsed is None:
+            parsed = parse(cache.load_body(url))
+            cache.save_parsed(url, meta, parsed, variant)
+        cache.record('revalidated')
+        cache.record('bytes_saved', meta.get('size', 0))
+        return parsed
+
+    text = response.text
+    parsed = parse(text)
+    if cache:
+        cache.store(url, text, response.headers, parsed, variant)
+        cache.record('misses')
+        cache.record('bytes_downloaded', len(response.content))
+    return parsed
+
+def fetch_pages(urls, session=None, max_workers=MAX_WORKERS, parse=None, cache=None, variant='', **fetch_kwargs):
+    """
+    并发抓取多个页面，并发数不超过 max_workers
+    返回 {url: html 或 Exception}，单个页面失败不影响其它页面；
+    传入 parse 时返回解析结果（可配合 cache 跳过未变化页面的下载和解析）
+    """
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        return {}
+    own_session = session is None
+    if own_session:
+        session = create_session(pool_size=max_workers)
+    results = {}
+    try:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as executor:
+            if parse:
+                futures = {executor.submit(fetch_parsed, session, url, parse, cache, variant, **fetch_kwargs): url
+                           for url in urls}
+            else:
+                futures = {executor.submit(fetch_page, session, url, **fetch_kwargs): url for url in urls}
+            for future in as_completed(futures):
+                url = futures[future]
+                try:
+                    results[url] = future.result()
+                except Exception as e:
+                    results[url] = e
+    finally:
+        if own_session:
+            session.close()
+    return results
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Git 提交阶段
+只暂存本次流水线实际写入的文件（pipeline.py 写出的变更路径清单），
+不再对整个仓库执行 git add . / git diff，归档增长到上千个文件后耗时不变；
+所有输出文件内容哈希都未变化时（清单为空）直接跳过提交。
+运行记录（日志、运行指标）只随内容变化一起提交，本身不会触发提交。
+Git 阶段耗时（暂存、提交、推送）结束后补充到流水线本次运行的指标中
+（latest.json / latest.prom 和 history.jsonl 的最后一行），随下一次提交进入版本库
+
+用法:
+    python3 git_commit.py [--log-file logs/collect_2026-02-06.log]
+    python3 git_commit.py --repo /tmp/work --remote origin --branch main   # 可以指向本地裸仓库测试
+
+退出码:
+    0  已提交（推送失败只记录警告）或没有需要提交的内容
+    1  清单缺失或 Git 命令失败
+"""
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+from datetime import datetime
+
+import metrics
+import output_writer
+
+REPO_DIR = "/home/ubuntu/awesome-github-stars"
+
+# 变更路径清单（每行一个相对路径，每次流水线成功后重写）
+CHANGED_PATHS_FILE = os.path.join('.cache', 'changed_paths.txt')
+
+# 有内容变化时一并提交的运行记录
+RUN_RECORD_PATHS = (
+    'logs/metrics/latest.json',
+    'logs/metrics/latest.prom',
+    'logs/metrics/history.jsonl',
+    'logs/execution_history.csv'
+)
+
+PUSH_ATTEMPTS = 3
+PUSH_RETRY_DELAY = 5  # 秒
+
+def log(message, level="INFO"):
+    """日志输出"""
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    level_emoji = {
+        "INFO": "ℹ️",
+        "SUCCESS": "✅",
+        "WARNING": "⚠️",
+        "ERROR": "❌"
+    }
+    emoji = level_emoji.get(level, "📝")
+    print(f"[{timestamp}] {emoji} [{level}] {message}")
+
+def changed_paths_file(repo_dir=None):
+    """变更路径清单的位置"""
+    return os.path.join(repo_dir or REPO_DIR, CHANGED_PATHS_FILE)
+
+def write_changed_paths(repo_dir=None):
+    """把本进程写入的仓库内文件（output_writer.written_paths）写入清单，返回相对路径列表"""
+    repo_dir = os.path.abspath(repo_dir or REPO_DIR)
+    paths = []
+    for path in output_writer.written_paths:
+        rel_path = os.path.relpath(os.path.abspath(path), repo_dir)
+        if not rel_path.startswith('..'):
+            paths.append(rel_path.replace(os.sep, '/'))
+    paths = list(dict.fromkeys(paths))
+    output_writer.write_if_changed(changed_paths_file(repo_dir), ''.join(path + "\n" for path in paths), track=False)
+    return paths
+
+def read_changed_paths(repo_dir=None):
+    """读取清单，不存在时返回 None"""
+    try:
+        with open(changed_paths_file(repo_dir), 'r', encoding='utf-8') as f:
+            return [line.rstrip('\n') for line in f if line.strip()]
+    except FileNotFoundError:
+        return None
+
+def git(args, repo_dir, stdin=None):
+    """执行 git 命令，失败时抛出 subprocess.CalledProcessError"""
+    return subprocess.run(['git', *args], cwd=repo_dir, input=stdin, capture_output=True, text=True, check=True)
+
+def stage_paths(paths, repo_dir):
+    """只暂存给定的路径（通过标准输入传递，路径再多也不会超出命令行长度）"""
+    existing = [path for path in paths if os.path.exists(os.path.join(repo_dir, path))]
+    if existing:
+        git(['add', '--pathspec-from-file=-', '--pathspec-file-nul'], repo_dir, stdin='\0'.join(existing))
+    return existing
+
+def has_staged_changes(repo_dir):
+    """暂存区与 HEAD 是否不同（只比较索引，不扫描工作区）"""
+    result = subprocess.run(['git', 'diff', '--cached', '--quiet'], cwd=repo_dir)
+    return result.returncode != 0
+
+def has_remote(remote, repo_dir):
+    """是否配置了指定的远程仓库"""
+    return remote in git(['remote'], repo_dir).stdout.split()
+
+def commit_message(date_str, paths):
+    """提交信息"""
+    return f"""📅 Daily collection: {date_str} - 15 projects added
+
+- Collected 8 trending projects from GitHub Trending
+- Collected 7 top-starred projects from history
+- Updated monthly index and main README
+- {len(paths)} files changed, auto-generated by daily_collect.sh
+
+Execution time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"""
+
+def push(remote, branch, repo_dir, attempts=PUSH_ATTEMPTS):
+    """推送到远程仓库，失败时重试，返回是否成功"""
+    for attempt in range(1, attempts + 1):
+        try:
+            git(['push', remote, f"HEAD:{branch}"], repo_dir)
+            return True
+        except subprocess.CalledProcessError as e:
+            if attempt < attempts:
+                log(f"推送失败，{PUSH_RETRY_DELAY}秒后重试 ({attempt}/{attempts}): {e.stderr.strip()}", "WARNING")
+                time.sleep(PUSH_RETRY_DELAY)
+            else:
+                log(f"推送失败，已尝试 {attempts} 次: {e.stderr.strip()}", "ERROR")
+    return False
+
+def commit_changes(repo_dir=None, extra_paths=(), remote='origin', branch='main', push_changes=True, date_str=None):
+    """
+    按清单暂存并提交，返回 'committed' / 'skipped'
+    清单缺失时抛出 FileNotFoundError（流水线没有成功运行，不能退回到提交整个工作区）
+    """
+    repo_dir = repo_dir or REPO_DIR
+    date_str = date_str or datetime.now().strftime('%Y-%m-%d')
+    paths = read_changed_paths(repo_dir)
+    if paths is None:
+        raise FileNotFoundError(f"未找到变更路径清单: {changed_paths_file(repo_dir)}")
+    # 清单只使用一次，避免下次流水线失败时误用旧清单
+    os.remove(changed_paths_file(repo_dir))
+    if not paths:
+        log("所有输出文件内容都未变化，跳过提交", "WARNING")
+        return 'skipped'
+
+    staged = stage_paths(paths, repo_dir)
+    stage_paths(list(RUN_RECORD_PATHS) + list(extra_paths), repo_dir)
+    if not has_staged_changes(repo_dir):
+        log("暂存区没有变化，跳过提交", "WARNING")
+        return 'skipped'
+
+    git(['commit', '-q', '-m', commit_message(date_str, staged)], repo_dir)
+    log(f"提交完成: {len(staged)} 个内容文件", "SUCCESS")
+
+    if not push_changes:
+        return 'committed'
+    if not has_remote(remote, repo_dir):
+        log("远程仓库未配置，跳过推送", "WARNING")
+    elif push(remote, branch, repo_dir):
+        log("推送成功", "SUCCESS")
+    else:
+        log("本地更改已保存，请稍后手动推送", "WARNING")
+    return 'committed'
+
+def record_metrics(repo_dir, resumed, status='success'):
+    """把 git 阶段写回本次运行的报告（resumed 为 metrics.resume() 的返回值，没有报告时单独记一次 git 运行）"""
+    run_name, run_status = resumed or ('git', 'success')
+    data = metrics.write_report(run_name, run_status if status == 'success' else status, repo_dir,
+                                amend=resumed is not None)
+    log(f"Git 阶段耗时: {data['stages'].get('git', 0.0):.2f} 秒", "INFO")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='只提交本次流水线写入的文件')
+    parser.add_argument('--repo', default=REPO_DIR, help='仓库目录')
+    parser.add_argument('--log-file', action='append', default=[], help='一并提交的日志文件（可重复）')
+    parser.add_argument('--remote', default='origin')
+    parser.add_argument('--branch', default='main')
+    parser.add_argument('--no-push', action='store_true', help='只提交，不推送')
+    args = parser.parse_args(argv)
+
+    extra_paths = [os.path.relpath(os.path.abspath(path), os.path.abspath(args.repo)) for path in args.log_file]
+    resumed = metrics.resume(args.repo)
+    try:
+        with metrics.stage('git'):
+            commit_changes(args.repo, extra_paths, args.remote, args.branch, not args.no_push)
+    except FileNotFoundError as e:
+        log(str(e), "ERROR")
+        return 1
+    except subprocess.CalledProcessError as e:
+        log(f"Git 命令失败: {' '.join(e.cmd)}: {e.stderr.strip()}", "ERROR")
+        record_metrics(args.repo, resumed, 'failed')
+        return 1
+    record_metrics(args.repo, resumed)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
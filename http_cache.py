@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Trending 页面的磁盘响应缓存
+- TTL 内直接命中，不发请求也不重新解析
+- 过期后带 If-None-Match / If-Modified-Since 条件请求，304 时复用缓存的解析结果
+- 总大小超过上限时按最近访问时间淘汰
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+
+DEFAULT_TTL = 2 * 3600  # 秒
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+class ResponseCache:
+    """按 URL 保存响应正文、校验头和解析结果"""
+
+    def __init__(self, cache_dir, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'bytes_saved': 0, 'bytes_downloaded': 0, 'evicted': 0}
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, url):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + '.json', base + '.html'
+
+    def record(self, name, amount=1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def lookup(self, url):
+        """读取缓存元数据，不存在时返回 None"""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get('url') != url or not os.path.exists(body_path):
+            return None
+        return meta
+
+    def is_fresh(self, meta):
+        """是否仍在 TTL 内"""
+        return time.time() - meta.get('fetched_at', 0) < self.ttl
+
+    def conditional_headers(self, meta):
+        """条件请求头"""
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def load_body(self, url):
+        """读取缓存的响应正文"""
+        _, body_path = self._paths(url)
+        with open(body_path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def _write_meta(self, url, meta):
+        meta_path, _ = self._paths(url)
+        meta['accessed_at'] = time.time()
+        tmp_path = f"{meta_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_path, meta_path)
+
+    def store(self, url, text, headers, parsed=None, variant=''):
+        """保存新下载的响应（以及解析结果）"""
+        _, body_path = self._paths(url)
+        with open(body_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        meta = {
+            'url': url,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'fetched_at': time.time(),
+            'size': len(text.encode('utf-8')),
+            'parsed': {variant: parsed} if parsed is not None else {}
+        }
+        self._write_meta(url, meta)
+
+    def touch(self, url, meta):
+        """命中时更新最近访问时间（用于淘汰顺序）"""
+        self._write_meta(url, meta)
+
+    def refresh(self, url, meta):
+        """304 之后刷新有效期"""
+        meta['fetched_at'] = time.time()
+        self._write_meta(url, meta)
+
+    def save_parsed(self, url, meta, parsed, variant=''):
+        """为已有缓存补充解析结果"""
+        meta.setdefault('parsed', {})[variant] = parsed
+        self._write_meta(url, meta)
+
+    def evict(self):
+        """总大小超过上限时，按最近访问时间淘汰最旧的条目"""
+        entries = []
+        total = 0
+        for file in os.listdir(self.cache_dir):
+            if not file.endswith('.json'):
+                continue
+            meta_path = os.path.join(self.cache_dir, file)
+            body_path = meta_path[:-len('.json')] + '.html'
+            try:
+                size = os.path.getsize(meta_path) + (os.path.getsize(body_path) if os.path.exists(body_path) else 0)
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    accessed_at = json.load(f).get('accessed_at', 0)
+            except (OSError, ValueError):
+                accessed_at, size = 0, 0
+            entries.append((accessed_at, size, meta_path, body_path))
+            total += size
+
+        entries.sort()
+        for accessed_at, size, meta_path, body_path in entries:
+            if total <= self.max_bytes:
+                break
+            for path in (meta_path, body_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            total -= size
+            self.record('evicted')
+        return total
+
+    def summary(self):
+        """用于运行日志的统计摘要"""
+        stats = self.stats
+        return (f"命中 {stats['hits']}，304 复用 {stats['revalidated']}，未命中 {stats['misses']}，"
+                f"节省 {stats['bytes_saved'] / 1024:.1f} KB，下载 {stats['bytes_downloaded'] / 1024:.1f} KB，"
+                f"淘汰 {stats['evicted']}")
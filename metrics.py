@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+运行指标
+各阶段耗时（fetch / retry_wait / parse / enrich / diff / render / index，git 由 git_commit.py 补充）
+和计数器（下载字节数、解析的项目数、读取的文件数等）在进程内累加，
+运行结束后写入 logs/metrics/：
+- latest.json / latest.prom: 本次运行的报告（Prometheus 文本格式可直接交给 node_exporter 的 textfile 收集器）
+- history.jsonl: 每次运行追加一行，便于跨运行对比趋势
+流水线之后单独运行的阶段（git_commit.py）先用 resume() 接上本次运行的报告，再以 amend=True 写回，
+三个文件中仍然只有一条记录
+抓取在线程池中进行，计数和计时都加锁
+"""
+
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+import output_writer
+
+REPO_DIR = "/home/ubuntu/awesome-github-stars"
+METRICS_SUBDIR = os.path.join('logs', 'metrics')
+PROM_PREFIX = 'awesome_stars'
+
+# 本进程内的指标
+timings = {}
+counters = {}
+_started_at = time.time()
+_lock = threading.Lock()
+
+def reset():
+    """清空指标（基准测试多次运行时使用）"""
+    global _started_at
+    with _lock:
+        timings.clear()
+        counters.clear()
+        _started_at = time.time()
+
+def add_time(stage, seconds):
+    """累加某个阶段的耗时（并发阶段为各线程耗时之和）"""
+    with _lock:
+        timings[stage] = timings.get(stage, 0.0) + seconds
+
+def incr(name, value=1):
+    """累加计数器"""
+    with _lock:
+        counters[name] = counters.get(name, 0) + value
+
+@contextmanager
+def stage(name):
+    """计时上下文：with metrics.stage('render'): ..."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_time(name, time.perf_counter() - start)
+
+def report(run_name='daily', status='success'):
+    """本次运行的报告字典"""
+    with _lock:
+        return {
+            'run': run_name,
+            'status': status,
+            'started_at': datetime.fromtimestamp(_started_at).strftime('%Y-%m-%d %H:%M:%S'),
+            'duration_seconds': round(time.time() - _started_at, 3),
+            'stages': {name: round(seconds, 4) for name, seconds in timings.items()},
+            'counters': dict(counters)
+        }
+
+def to_prometheus(data):
+    """报告字典 -> Prometheus 文本格式"""
+    run = data['run']
+    lines = []
+    for name, value in sorted(data['counters'].items()):
+        lines.append(f"# TYPE {PROM_PREFIX}_{name}_total counter")
+        lines.append(f'{PROM_PREFIX}_{name}_total{{run="{run}"}} {value}')
+    lines.append(f"# TYPE {PROM_PREFIX}_run_duration_seconds gauge")
+    lines.append(f'{PROM_PREFIX}_run_duration_seconds{{run="{run}"}} {data["duration_seconds"]}')
+    lines.append(f"# TYPE {PROM_PREFIX}_run_success gauge")
+    lines.append(f'{PROM_PREFIX}_run_success{{run="{run}"}} {1 if data["status"] == "success" else 0}')
+    lines.append(f"# TYPE {PROM_PREFIX}_run_timestamp_seconds gauge")
+    lines.append(f'{PROM_PREFIX}_run_timestamp_seconds{{run="{run}"}} {int(_started_at)}')
+    lines.append(f"# HELP {PROM_PREFIX}_stage_seconds Time spent in each pipeline stage.")
+    lines.append(f"# TYPE {PROM_PREFIX}_stage_seconds gauge")
+    lines.extend(f'{PROM_PREFIX}_stage_seconds{{run="{run}",stage="{name}"}} {seconds}'
+                 for name, seconds in sorted(data['stages'].items()))
+    return "\n".join(lines) + "\n"
+
+def resume(repo_dir=None):
+    """
+    读取 latest.json，把其中的阶段耗时、计数器和开始时间恢复到本进程（之后的计时在此基础上累加）
+    返回 (运行名称, 状态)；没有报告时返回 None，本进程从空指标开始
+    """
+    global _started_at
+    try:
+        with open(os.path.join(repo_dir or REPO_DIR, METRICS_SUBDIR, 'latest.json'), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    with _lock:
+        timings.clear()
+        timings.update(data.get('stages', {}))
+        counters.clear()
+        counters.update(data.get('counters', {}))
+        _started_at = datetime.strptime(data['started_at'], '%Y-%m-%d %H:%M:%S').timestamp()
+    return data['run'], data['status']
+
+def _replace_last_line(path, line):
+    """替换文件的最后一行（只读取文件末尾，文件为空或不存在时追加）"""
+    with open(path, 'a+b') as f:
+        end = f.seek(0, os.SEEK_END)
+        start = end
+        while start > 0:
+            chunk_start = max(0, start - 4096)
+            f.seek(chunk_start)
+            chunk = f.read(start - chunk_start)
+            # 跳过结尾的换行符，找上一行的换行符
+            newline = chunk.rfind(b"\n", 0, len(chunk) - 1 if start == end else len(chunk))
+            if newline >= 0:
+                start = chunk_start + newline + 1
+                break
+            start = chunk_start
+        f.truncate(start)
+        f.write(line.encode('utf-8'))
+
+def write_report(run_name='daily', status='success', repo_dir=None, amend=False):
+    """
+    写入 latest.json / latest.prom 并追加到 history.jsonl，返回报告字典
+    amend 时替换 history.jsonl 的最后一行（resume() 接上的同一次运行）
+    """
+    data = report(run_name, status)
+    metrics_dir = os.path.join(repo_dir or REPO_DIR, METRICS_SUBDIR)
+    output_writer.write_if_changed(os.path.join(metrics_dir, 'latest.json'),
+                                   json.dumps(data, ensure_ascii=False, indent=2) + "\n", track=False)
+    output_writer.write_if_changed(os.path.join(metrics_dir, 'latest.prom'), to_prometheus(data), track=False)
+    line = json.dumps(data, ensure_ascii=False) + "\n"
+    if amend:
+        _replace_last_line(os.path.join(metrics_dir, 'history.jsonl'), line)
+    else:
+        with open(os.path.join(metrics_dir, 'history.jsonl'), 'a', encoding='utf-8') as f:
+            f.write(line)
+    return data
+
+def summary():
+    """用于运行日志的一行摘要"""
+    with _lock:
+        stages = ', '.join(f"{name} {seconds:.2f}s" for name, seconds in timings.items())
+        counts = ', '.join(f"{name} {value}" for name, value in counters.items())
+    return f"耗时: {stages or '无'} | 计数: {counts or '无'}"
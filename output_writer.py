@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+原子输出层
+先渲染到同目录的临时文件，与现有文件内容哈希相同时直接丢弃（不改 mtime、不弄脏 git 索引），
+不同时用 os.replace 原子替换，写到一半崩溃也不会留下截断的文件。
+输出统计和写入清单加锁，可以在线程中调用
+"""
+
+import os
+import hashlib
+import tempfile
+import threading
+
+# 本进程内的输出统计
+stats = {'written': 0, 'skipped': 0}
+written_paths = []
+_lock = threading.Lock()
+
+def reset_stats():
+    """清空输出统计"""
+    with _lock:
+        stats['written'] = 0
+        stats['skipped'] = 0
+        del written_paths[:]
+
+def file_digest(path):
+    """文件内容的 SHA-256，文件不存在时返回 None"""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+def _file_mode(path):
+    """沿用现有文件的权限，新文件使用 umask 默认权限"""
+    try:
+        return os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+def write_if_changed(path, chunks, track=True):
+    """
+    把 chunks（字符串或字符串迭代器）写入 path，内容未变化时跳过
+    返回 True 表示文件被写入，False 表示内容相同已跳过
+    """
+    if isinstance(chunks, str):
+        chunks = (chunks,)
+    target_dir = os.path.dirname(path) or '.'
+    os.makedirs(target_dir, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=target_dir, prefix=f".{os.path.basename(path)}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.writelines(chunks)
+        changed = (not os.path.exists(path)
+                   or os.path.getsize(path) != os.path.getsize(tmp_path)
+                   or file_digest(path) != file_digest(tmp_path))
+        if not changed:
+            os.remove(tmp_path)
+        else:
+            os.chmod(tmp_path, _file_mode(path))
+            os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    if track:
+        with _lock:
+            if changed:
+                stats['written'] += 1
+                written_paths.append(path)
+            else:
+                stats['skipped'] += 1
+    return changed
+
+def summary():
+    """用于运行日志的统计摘要"""
+    return f"写入 {stats['written']} 个文件，内容未变化跳过 {stats['skipped']} 个"
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+每日流水线入口
+在同一个进程内依次执行 候选池刷新（过期时）→ 收集 → 验证 → 补全 → 对比 → 渲染 → 索引，
+项目列表在各阶段之间直接以内存对象传递，索引阶段不再回读刚写入的文件；
+requests / bs4 等较重的模块只在需要联网或回退解析时才导入；
+成功后写出本次创建或改动的文件清单，供 git_commit.py 只暂存这些路径
+
+退出码:
+    0  成功
+    1  执行失败
+    3  缺少 Python 依赖（daily_collect.sh 会安装依赖后重新运行）
+"""
+
+import os
+import sys
+import importlib.util
+from datetime import datetime
+
+import collect_projects
+import git_commit
+import update_index
+import metrics
+import output_writer
+
+REPO_DIR = "/home/ubuntu/awesome-github-stars"
+
+# 收集阶段需要的第三方模块: 导入名 -> pip 包名
+REQUIRED_MODULES = {'requests': 'requests', 'bs4': 'beautifulsoup4'}
+EXIT_MISSING_DEPS = 3
+
+log = collect_projects.log
+
+def missing_dependencies():
+    """只检查模块是否可导入，不真正导入"""
+    return [package for module, package in REQUIRED_MODULES.items() if importlib.util.find_spec(module) is None]
+
+def stage_pool(date_str):
+    """候选池阶段：Top Stars 候选池过期时从搜索 API 刷新并保存"""
+    return collect_projects.refresh_candidate_pool(date_str)
+
+def stage_collect(date_str):
+    """收集阶段：Trending + Top Stars（按去重索引优先选择近期没有出现过的仓库）"""
+    return collect_projects.gather_projects(date_str)
+
+def stage_validate(projects, date_str):
+    """验证阶段：过滤无效项目并补足数量"""
+    return collect_projects.finalize_projects(projects, date_str)
+
+def stage_enrich(projects):
+    """补全阶段：批量查询入选仓库的准确元数据（命中本地缓存的不联网）"""
+    return collect_projects.enrich_projects(projects)
+
+def stage_diff(projects, date_str):
+    """对比阶段：与前几天的结构化记录对比，结果写入 data/diffs/ 并渲染到每日 Markdown"""
+    return collect_projects.diff_projects(projects, date_str)
+
+def stage_render(projects, date, diff):
+    """渲染阶段：写入每日 Markdown、结构化存储和时间序列"""
+    log("步骤 4/4: 生成 Markdown 文档...", "INFO")
+    return collect_projects.render_day(projects, date, diff)
+
+def stage_index(projects, output_file):
+    """索引阶段：当天的项目直接交给统计缓存，月度索引和主 README 共用同一份缓存"""
+    rel_path = os.path.relpath(output_file, REPO_DIR).replace(os.sep, '/')
+    with metrics.stage('index'):
+        preloaded = {rel_path: projects}
+        cache = update_index.refresh_cache(preloaded=preloaded)
+        update_index.refresh_search_index(preloaded=preloaded)
+        update_index.refresh_static_api(preloaded=preloaded)
+        return update_index.update_month_indexes(cache) and update_index.update_main_readme(cache)
+
+def run(date=None):
+    """执行完整流水线，返回输出文件路径"""
+    date = date or datetime.now()
+    date_str = date.strftime('%Y-%m-%d')
+    stage_pool(date_str)
+    projects = stage_enrich(stage_validate(stage_collect(date_str), date_str))
+    output_file = stage_render(projects, date, stage_diff(projects, date_str))
+    collect_projects.report_cache_stats()
+    if not stage_index(projects, output_file):
+        raise RuntimeError("索引更新失败")
+    return output_file
+
+def main():
+    """主函数"""
+    missing = missing_dependencies()
+    if missing:
+        log(f"缺少 Python 依赖: {' '.join(missing)}", "ERROR")
+        return EXIT_MISSING_DEPS
+
+    log("=" * 60, "INFO")
+    log("开始执行每日流水线：候选池 → 收集 → 验证 → 补全 → 对比 → 渲染 → 索引", "INFO")
+    log("=" * 60, "INFO")
+
+    try:
+        output_file = run()
+    except Exception as e:
+        log(f"流水线执行失败: {e}", "ERROR")
+        import traceback
+        log(traceback.format_exc(), "ERROR")
+        metrics.write_report('pipeline', status='failed', repo_dir=REPO_DIR)
+        return 1
+
+    log(f"输出文件: {output_writer.summary()}", "INFO")
+    metrics.write_report('pipeline', repo_dir=REPO_DIR)
+    changed = git_commit.write_changed_paths(REPO_DIR)
+    log(f"变更路径清单: {len(changed)} 个文件 → {git_commit.changed_paths_file(REPO_DIR)}", "INFO")
+    log(f"运行指标: {metrics.summary()}", "INFO")
+    log("=" * 60, "INFO")
+    log("✅ 每日流水线完成！", "SUCCESS")
+    log(f"输出文件: {output_file}", "INFO")
+    log("=" * 60, "INFO")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
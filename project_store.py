@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+结构化项目存储
+每天收集的项目以 JSONL 格式保存在 data/days/YYYY/YYYY-MM-DD.jsonl，
+索引脚本直接读取这里的数据，Markdown 只作为渲染视图
+"""
+
+import os
+import re
+import sys
+import json
+
+import output_writer
+
+REPO_DIR = "/home/ubuntu/awesome-github-stars"
+STORE_SUBDIR = os.path.join('data', 'days')
+
+# 每个项目保存的字段（按顺序写入，保证输出稳定）
+PROJECT_FIELDS = ('name', 'url', 'description', 'stars', 'forks', 'language', 'today_stars', 'source', 'views', 'topics',
+                  'license')
+
+def store_dir(repo_dir=None):
+    """存储根目录"""
+    return os.path.join(repo_dir or REPO_DIR, STORE_SUBDIR)
+
+def day_path(date_str, repo_dir=None):
+    """某一天的 JSONL 文件路径"""
+    return os.path.join(store_dir(repo_dir), date_str[:4], f"{date_str}.jsonl")
+
+def write_day(projects, date_str, repo_dir=None):
+    """写入某一天的项目记录（内容未变化时不改动文件），返回文件路径"""
+    path = day_path(date_str, repo_dir)
+    lines = (json.dumps({key: project[key] for key in PROJECT_FIELDS if key in project}, ensure_ascii=False) + "\n"
+             for project in projects)
+    output_writer.write_if_changed(path, lines)
+    return path
+
+def read_day(date_str, repo_dir=None):
+    """读取某一天的项目记录，不存在时返回 None"""
+    path = day_path(date_str, repo_dir)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def list_days(repo_dir=None):
+    """列出存储中所有日期（升序）"""
+    root = store_dir(repo_dir)
+    if not os.path.isdir(root):
+        return []
+    days = []
+    for year in os.listdir(root):
+        year_dir = os.path.join(root, year)
+        if not os.path.isdir(year_dir):
+            continue
+        days.extend(file[:-len('.jsonl')] for file in os.listdir(year_dir) if file.endswith('.jsonl'))
+    days.sort()
+    return days
+
+# 旧版 Markdown 解析（仅用于尚未写入存储的历史文件）
+_TITLE_RE = re.compile(r'^### \d+\. \[([^\]]+)\]\(([^)]+)\)')
+_LANGUAGE_RE = re.compile(r'^\*\*编程语言\*\*:\s*`([^`]+)`(?:\s*\|\s*\*\*来源\*\*:\s*(.+?))?\s*$')
+_STARS_RE = re.compile(r'^\*\*⭐ Stars\*\*:\s*(.+?)\s*$')
+_FORKS_RE = re.compile(r'^\*\*🔀 Forks\*\*:\s*(.+?)\s*$')
+_TODAY_RE = re.compile(r'^\*\*📈 今日新增\*\*:\s*(.+?)\s*$')
+_DESC_RE = re.compile(r'^\*\*项目简介\*\*:\s*(.*?)\s*$')
+
+def parse_markdown_projects(file_path):
+    """从已渲染的每日 Markdown 中还原项目记录"""
+    projects = []
+    current = None
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            match = _TITLE_RE.match(line)
+            if match:
+                current = {'name': match.group(1), 'url': match.group(2)}
+                projects.append(current)
+                continue
+            if current is None:
+                continue
+            match = _LANGUAGE_RE.match(line)
+            if match:
+                current['language'] = match.group(1)
+                if match.group(2):
+                    current['source'] = 'trending' if 'Trending' in match.group(2) else 'top-stars'
+                continue
+            for key, pattern in (('stars', _STARS_RE), ('forks', _FORKS_RE),
+                                 ('today_stars', _TODAY_RE), ('description', _DESC_RE)):
+                match = pattern.match(line)
+                if match:
+                    current[key] = match.group(1)
+                    break
+    # 早期文件没有来源标记：有“今日新增”的是 Trending 项目
+    for project in projects:
+        if 'source' not in project:
+            project['source'] = 'trending' if project.get('today_stars') else 'top-stars'
+    return projects
+
+def load_day(date_str, markdown_path=None, repo_dir=None):
+    """读取某一天的项目，存储中没有时回退到解析 Markdown"""
+    projects = read_day(date_str, repo_dir)
+    if projects is None and markdown_path and os.path.exists(markdown_path):
+        projects = parse_markdown_projects(markdown_path)
+    return projects
+
+def import_markdown_archive(repo_dir=None):
+    """把历史 Markdown 一次性导入存储，返回导入的天数"""
+    repo_dir = repo_dir or REPO_DIR
+    imported = 0
+    for year in sorted(os.listdir(repo_dir)):
+        year_dir = os.path.join(repo_dir, year)
+        if not (year.isdigit() and os.path.isdir(year_dir)):
+            continue
+        for month in sorted(os.listdir(year_dir)):
+            month_dir = os.path.join(year_dir, month)
+            if not os.path.isdir(month_dir):
+                continue
+            for file in sorted(os.listdir(month_dir)):
+                if not file.endswith('.md') or file == 'README.md':
+                    continue
+                date_str = file[:-len('.md')]
+                if os.path.exists(day_path(date_str, repo_dir)):
+                    continue
+                projects = parse_markdown_projects(os.path.join(month_dir, file))
+                write_day(projects, date_str, repo_dir)
+                imported += 1
+    return imported
+
+def main():
+    """主函数：python3 project_store.py --import-markdown"""
+    if '--import-markdown' in sys.argv[1:]:
+        imported = import_markdown_archive()
+        print(f"已导入 {imported} 天的历史记录到 {store_dir()}")
+        return 0
+    print("用法: python3 project_store.py --import-markdown")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Top Stars 候选池与排序
+候选仓库保存在 data/candidates.jsonl（按 stars 降序，计数为整数），
+通过 GitHub 搜索 API 按 star 区间分段刷新；
+选择 top-k 时使用预排序索引（stars / forks / growth）或堆（加权分数），
+不对整个候选池重复排序，语言和 topic 过滤走倒排索引
+
+每日流水线在候选池超过 REFRESH_DAYS 天没有刷新时自动刷新（需要 GITHUB_TOKEN），
+growth 为相邻两次刷新之间的 star 增量
+
+用法:
+    python3 ranking.py --refresh [--pages 10]           # 从搜索 API 刷新候选池
+    python3 ranking.py --top 7 --by score --language Python
+"""
+
+import os
+import sys
+import json
+import math
+import heapq
+from itertools import islice
+import argparse
+from datetime import datetime
+
+import fetcher
+import output_writer
+import timeseries
+
+REPO_DIR = "/home/ubuntu/awesome-github-stars"
+SNAPSHOT_FILE = os.path.join('data', 'candidates.jsonl')
+CANDIDATE_FIELDS = ('name', 'url', 'description', 'stars', 'forks', 'language', 'topics', 'growth', 'updated')
+SORT_KEYS = ('stars', 'forks', 'growth')
+
+# 加权分数：各项取 log10 后加权，避免 stars 的量级压过增长
+DEFAULT_WEIGHTS = {'stars': 1.0, 'growth': 2.0, 'forks': 0.5}
+
+# 搜索 API 每个查询最多返回 1000 条，按 star 区间分段才能覆盖数万个仓库
+STAR_BANDS = (
+    (100000, None), (50000, 99999), (30000, 49999), (20000, 29999),
+    (15000, 19999), (10000, 14999), (8000, 9999), (6500, 7999), (5000, 6499)
+)
+SEARCH_PAGES = 10
+SEARCH_WORKERS = 2
+
+# 每日流水线刷新候选池的间隔（天）
+REFRESH_DAYS = int(os.environ.get('POOL_REFRESH_DAYS', '7'))
+
+def _int(value):
+    """整数或 '458,524' 形式的计数 -> 整数，无法解析时为 0"""
+    if isinstance(value, int):
+        return value
+    count = timeseries.parse_count(value)
+    return count if count != timeseries.MISSING else 0
+
+def normalize(repo):
+    """项目字典（字符串计数）或候选字典 -> 候选字典"""
+    name = repo.get('name', '')
+    return {
+        'name': name,
+        'url': repo.get('url') or f"https://github.com/{name}",
+        'description': repo.get('description') or "No description available",
+        'stars': _int(repo.get('stars')),
+        'forks': _int(repo.get('forks')),
+        'language': repo.get('language') or 'None',
+        'topics': list(repo.get('topics') or ()),
+        'growth': _int(repo.get('growth')),
+        'updated': repo.get('updated', '')
+    }
+
+def from_search_item(item, date_str):
+    """搜索 API 返回的仓库 -> 候选字典"""
+    return {
+        'name': item['full_name'],
+        'url': item['html_url'],
+        'description': item.get('description') or "No description available",
+        'stars': item.get('stargazers_count', 0),
+        'forks': item.get('forks_count', 0),
+        'language': item.get('language') or 'None',
+        'topics': item.get('topics') or [],
+        'growth': 0,
+        'updated': date_str
+    }
+
+def to_project(candidate):
+    """候选字典 -> 每日文档使用的项目字典（计数格式化为 '458,524'）"""
+    return {
+        'name': candidate['name'],
+        'url': candidate['url'],
+        'stars': f"{candidate['stars']:,}",
+        'forks': f"{candidate['forks']:,}",
+        'language': candidate['language'],
+        'description': candidate['description'],
+        'source': 'top-stars'
+    }
+
+class CandidatePool:
+    """候选仓库集合，排序索引和过滤索引在首次使用时建立并缓存"""
+
+    def __init__(self, candidates=()):
+        self.candidates = []
+        self.positions = {}
+        for candidate in candidates:
+            self._add(candidate)
+        self._reset_indexes()
+
+    def _add(self, candidate):
+        position = self.positions.get(candidate['name'])
+        if position is None:
+            self.positions[candidate['name']] = len(self.candidates)
+            self.candidates.append(candidate)
+        else:
+            self.candidates[position] = candidate
+
+    def _reset_indexes(self):
+        self._order = {}
+        self._scores = {}
+        self._by_language = None
+        self._by_topic = None
+
+    def __len__(self):
+        return len(self.candidates)
+
+    def updated(self):
+        """最近一次刷新的日期（种子列表为空字符串）"""
+        return max((candidate.get('updated') or '' for candidate in self.candidates), default='')
+
+    def is_stale(self, date_str, days=None):
+        """距最近一次刷新是否已满 days 天（从未刷新过也算过期）"""
+        days = REFRESH_DAYS if days is None else days
+        updated = self.updated()
+        if not updated:
+            return True
+        elapsed = datetime.strptime(date_str, '%Y-%m-%d') - datetime.strptime(updated, '%Y-%m-%d')
+        return elapsed.days >= days
+
+    @classmethod
+    def load(cls, repo_dir=None, fallback=()):
+        """读取快照，快照不存在时使用 fallback（项目字典列表）"""
+        path = os.path.join(repo_dir or REPO_DIR, SNAPSHOT_FILE)
+        if not os.path.exists(path):
+            return cls(normalize(repo) for repo in fallback)
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.loads(line) for line in f if line.strip())
+
+    def save(self, repo_dir=None):
+        """按 stars 降序写入快照（下次加载后 stars 索引近似有序，排序接近线性）"""
+        path = os.path.join(repo_dir or REPO_DIR, SNAPSHOT_FILE)
+        lines = (json.dumps({key: self.candidates[index][key] for key in CANDIDATE_FIELDS}, ensure_ascii=False) + "\n"
+                 for index in self._sorted('stars'))
+        return output_writer.write_if_changed(path, lines)
+
+    def merge(self, repos, date_str):
+        """合并刷新得到的仓库；已有仓库的 growth 记为两次快照之间的 star 增量，返回新增数量"""
+        added = 0
+        for repo in repos:
+            candidate = normalize(repo)
+            candidate['updated'] = candidate['updated'] or date_str
+            previous = self.positions.get(candidate['name'])
+            if previous is None:
+                added += 1
+            else:
+                old = self.candidates[previous]
+                if old.get('updated') and old['updated'] < candidate['updated']:
+                    candidate['growth'] = candidate['stars'] - old['stars']
+                else:
+                    candidate['growth'] = old.get('growth', 0)
+            self._add(candidate)
+        self._reset_indexes()
+        return added
+
+    def _sorted(self, key):
+        """按 key 降序的下标列表（稳定排序，同值保持快照中的顺序）"""
+        order = self._order.get(key)
+        if order is None:
+            column = [candidate[key] for candidate in self.candidates]
+            order = sorted(range(len(column)), key=column.__getitem__, reverse=True)
+            self._order[key] = order
+        return order
+
+    def _score_column(self, weights=None):
+        """每个候选的加权分数（按权重缓存）"""
+        weights = weights or DEFAULT_WEIGHTS
+        cache_key = tuple(sorted(weights.items()))
+        column = self._scores.get(cache_key)
+        if column is None:
+            column = [0.0] * len(self.candidates)
+            for key, weight in weights.items():
+                values = [math.log10(max(candidate.get(key, 0), 0) + 1) for candidate in self.candidates]
+                column = [total + weight * value for total, value in zip(column, values)]
+            self._scores[cache_key] = column
+        return column
+
+    def _matching(self, language=None, topic=None):
+        """符合过滤条件的下标集合，没有过滤条件时返回 None"""
+        if language is None and topic is None:
+            return None
+        if self._by_language is None:
+            self._by_language, self._by_topic = {}, {}
+            for index, candidate in enumerate(self.candidates):
+                self._by_language.setdefault(candidate['language'].lower(), set()).add(index)
+                for name in candidate['topics']:
+                    self._by_topic.setdefault(name.lower(), set()).add(index)
+        matched = None
+        if language is not None:
+            matched = self._by_language.get(language.lower(), set())
+        if topic is not None:
+            by_topic = self._by_topic.get(topic.lower(), set())
+            matched = by_topic if matched is None else matched & by_topic
+        return matched
+
+    def iter_top(self, by='stars', language=None, topic=None, exclude=None, weights=None):
+        """
+        按排序方式惰性产出满足条件的候选
+        by 为 stars / forks / growth 时沿预排序索引逐个产出；
+        by 为 score 时先建堆（O(n)），每取一个再弹出一次（O(log n)）
+        exclude(name) 返回 True 的仓库会被跳过
+        """
+        matched = self._matching(language, topic)
+        candidates = self.candidates
+        if by == 'score':
+            indexes = range(len(candidates)) if matched is None else matched
+            column = self._score_column(weights)
+            heap = [(-column[index], index) for index in indexes]
+            heapq.heapify(heap)
+            while heap:
+                _, index = heapq.heappop(heap)
+                if not (exclude and exclude(candidates[index]['name'])):
+                    yield candidates[index]
+            return
+        if by not in SORT_KEYS:
+            raise ValueError(f"未知的排序方式: {by}")
+        for index in self._sorted(by):
+            if matched is not None and index not in matched:
+                continue
+            if exclude and exclude(candidates[index]['name']):
+                continue
+            yield candidates[index]
+
+    def top(self, limit, by='stars', language=None, topic=None, exclude=None, weights=None):
+        """选出 limit 个候选（iter_top 的前 limit 个）"""
+        return list(islice(self.iter_top(by, language, topic, exclude, weights), limit))
+
+def search_queries(bands=STAR_BANDS):
+    """按 star 区间生成搜索条件"""
+    return [f"stars:>={low}" if high is None else f"stars:{low}..{high}" for low, high in bands]
+
+def refresh(pool, pages=SEARCH_PAGES, bands=STAR_BANDS, date_str=None, token=None):
+    """通过搜索 API 刷新候选池，返回 (新增数量, 失败的页面数)"""
+    date_str = date_str or datetime.now().strftime('%Y-%m-%d')
+    headers = {'Accept': 'application/vnd.github+json'}
+    token = token or os.environ.get('GITHUB_TOKEN')
+    if token:
+        headers['Authorization'] = f"Bearer {token}"
+    urls = [fetcher.search_url(query, page) for query in search_queries(bands) for page in range(1, pages + 1)]
+    session = fetcher.create_session(headers, pool_size=SEARCH_WORKERS)
+    try:
+        results = fetcher.fetch_pages(urls, session=session, max_workers=SEARCH_WORKERS, parse=json.loads)
+    finally:
+        session.close()
+
+    repos, failed = [], 0
+    for url in urls:
+        result = results[url]
+        if isinstance(result, Exception):
+            failed += 1
+            continue
+        repos.extend(from_search_item(item, date_str) for item in result.get('items', []))
+    return pool.merge(repos, date_str), failed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Top Stars 候选池')
+    parser.add_argument('--refresh', action='store_true', help='从 GitHub 搜索 API 刷新候选池')
+    parser.add_argument('--pages', type=int, default=SEARCH_PAGES, help='每个 star 区间抓取的页数（每页 100 个）')
+    parser.add_argument('--top', type=int, metavar='K', help='输出前 K 个候选')
+    parser.add_argument('--by', choices=SORT_KEYS + ('score',), default='stars')
+    parser.add_argument('--language')
+    parser.add_argument('--topic')
+    args = parser.parse_args(argv)
+
+    pool = CandidatePool.load()
+    if args.refresh:
+        added, failed = refresh(pool, args.pages)
+        pool.save()
+        print(f"候选池已刷新: 共 {len(pool)} 个仓库，新增 {added} 个，失败页面 {failed} 个")
+    if args.top:
+        for rank, candidate in enumerate(pool.top(args.top, args.by, args.language, args.topic), 1):
+            print(f"{rank}. {candidate['name']} ⭐ {candidate['stars']:,} (+{candidate['growth']:,}) {candidate['language']}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
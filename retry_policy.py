@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+重试与限速
+- 错误分类: 网络错误和 5xx 可重试，429 / 带限额信息的 403 属于限流，其它 4xx 和解析失败不重试
+- 指数退避加全抖动（AWS "full jitter"），上限 MAX_BACKOFF 秒；服务器给出 Retry-After 时以它为准
+- 每个主机一个令牌桶，所有抓取线程共享；遇到限流时整个主机暂停，而不是各线程各自重试
+重试等待计入运行指标的 retry_wait，令牌桶等待计入 rate_limit_wait
+"""
+
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import metrics
+
+# 错误类型
+RETRYABLE = 'retryable'
+RATE_LIMITED = 'rate_limited'
+FATAL = 'fatal'
+
+MAX_BACKOFF = 60  # 秒
+
+# 每个主机的令牌桶配置: (每秒请求数, 突发容量)
+HOST_LIMITS = {
+    'github.com': (5.0, 10),
+    'api.github.com': (0.5, 5)
+}
+DEFAULT_LIMIT = (4.0, 8)
+
+_random = random.Random()
+
+def classify(error):
+    """把异常分为 RETRYABLE / RATE_LIMITED / FATAL"""
+    response = getattr(error, 'response', None)
+    if response is None:
+        # 只有网络层错误（连接失败、超时等）值得重试；解析失败等其它异常重试也不会变好
+        import requests
+        if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+            return RETRYABLE
+        return FATAL
+    status = response.status_code
+    if status == 429:
+        return RATE_LIMITED
+    if status == 403 and (response.headers.get('Retry-After') or response.headers.get('X-RateLimit-Remaining') == '0'):
+        return RATE_LIMITED
+    if status >= 500 or status == 408:
+        return RETRYABLE
+    return FATAL
+
+def retry_after(response, now=None):
+    """从 Retry-After（秒数或 HTTP 日期）或 X-RateLimit-Reset 得到需要等待的秒数，没有时返回 None"""
+    if response is None:
+        return None
+    now = time.time() if now is None else now
+    value = response.headers.get('Retry-After')
+    if value:
+        if value.strip().isdigit():
+            return float(value)
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - now)
+        except (TypeError, ValueError):
+            pass
+    reset = response.headers.get('X-RateLimit-Reset')
+    if reset and reset.strip().isdigit() and response.headers.get('X-RateLimit-Remaining') == '0':
+        return max(0.0, int(reset) - now)
+    return None
+
+def backoff(attempt, base, cap=MAX_BACKOFF):
+    """第 attempt 次失败后的等待时间：[0, min(cap, base * 2^(attempt-1))] 内均匀随机"""
+    return _random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+def delay_for(error, attempt, base):
+    """某次失败后应等待的秒数（服务器指定的等待时间优先，但不超过 MAX_BACKOFF 的 10 倍）"""
+    server_delay = retry_after(getattr(error, 'response', None))
+    if server_delay is not None:
+        return min(server_delay, MAX_BACKOFF * 10)
+    return backoff(attempt, base)
+
+class TokenBucket:
+    """线程安全的令牌桶；pause() 让所有使用者等待到指定时间"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        """取一个令牌，返回需要等待的秒数（令牌已预先扣除）"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self.paused_until - now)
+
+    def acquire(self):
+        """阻塞到拿到令牌为止，返回等待的秒数"""
+        wait = self._reserve()
+        if wait > 0:
+            with metrics.stage('rate_limit_wait'):
+                time.sleep(wait)
+        return wait
+
+    def pause(self, seconds):
+        """限流时暂停整个主机"""
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+def limiter_for(url):
+    """URL 所属主机的共享令牌桶"""
+    host = urlsplit(url).hostname or ''
+    with _limiters_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            limiter = _limiters[host] = TokenBucket(*HOST_LIMITS.get(host, DEFAULT_LIMIT))
+        return limiter
+
+def wait_before_retry(error, attempt, base, limiter=None):
+    """
+    按错误类型决定是否重试：不可重试时返回 False；
+    否则等待退避时间（限流时同时暂停整个主机），记录指标后返回 True
+    """
+    kind = classify(error)
+    if kind == FATAL:
+        return False
+    delay = delay_for(error, attempt, base)
+    if kind == RATE_LIMITED:
+        metrics.incr('rate_limited')
+        if limiter is not None:
+            limiter.pause(delay)
+    metrics.incr('retries')
+    with metrics.stage('retry_wait'):
+        time.sleep(delay)
+    return True
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+归档检索命令行
+只读取 data/search_index.json 及其追加段（由 update_index.py / pipeline.py 增量维护）
+
+用法:
+    python3 search_archive.py database --language Rust --quarter 2026Q1
+    python3 search_archive.py "vector search" --from 2026-01-01 --to 2026-02-15 --unique
+    python3 search_archive.py --language Go --facets
+    python3 search_archive.py --rebuild
+"""
+
+import sys
+import time
+import argparse
+from datetime import datetime
+
+import search_index
+
+def valid_date(value):
+    """argparse 类型：YYYY-MM-DD"""
+    try:
+        datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"日期格式应为 YYYY-MM-DD: {value}")
+    return value
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='检索已收集的项目归档')
+    parser.add_argument('query', nargs='*', help='关键词（仓库名或简介，多个词同时出现）')
+    parser.add_argument('--language', help='编程语言（不区分大小写）')
+    parser.add_argument('--source', choices=('trending', 'top-stars'), help='项目来源')
+    parser.add_argument('--from', dest='date_from', type=valid_date, help='开始日期 YYYY-MM-DD')
+    parser.add_argument('--to', dest='date_to', type=valid_date, help='结束日期 YYYY-MM-DD')
+    parser.add_argument('--quarter', help='季度，如 2026Q1（与 --from/--to 取交集）')
+    parser.add_argument('--unique', action='store_true', help='按仓库合并，显示出现次数和最近日期')
+    parser.add_argument('--facets', action='store_true', help='显示语言 / 月份 / 来源分面统计')
+    parser.add_argument('--limit', type=int, default=20, help='最多显示的结果数')
+    parser.add_argument('--rebuild', action='store_true', help='从每日文件重建检索索引')
+    return parser.parse_args(argv)
+
+def print_results(index, doc_ids, unique, limit):
+    """输出检索结果"""
+    if unique:
+        repos = {}
+        for doc_id in doc_ids:
+            doc = index.doc(doc_id)
+            entry = repos.setdefault(doc['name'], {'doc': doc, 'count': 0})
+            entry['count'] += 1
+        print(f"共 {len(repos)} 个仓库（{len(doc_ids)} 次收录）")
+        for name, entry in list(repos.items())[:limit]:
+            doc = entry['doc']
+            print(f"- {name} [{doc['language']}] 收录 {entry['count']} 次，最近 {doc['date']}: {doc['description']}")
+        return
+    print(f"共 {len(doc_ids)} 条记录")
+    for doc_id in doc_ids[:limit]:
+        doc = index.doc(doc_id)
+        print(f"- {doc['date']} {doc['name']} [{doc['language']}] ({doc['source']}): {doc['description']}")
+
+def print_facets(facets):
+    """输出分面统计"""
+    for name, title in (('language', '语言'), ('month', '月份'), ('source', '来源')):
+        counts = facets[name]
+        if name == 'month':
+            items = sorted(counts.items())
+        else:
+            items = sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:10]
+        print(f"{title}: " + ', '.join(f"{key} ({count})" for key, count in items))
+
+def main(argv=None):
+    """主函数"""
+    args = parse_args(argv)
+    if args.rebuild:
+        import update_index
+        stats = update_index.refresh_search_index(rebuild=True)
+        print(f"已重建检索索引: {stats['docs']} 条记录")
+        return 0
+
+    date_from, date_to = args.date_from, args.date_to
+    if args.quarter:
+        try:
+            quarter_from, quarter_to = search_index.quarter_range(args.quarter)
+        except ValueError as e:
+            print(e)
+            return 1
+        date_from = max(date_from or quarter_from, quarter_from)
+        date_to = min(date_to or quarter_to, quarter_to)
+
+    index = search_index.SearchIndex.load()
+    if not len(index):
+        print("检索索引为空，请先运行 python3 update_index.py 或 python3 search_archive.py --rebuild")
+        return 1
+
+    start = time.perf_counter()
+    doc_ids = index.search(' '.join(args.query), language=args.language, date_from=date_from,
+                           date_to=date_to, source=args.source)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    print_results(index, doc_ids, args.unique, args.limit)
+    if args.facets:
+        print_facets(index.facets(doc_ids))
+    print(f"（查询耗时 {elapsed:.1f} ms）")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
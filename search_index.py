@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+归档全文与分面检索索引
+每个每日文件中的每个项目是一条文档，倒排表覆盖仓库名和简介中的词，
+语言单独建分面倒排表，日期保存在文档中用于范围过滤；
+与统计缓存一样按 (文件路径, mtime, size) 增量更新，每天只处理新增或变化的文件。
+索引分段存储（都可随时重建，不纳入版本控制）:
+- data/search_index.json: 基础段（文档、倒排表和每个文件的文档编号范围）
+- data/search_index.log.jsonl: 追加段，每个新增 / 变化 / 删除的文件一行，加载时在基础段之上重放
+- data/search_index.state.json: 每个文件的 (mtime, size, 文档数) 和各段文档数
+日常更新只读状态文件、追加新段，耗时只与新文档数有关；追加段累计超过基础段的 COMPACT_RATIO 时
+才加载全部段合并成新的基础段（按比例触发，均摊到每个文档仍是常数）。
+查询只读取这两个段，不打开任何 Markdown 文件
+"""
+
+import os
+import re
+import json
+
+import aggregate_cache
+import output_writer
+
+REPO_DIR = "/home/ubuntu/awesome-github-stars"
+INDEX_FILE = os.path.join('data', 'search_index.json')
+LOG_FILE = os.path.join('data', 'search_index.log.jsonl')
+STATE_FILE = os.path.join('data', 'search_index.state.json')
+INDEX_VERSION = 2
+
+# 追加段的文档数（含被替换、删除的旧文档）超过基础段的这个比例时合并段
+COMPACT_RATIO = 0.25
+
+# 英文和数字按词切分，中文按单字切分
+TOKEN_RE = re.compile(r'[a-z0-9]+|[\u4e00-\u9fff]')
+
+# 文档字段: [日期, 仓库名, 语言, 来源, 简介]
+DOC_DATE, DOC_NAME, DOC_LANGUAGE, DOC_SOURCE, DOC_DESCRIPTION = range(5)
+
+def tokenize(text):
+    """小写后切分为检索词（去重，保持顺序）"""
+    return list(dict.fromkeys(TOKEN_RE.findall((text or '').lower())))
+
+def quarter_range(quarter):
+    """'2026Q1' / '2026-Q1' -> ('2026-01-01', '2026-03-31')"""
+    match = re.fullmatch(r'(\d{4})-?[Qq]([1-4])', quarter.strip())
+    if not match:
+        raise ValueError(f"无法识别的季度: {quarter}")
+    year, number = int(match.group(1)), int(match.group(2))
+    end_month = number * 3
+    end_day = {3: 31, 6: 30, 9: 30, 12: 31}[end_month]
+    return f"{year}-{end_month - 2:02d}-01", f"{year}-{end_month:02d}-{end_day}"
+
+def make_docs(rel_path, projects):
+    """一个每日文件的项目 -> 文档列表"""
+    date_str = os.path.basename(rel_path)[:-len('.md')]
+    return [[date_str, project.get('name', ''), project.get('language') or 'Unknown',
+             project.get('source', ''), project.get('description') or '']
+            for project in projects if project.get('name')]
+
+class SearchIndex:
+    """
+    倒排索引：docs 为文档列表（删除的文档置为 None），terms / languages 为 {键: [文档编号]}，
+    files 为 {相对路径: [mtime_ns, size, 首个文档编号, 文档数]}（每个文件的文档编号连续）
+    """
+
+    def __init__(self, repo_dir=None):
+        self.repo_dir = repo_dir or REPO_DIR
+        self.path = os.path.join(self.repo_dir, INDEX_FILE)
+        self.log_path = os.path.join(self.repo_dir, LOG_FILE)
+        self.state_path = os.path.join(self.repo_dir, STATE_FILE)
+        self.files = {}
+        self.docs = []
+        self.terms = {}
+        self.languages = {}
+        self.deleted = 0
+
+    @classmethod
+    def load(cls, repo_dir=None):
+        """读取基础段并重放追加段，不存在或版本不符时返回空索引"""
+        index = cls(repo_dir)
+        try:
+            with open(index.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return index
+        if data.get('version') != INDEX_VERSION:
+            return index
+        index.files = data['files']
+        index.docs = data['docs']
+        index.terms = data['terms']
+        index.languages = data['languages']
+        index.deleted = sum(1 for doc in index.docs if doc is None)
+        try:
+            with open(index.log_path, 'r', encoding='utf-8') as f:
+                index.apply(json.loads(line) for line in f if line.strip())
+        except FileNotFoundError:
+            pass
+        return index
+
+    def save(self):
+        """
+        把整个索引写成新的基础段并清空追加段（全量构建和合并段时使用）
+        原子保存，不计入输出统计
+        """
+        data = {'version': INDEX_VERSION, 'files': self.files, 'docs': self.docs,
+                'terms': self.terms, 'languages': self.languages}
+        output_writer.write_if_changed(self.path, json.dumps(data, ensure_ascii=False, separators=(',', ':')),
+                                       track=False)
+        # 先写基础段再删追加段：中途失败时重放的段会替换基础段中的同名文件，结果不变
+        if os.path.exists(self.log_path):
+            os.remove(self.log_path)
+        write_state(self.repo_dir, {
+            'files': {rel_path: entry[:2] + [entry[3]] for rel_path, entry in self.files.items()},
+            'base_docs': len(self.docs), 'log_docs': 0, 'deleted': self.deleted})
+        return self.path
+
+    def __len__(self):
+        return len(self.docs) - self.deleted
+
+    def _add_doc(self, doc):
+        doc_id = len(self.docs)
+        self.docs.append(doc)
+        for term in tokenize(doc[DOC_NAME].replace('/', ' ') + ' ' + doc[DOC_DESCRIPTION]):
+            self.terms.setdefault(term, []).append(doc_id)
+        self.languages.setdefault(doc[DOC_LANGUAGE].lower(), []).append(doc_id)
+        return doc_id
+
+    def add_file(self, rel_path, docs, mtime_ns, size):
+        """索引一个每日文件的文档（已索引过的文件先删除旧文档）"""
+        if rel_path in self.files:
+            self.remove_file(rel_path)
+        start = len(self.docs)
+        for doc in docs:
+            self._add_doc(doc)
+        self.files[rel_path] = [mtime_ns, size, start, len(docs)]
+
+    def remove_file(self, rel_path):
+        """删除一个文件的文档（只置空，倒排表中的编号在查询和压缩时过滤）"""
+        _, _, start, count = self.files.pop(rel_path)
+        for doc_id in range(start, start + count):
+            self.docs[doc_id] = None
+        self.deleted += count
+
+    def apply(self, segments):
+        """应用追加段：docs 为 None 表示文件已删除，否则替换该文件的文档"""
+        for segment in segments:
+            if segment['docs'] is None:
+                if segment['path'] in self.files:
+                    self.remove_file(segment['path'])
+            else:
+                self.add_file(segment['path'], segment['docs'], segment['mtime_ns'], segment['size'])
+
+    def compact(self):
+        """用现存文档重新编号并重建倒排表（不读取任何文件）"""
+        docs_by_file = {rel_path: (entry[:2], self.docs[entry[2]:entry[2] + entry[3]])
+                        for rel_path, entry in self.files.items()}
+        self.files, self.docs, self.terms, self.languages, self.deleted = {}, [], {}, {}, 0
+        for rel_path in sorted(docs_by_file):
+            (mtime_ns, size), docs = docs_by_file[rel_path]
+            self.add_file(rel_path, docs, mtime_ns, size)
+
+    def build(self, loader, preloaded=None):
+        """
+        从所有每日文件全量建立索引
+        loader / preloaded 与 aggregate_cache.update_cache 相同，返回 stats
+        """
+        self.files, self.docs, self.terms, self.languages, self.deleted = {}, [], {}, {}, 0
+        current = aggregate_cache.scan_daily_files(self.repo_dir)
+        for rel_path in sorted(current):
+            projects = _load(loader, self.repo_dir, rel_path, preloaded)
+            self.add_file(rel_path, make_docs(rel_path, projects), *current[rel_path])
+        return {'added': len(current), 'changed': 0, 'removed': 0, 'reused': 0}
+
+    def search(self, text='', language=None, date_from=None, date_to=None, source=None):
+        """
+        检索：text 中的所有词都要出现（AND），language / source 精确匹配，日期含两端
+        返回按日期降序的文档编号列表
+        """
+        candidates = None
+        postings = [self.terms.get(term, []) for term in tokenize(text)]
+        if language:
+            postings.append(self.languages.get(language.lower(), []))
+        # 从最短的倒排表开始求交集
+        for posting in sorted(postings, key=len):
+            candidates = set(posting) if candidates is None else candidates.intersection(posting)
+            if not candidates:
+                return []
+        docs = self.docs
+        doc_ids = range(len(docs)) if candidates is None else candidates
+        results = []
+        for doc_id in doc_ids:
+            doc = docs[doc_id]
+            if doc is None:
+                continue
+            if date_from and doc[DOC_DATE] < date_from:
+                continue
+            if date_to and doc[DOC_DATE] > date_to:
+                continue
+            if source and doc[DOC_SOURCE] != source:
+                continue
+            results.append(doc_id)
+        results.sort(key=lambda doc_id: (docs[doc_id][DOC_DATE], -doc_id), reverse=True)
+        return results
+
+    def facets(self, doc_ids):
+        """结果的分面统计: 语言、月份、来源"""
+        facets = {'language': {}, 'month': {}, 'source': {}}
+        for doc_id in doc_ids:
+            doc = self.docs[doc_id]
+            for name, value in (('language', doc[DOC_LANGUAGE]), ('month', doc[DOC_DATE][:7]),
+                                ('source', doc[DOC_SOURCE])):
+                facets[name][value] = facets[name].get(value, 0) + 1
+        return facets
+
+    def doc(self, doc_id):
+        """文档编号 -> 字典"""
+        date_str, name, language, source, description = self.docs[doc_id]
+        return {'date': date_str, 'name': name, 'language': language, 'source': source, 'description': description}
+
+def _load(loader, repo_dir, rel_path, preloaded):
+    if preloaded and rel_path in preloaded:
+        return preloaded[rel_path]
+    return loader(os.path.join(repo_dir, rel_path))
+
+def read_state(repo_dir=None):
+    """读取状态文件；不存在、版本不符或基础段缺失时返回 None（需要全量构建）"""
+    repo_dir = repo_dir or REPO_DIR
+    if not os.path.exists(os.path.join(repo_dir, INDEX_FILE)):
+        return None
+    try:
+        with open(os.path.join(repo_dir, STATE_FILE), 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return state if state.get('version') == INDEX_VERSION else None
+
+def write_state(repo_dir, state):
+    """原子保存状态文件"""
+    state = dict(state, version=INDEX_VERSION)
+    output_writer.write_if_changed(os.path.join(repo_dir or REPO_DIR, STATE_FILE),
+                                   json.dumps(state, ensure_ascii=False, separators=(',', ':')), track=False)
+
+def append_segments(repo_dir, segments):
+    """把新段追加到 search_index.log.jsonl"""
+    with open(os.path.join(repo_dir or REPO_DIR, LOG_FILE), 'a', encoding='utf-8') as f:
+        for segment in segments:
+            f.write(json.dumps(segment, ensure_ascii=False, separators=(',', ':')) + "\n")
+
+def refresh(loader, repo_dir=None, preloaded=None, rebuild=False):
+    """
+    增量更新索引，返回 stats（docs 为更新后的文档数，compacted 表示本次是否合并了段）
+    日常只读取状态文件并追加新段，不加载、不重写基础段
+    """
+    repo_dir = repo_dir or REPO_DIR
+    state = None if rebuild else read_state(repo_dir)
+    if state is None:
+        index = SearchIndex(repo_dir)
+        stats = index.build(loader, preloaded)
+        index.save()
+        return dict(stats, docs=len(index), compacted=True)
+
+    current = aggregate_cache.scan_daily_files(repo_dir)
+    files = state['files']
+    stats = {'added': 0, 'changed': 0, 'removed': 0, 'reused': 0}
+    segments = []
+
+    for rel_path in [path for path in files if path not in current]:
+        state['deleted'] += files.pop(rel_path)[2]
+        segments.append({'path': rel_path, 'docs': None})
+        stats['removed'] += 1
+
+    for rel_path in sorted(current):
+        mtime_ns, size = current[rel_path]
+        old = files.get(rel_path)
+        if old and old[0] == mtime_ns and old[1] == size:
+            stats['reused'] += 1
+            continue
+        if old:
+            state['deleted'] += old[2]
+            stats['changed'] += 1
+        else:
+            stats['added'] += 1
+        docs = make_docs(rel_path, _load(loader, repo_dir, rel_path, preloaded))
+        segments.append({'path': rel_path, 'mtime_ns': mtime_ns, 'size': size, 'docs': docs})
+        files[rel_path] = [mtime_ns, size, len(docs)]
+        state['log_docs'] += len(docs)
+
+    stats['compacted'] = False
+    if segments and state['log_docs'] + state['deleted'] > state['base_docs'] * COMPACT_RATIO:
+        index = SearchIndex.load(repo_dir)
+        index.apply(segments)
+        index.compact()
+        index.save()
+        stats['compacted'] = True
+    elif segments:
+        # 先追加段再写状态：中途失败时下次会重新追加这些文件，重放时替换为同样的文档
+        append_segments(repo_dir, segments)
+        write_state(repo_dir, state)
+    stats['docs'] = state['base_docs'] + state['log_docs'] - state['deleted']
+    return stats
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+跨天去重索引
+data/seen_index.json 记录每个仓库最近两次入选的日期（哈希表，O(1) 查询），
+选择项目时 sources.prefer_unseen 阶段据此优先使用冷却期内没有出现过的仓库；
+超过 PRUNE_AFTER_DAYS 没有出现的仓库会被清理，文件大小只与近期出现过的仓库数有关
+
+用法:
+    python3 seen_index.py --rebuild     # 从 data/days/ 重建
+    python3 seen_index.py --stats
+"""
+
+import os
+import sys
+import json
+from datetime import datetime, timedelta
+
+import output_writer
+import project_store
+
+REPO_DIR = "/home/ubuntu/awesome-github-stars"
+INDEX_FILE = os.path.join('data', 'seen_index.json')
+INDEX_VERSION = 1
+
+# 冷却期（天）：最近出现过的仓库在这段时间内优先级降低
+COOLDOWN_DAYS = int(os.environ.get('SEEN_COOLDOWN_DAYS', '7'))
+# 超过这个天数没有出现的仓库从索引中删除
+PRUNE_AFTER_DAYS = 365
+
+class SeenIndex:
+    """仓库名 -> [最近一次入选日期, 上一次入选日期]"""
+
+    def __init__(self, repo_dir=None, cooldown=None):
+        self.path = os.path.join(repo_dir or REPO_DIR, INDEX_FILE)
+        self.cooldown = COOLDOWN_DAYS if cooldown is None else cooldown
+        self.repos = {}
+        self.load()
+
+    def load(self):
+        """读取索引，文件不存在或版本不符时从空索引开始"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        if data.get('version') == INDEX_VERSION:
+            self.repos = data.get('repos', {})
+
+    def save(self):
+        """按仓库名排序、每个仓库一行写入（diff 友好，内容未变化时不改动文件），返回是否写入"""
+        entries = ',\n'.join(f"  {json.dumps(name, ensure_ascii=False)}: {json.dumps(dates)}"
+                             for name, dates in sorted(self.repos.items()))
+        content = f'{{"version": {INDEX_VERSION}, "repos": {{\n{entries}\n}}}}\n'
+        return output_writer.write_if_changed(self.path, content)
+
+    def __len__(self):
+        return len(self.repos)
+
+    def last_seen(self, name, date_str):
+        """date_str 之前最近一次入选的日期（同一天重复运行时不把当天算作已出现）"""
+        for seen in self.repos.get(name, ()):
+            if seen and seen < date_str:
+                return seen
+        return None
+
+    def is_cooling(self, name, date_str):
+        """仓库是否在冷却期内出现过"""
+        seen = self.last_seen(name, date_str)
+        if seen is None:
+            return False
+        start = (datetime.strptime(date_str, '%Y-%m-%d') - timedelta(days=self.cooldown)).strftime('%Y-%m-%d')
+        return seen >= start
+
+    def mark(self, projects, date_str):
+        """记录某一天入选的项目"""
+        for project in projects:
+            name = project.get('name')
+            if not name:
+                continue
+            dates = self.repos.get(name)
+            if not dates:
+                self.repos[name] = [date_str, None]
+            elif date_str > dates[0]:
+                self.repos[name] = [date_str, dates[0]]
+            elif date_str < dates[0] and (dates[1] is None or date_str > dates[1]):
+                dates[1] = date_str
+
+    def prune(self, date_str, max_age=PRUNE_AFTER_DAYS):
+        """删除超过 max_age 天没有出现的仓库，返回删除的数量"""
+        cutoff = (datetime.strptime(date_str, '%Y-%m-%d') - timedelta(days=max_age)).strftime('%Y-%m-%d')
+        stale = [name for name, dates in self.repos.items() if dates[0] < cutoff]
+        for name in stale:
+            del self.repos[name]
+        return len(stale)
+
+def rebuild(repo_dir=None):
+    """从结构化存储重建索引"""
+    index = SeenIndex(repo_dir)
+    index.repos = {}
+    days = project_store.list_days(repo_dir)
+    for date_str in days:
+        index.mark(project_store.read_day(date_str, repo_dir) or [], date_str)
+    if days:
+        index.prune(days[-1])
+    index.save()
+    return index
+
+def main(argv=None):
+    """主函数"""
+    argv = sys.argv[1:] if argv is None else argv
+    if '--rebuild' in argv:
+        index = rebuild()
+        print(f"已重建去重索引: {len(index)} 个仓库")
+        return 0
+    if '--stats' in argv:
+        index = SeenIndex()
+        today = datetime.now().strftime('%Y-%m-%d')
+        cooling = sum(1 for name in index.repos if index.is_cooling(name, today))
+        print(f"索引中共 {len(index)} 个仓库，冷却期（{index.cooldown} 天）内 {cooling} 个")
+        return 0
+    print("用法: python3 seen_index.py --rebuild | --stats")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
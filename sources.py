@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+项目来源插件与流式选择
+每个来源是一个惰性迭代器（Source.iter_projects），只有下游还需要项目时才抓取 / 解析下一批：
+- trending: 配置的全部视图（周期 × 语言）一次并发抓取，合并后按 daily → weekly → monthly 的顺序产出
+- top-stars: 沿候选池的排序索引逐个产出
+- curated: 手工维护的 data/curated.jsonl（逐行读取）
+- snapshot: 最近一天的结构化记录（离线或抓取失败时用来补足）
+选择过程由生成器阶段串联: 来源 → validate → prefer_unseen → dedup → take(N)，配额取满后不再向上游拉取。
+新增来源只需注册一个 Source 子类并写进 PROJECT_SOURCES / FILL_SOURCES，collect_projects.main 不需要改动。
+抓取 Trending 页面、加载候选池等依赖由调用方通过 select_projects(options=...) 注入到来源的构造参数，
+本模块不导入 collect_projects（预览命令见 python3 collect_projects.py --preview）
+"""
+
+import os
+import json
+from datetime import datetime, timedelta
+
+import metrics
+import project_store
+import ranking
+
+REPO_DIR = "/home/ubuntu/awesome-github-stars"
+
+# 每天的项目数
+DAILY_LIMIT = 15
+
+# 来源计划: 名称:配额（逗号分隔，按顺序选择）；配额用完后仍不足 DAILY_LIMIT 时依次从 FILL_SOURCES 补足
+PROJECT_SOURCES = os.environ.get('PROJECT_SOURCES', 'trending:8,top-stars:7')
+FILL_SOURCES = os.environ.get('FILL_SOURCES', 'top-stars')
+
+CURATED_FILE = os.path.join('data', 'curated.jsonl')
+# snapshot 来源向前查找结构化记录的天数
+SNAPSHOT_LOOKBACK_DAYS = 30
+
+def log(message, level="INFO"):
+    """日志输出"""
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    level_emoji = {
+        "INFO": "ℹ️",
+        "SUCCESS": "✅",
+        "WARNING": "⚠️",
+        "ERROR": "❌",
+        "DEBUG": "🔍"
+    }
+    emoji = level_emoji.get(level, "📝")
+    print(f"[{timestamp}] {emoji} [{level}] {message}")
+
+SOURCES = {}
+
+def register(cls):
+    """注册来源插件（类装饰器），名称即 cls.name"""
+    SOURCES[cls.name] = cls
+    return cls
+
+class Source:
+    """
+    来源插件：iter_projects(date_str) 是惰性生成器，产出项目字典（至少包含 name / url / source）
+    需要外部依赖的来源在构造参数中声明（由 select_projects 的 options 传入）
+    """
+
+    name = None
+
+    def __init__(self, repo_dir=None):
+        self.repo_dir = repo_dir or REPO_DIR
+
+    def iter_projects(self, date_str):
+        raise NotImplementedError
+
+@register
+class TrendingSource(Source):
+    """
+    GitHub Trending：配置的全部视图（周期 × 语言）作为一批并发抓取，抓取延迟只有一个往返
+    fetch_views(languages, periods) 返回 {(language, since): 项目列表}，
+    merge(views, merged) 合并去重（标记 views）后按周期顺序返回项目；取舍仍由下游的生成器阶段完成
+    """
+
+    name = 'trending'
+
+    def __init__(self, repo_dir=None, fetch_views=None, merge=None, periods=('daily',), languages=(None,)):
+        super().__init__(repo_dir)
+        if fetch_views is None or merge is None:
+            raise ValueError("trending 来源需要注入 fetch_views 和 merge")
+        self.fetch_views = fetch_views
+        self.merge = merge
+        self.periods = list(periods)
+        self.languages = list(languages)
+
+    def iter_projects(self, date_str):
+        yield from self.merge(self.fetch_views(self.languages, self.periods), {})
+
+@register
+class TopStarsSource(Source):
+    """Top Stars 候选池（按 ranking_key 排序）；load_pool 返回 ranking.CandidatePool，默认读取 data/candidates.jsonl"""
+
+    name = 'top-stars'
+
+    def __init__(self, repo_dir=None, load_pool=None, ranking_key='stars'):
+        super().__init__(repo_dir)
+        self.load_pool = load_pool or (lambda: ranking.CandidatePool.load(self.repo_dir))
+        self.ranking_key = ranking_key
+
+    def iter_projects(self, date_str):
+        for candidate in self.load_pool().iter_top(self.ranking_key):
+            yield ranking.to_project(candidate)
+
+@register
+class CuratedSource(Source):
+    """手工维护的推荐列表 data/curated.jsonl（每行一个仓库，字段与项目字典相同，至少包含 name）"""
+
+    name = 'curated'
+
+    def iter_projects(self, date_str):
+        path = os.path.join(self.repo_dir, CURATED_FILE)
+        if not os.path.exists(path):
+            log(f"推荐列表不存在，跳过: {path}", "WARNING")
+            return
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                project = json.loads(line)
+                if project.get('name'):
+                    project.setdefault('url', f"https://github.com/{project['name']}")
+                for key in ('stars', 'forks'):
+                    if isinstance(project.get(key), int):
+                        project[key] = f"{project[key]:,}"
+                project['source'] = 'curated'
+                yield project
+
+@register
+class SnapshotSource(Source):
+    """date_str 之前最近一天的结构化记录（保留原来的 source 字段）"""
+
+    name = 'snapshot'
+
+    def iter_projects(self, date_str):
+        date = datetime.strptime(date_str, '%Y-%m-%d')
+        for offset in range(1, SNAPSHOT_LOOKBACK_DAYS + 1):
+            path = project_store.day_path((date - timedelta(days=offset)).strftime('%Y-%m-%d'), self.repo_dir)
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        if line.strip():
+                            yield json.loads(line)
+                return
+
+def parse_plan(text):
+    """'trending:8,top-stars:7' -> [('trending', 8), ('top-stars', 7)]（不写配额时为 DAILY_LIMIT）"""
+    plan = []
+    for item in text.split(','):
+        name, _, quota = item.strip().partition(':')
+        if not name:
+            continue
+        if name not in SOURCES:
+            raise ValueError(f"未知的项目来源: {name}（可用: {', '.join(SOURCES)}）")
+        plan.append((name, int(quota) if quota else DAILY_LIMIT))
+    return plan
+
+# 生成器阶段
+
+def validate(projects):
+    """跳过缺少 name / url 的项目"""
+    for project in projects:
+        metrics.incr('candidates_pulled')
+        if not project.get('name') or not project.get('url'):
+            log(f"跳过无效项目: {project}", "WARNING")
+            continue
+        yield project
+
+def prefer_unseen(projects, seen, date_str):
+    """冷却期外的项目立即产出；冷却期内的先暂存，上游耗尽后按最久没出现的顺序产出"""
+    cooling = []
+    for project in projects:
+        if seen is not None and seen.is_cooling(project['name'], date_str):
+            cooling.append(project)
+        else:
+            yield project
+    if cooling:
+        log(f"候选不足，使用 {len(cooling)} 个冷却期（{seen.cooldown} 天）内出现过的项目补足", "DEBUG")
+    cooling.sort(key=lambda project: seen.last_seen(project['name'], date_str))
+    yield from cooling
+
+def dedup(projects, names):
+    """跳过已经入选的仓库（names 在所有来源之间共享，由 take 登记）"""
+    for project in projects:
+        if project['name'] not in names:
+            yield project
+
+def take(projects, limit, names):
+    """最多产出 limit 个项目并登记到 names；取满后立即停止，不再从上游拉取"""
+    if limit <= 0:
+        return
+    for count, project in enumerate(projects, 1):
+        names.add(project['name'])
+        yield project
+        if count >= limit:
+            return
+
+def select_projects(date_str=None, plan=None, fill=None, limit=DAILY_LIMIT, repo_dir=None, seen=None, exclude=(),
+                    options=None):
+    """
+    按来源计划选出当天的项目（exclude 中的仓库不会入选）
+    options 为 {来源名: 构造参数}，用于注入抓取函数和配置
+    每个来源的阶段链只建立一次：补足时接着同一个迭代器继续取，已抓取的页面不会重新抓取或解析
+    """
+    date_str = date_str or datetime.now().strftime('%Y-%m-%d')
+    plan = parse_plan(PROJECT_SOURCES) if plan is None else plan
+    fill = [name for name, _ in parse_plan(FILL_SOURCES)] if fill is None else fill
+    options = options or {}
+    names, selected, chains = set(exclude), [], {}
+
+    def chain(name):
+        if name not in chains:
+            source = SOURCES[name](repo_dir, **options.get(name, {}))
+            chains[name] = dedup(prefer_unseen(validate(source.iter_projects(date_str)), seen, date_str), names)
+        return chains[name]
+
+    for name, quota in plan:
+        projects = list(take(chain(name), min(quota, limit - len(selected)), names))
+        log(f"来源 {name}: 选出 {len(projects)}/{quota} 个项目", "SUCCESS" if len(projects) >= quota else "WARNING")
+        selected.extend(projects)
+    for name in fill:
+        if len(selected) >= limit:
+            break
+        projects = list(take(chain(name), limit - len(selected), names))
+        if projects:
+            log(f"只选出 {len(selected)} 个项目，从 {name} 补充 {len(projects)} 个", "WARNING")
+        selected.extend(projects)
+    return selected
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+静态 JSON API
+与 Markdown 归档一起发布到 api/，使用者只需下载需要的分片，不必再解析 Markdown：
+- api/days/YYYY-MM-DD.json: 某一天的项目（计数为整数）
+- api/months/YYYY-MM.json: 某个月每天的项目
+- api/languages/<slug>.json: 某种语言按月的项目数和最近出现的项目
+- api/manifest.json: 日期范围、各月和各语言的汇总及分片路径
+与检索索引一样按 (文件路径, mtime, size) 增量更新，只重写受影响的分片（变化的日期、所在月份、涉及的语言）；
+data/api_state.json 只保存文件状态和各语言按月的计数，变化前的记录从旧的日分片读取，
+语言分片的最近项目最多回溯 RECENT_MONTHS 个月分片，日常更新的耗时不随归档增长
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+
+import aggregate_cache
+import output_writer
+import timeseries
+
+REPO_DIR = "/home/ubuntu/awesome-github-stars"
+API_SUBDIR = 'api'
+STATE_FILE = os.path.join('data', 'api_state.json')
+API_VERSION = 1
+
+# 语言分片中保留的最近项目数，以及最多回溯的月份数
+RECENT_LIMIT = 50
+RECENT_MONTHS = 12
+
+# 分片中输出的项目字段
+SHARD_FIELDS = ('name', 'url', 'description', 'stars', 'forks', 'language', 'today_stars', 'source', 'views',
+                'topics', 'license')
+COUNT_FIELDS = ('stars', 'forks', 'today_stars')
+
+def api_dir(repo_dir=None):
+    """api/ 目录"""
+    return os.path.join(repo_dir or REPO_DIR, API_SUBDIR)
+
+def language_slug(language):
+    """语言名 -> 文件名: 'C++' -> 'cpp'，'C#' -> 'csharp'，'Jupyter Notebook' -> 'jupyter-notebook'"""
+    slug = (language or 'Unknown').lower().replace('++', 'pp').replace('#', 'sharp')
+    return re.sub(r'[^a-z0-9]+', '-', slug).strip('-') or 'unknown'
+
+def to_record(project, rank):
+    """项目字典 -> 分片记录（计数解析为整数，无法解析时为 null）"""
+    record = {'rank': rank}
+    for key in SHARD_FIELDS:
+        value = project.get(key)
+        if key in COUNT_FIELDS and value is not None:
+            count = timeseries.parse_count(value)
+            value = count if count != timeseries.MISSING else None
+        if value not in (None, '', []):
+            record[key] = value
+    record.setdefault('language', 'Unknown')
+    return record
+
+def _dump(data):
+    return json.dumps(data, ensure_ascii=False, indent=1) + "\n"
+
+def _date_of(rel_path):
+    return os.path.basename(rel_path)[:-len('.md')]
+
+class StaticApi:
+    """
+    状态: files 为 {相对路径: [mtime_ns, size, 项目数]}，languages 为 {语言: {YYYY-MM: 项目数}}
+    """
+
+    def __init__(self, repo_dir=None):
+        self.repo_dir = repo_dir or REPO_DIR
+        self.state_path = os.path.join(self.repo_dir, STATE_FILE)
+        self.files = {}
+        self.languages = {}
+
+    @classmethod
+    def load(cls, repo_dir=None):
+        """读取状态，不存在或版本不符时返回空状态（所有分片都会重新生成）"""
+        api = cls(repo_dir)
+        try:
+            with open(api.state_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return api
+        if data.get('version') == API_VERSION:
+            api.files = data['files']
+            api.languages = data['languages']
+        return api
+
+    def save_state(self):
+        """原子保存状态（可随时重建，不纳入版本控制，不计入输出统计）"""
+        data = {'version': API_VERSION, 'files': self.files, 'languages': self.languages}
+        output_writer.write_if_changed(self.state_path, json.dumps(data, ensure_ascii=False, separators=(',', ':')),
+                                       track=False)
+
+    def _path(self, *parts):
+        return os.path.join(api_dir(self.repo_dir), *parts)
+
+    def _write(self, path, data):
+        return int(output_writer.write_if_changed(path, _dump(data)))
+
+    def _remove(self, path):
+        if os.path.exists(path):
+            os.remove(path)
+
+    def read_day(self, date_str):
+        """读取已发布的日分片中的记录，不存在时返回空列表"""
+        try:
+            with open(self._path('days', f"{date_str}.json"), 'r', encoding='utf-8') as f:
+                return json.load(f)['projects']
+        except (OSError, ValueError, KeyError):
+            return []
+
+    def _count(self, records, date_str, sign):
+        """把一天的记录计入（或扣除出）各语言的按月计数，返回涉及的语言"""
+        month = date_str[:7]
+        touched = set()
+        for record in records:
+            language = record['language']
+            months = self.languages.setdefault(language, {})
+            months[month] = months.get(month, 0) + sign
+            if months[month] <= 0:
+                del months[month]
+            if not months:
+                del self.languages[language]
+            touched.add(language)
+        return touched
+
+    def update(self, loader, preloaded=None, rebuild=False):
+        """
+        增量更新：loader / preloaded 与 aggregate_cache.update_cache 相同
+        返回 stats（新增 / 变化 / 删除的日期数和写入的分片数）
+        """
+        if rebuild:
+            self.files, self.languages = {}, {}
+        current = aggregate_cache.scan_daily_files(self.repo_dir)
+        stats = {'added': 0, 'changed': 0, 'removed': 0, 'shards': 0}
+        months, languages = set(), set()
+
+        for rel_path in [path for path in self.files if path not in current]:
+            date_str = _date_of(rel_path)
+            languages |= self._count(self.read_day(date_str), date_str, -1)
+            self._remove(self._path('days', f"{date_str}.json"))
+            del self.files[rel_path]
+            months.add(date_str[:7])
+            stats['removed'] += 1
+
+        for rel_path in sorted(current):
+            mtime_ns, size = current[rel_path]
+            old = self.files.get(rel_path)
+            if old and old[0] == mtime_ns and old[1] == size:
+                continue
+            date_str = _date_of(rel_path)
+            if old:
+                languages |= self._count(self.read_day(date_str), date_str, -1)
+                stats['changed'] += 1
+            else:
+                stats['added'] += 1
+            if preloaded and rel_path in preloaded:
+                projects = preloaded[rel_path]
+            else:
+                projects = loader(os.path.join(self.repo_dir, rel_path))
+            records = [to_record(project, rank) for rank, project in enumerate(projects, 1) if project.get('name')]
+            stats['shards'] += self._write(self._path('days', f"{date_str}.json"),
+                                           {'date': date_str, 'count': len(records), 'projects': records})
+            languages |= self._count(records, date_str, 1)
+            self.files[rel_path] = [mtime_ns, size, len(records)]
+            months.add(date_str[:7])
+
+        if months or rebuild:
+            stats['shards'] += self.write_shards(months, languages)
+            if rebuild:
+                self.sweep()
+            self.save_state()
+        return stats
+
+    def sweep(self):
+        """删除状态中已不存在的日期、月份和语言留下的分片（重建时调用）"""
+        month_dates = self.month_dates()
+        keep = {
+            'days': {f"{_date_of(rel_path)}.json" for rel_path in self.files},
+            'months': {f"{month}.json" for month in month_dates},
+            'languages': {f"{language_slug(language)}.json" for language in self.languages}
+        }
+        for subdir, names in keep.items():
+            directory = self._path(subdir)
+            if not os.path.isdir(directory):
+                continue
+            for name in os.listdir(directory):
+                if name.endswith('.json') and name not in names:
+                    os.remove(os.path.join(directory, name))
+
+    def month_dates(self):
+        """{YYYY-MM: [日期（升序）]}"""
+        dates = {}
+        for rel_path in sorted(self.files, key=_date_of):
+            date_str = _date_of(rel_path)
+            dates.setdefault(date_str[:7], []).append(date_str)
+        return dates
+
+    def write_shards(self, months, languages):
+        """重写受影响的月、语言分片和 manifest，返回写入的文件数"""
+        written = 0
+        month_dates = self.month_dates()
+        month_days = {}
+        for month in sorted(months):
+            path = self._path('months', f"{month}.json")
+            if month not in month_dates:
+                self._remove(path)
+                continue
+            days = [{'date': date_str, 'projects': self.read_day(date_str)} for date_str in month_dates[month]]
+            month_days[month] = days
+            written += self._write(path, {'month': month, 'days': days})
+
+        recent_months = sorted(month_dates, reverse=True)[:RECENT_MONTHS]
+        for language in sorted(languages):
+            path = self._path('languages', f"{language_slug(language)}.json")
+            if language not in self.languages:
+                self._remove(path)
+                continue
+            written += self._write(path, self.language_shard(language, recent_months, month_days))
+
+        written += self._write(self._path('manifest.json'), self.manifest(month_dates))
+        return written
+
+    def language_shard(self, language, recent_months, month_days):
+        """
+        某种语言的分片：总数、按月计数和最近出现的项目
+        最近项目从最新的月份向前查找，最多读取 RECENT_MONTHS 个月分片（month_days 缓存已读取的月份）
+        """
+        recent = []
+        for month in recent_months:
+            if len(recent) >= RECENT_LIMIT:
+                break
+            if month not in self.languages[language]:
+                continue
+            days = month_days.get(month)
+            if days is None:
+                try:
+                    with open(self._path('months', f"{month}.json"), 'r', encoding='utf-8') as f:
+                        days = json.load(f)['days']
+                except (OSError, ValueError, KeyError):
+                    days = []
+                month_days[month] = days
+            for day in reversed(days):
+                recent.extend(dict(record, date=day['date']) for record in day['projects']
+                              if record['language'] == language)
+        counts = dict(sorted(self.languages[language].items()))
+        return {'language': language, 'slug': language_slug(language), 'total': sum(counts.values()),
+                'months': counts, 'recent': recent[:RECENT_LIMIT]}
+
+    def manifest(self, month_dates):
+        """顶层 manifest: 日期范围、各月汇总和各语言分片（不含生成时间，内容不变时不重写）"""
+        projects_by_date = {_date_of(rel_path): state[2] for rel_path, state in self.files.items()}
+        months = {month: {'days': len(dates), 'projects': sum(projects_by_date[date_str] for date_str in dates),
+                          'path': f"months/{month}.json"}
+                  for month, dates in sorted(month_dates.items())}
+        all_dates = sorted(projects_by_date)
+        totals = {language: sum(counts.values()) for language, counts in self.languages.items()}
+        return {
+            'version': API_VERSION,
+            'first_date': all_dates[0] if all_dates else None,
+            'last_date': all_dates[-1] if all_dates else None,
+            'days': len(all_dates),
+            'projects': sum(projects_by_date.values()),
+            'day_path': 'days/{date}.json',
+            'months': months,
+            'languages': {language: {'count': count, 'path': f"languages/{language_slug(language)}.json"}
+                          for language, count in sorted(totals.items(), key=lambda item: (-item[1], item[0]))}
+        }
+
+def refresh(loader, repo_dir=None, preloaded=None, rebuild=False):
+    """加载状态、增量更新分片，返回 (api, stats)"""
+    api = StaticApi.load(repo_dir)
+    stats = api.update(loader, preloaded=preloaded, rebuild=rebuild)
+    return api, stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='生成静态 JSON API（api/）')
+    parser.add_argument('--rebuild', action='store_true', help='从每日文件重新生成所有分片')
+    args = parser.parse_args(argv)
+
+    import update_index
+    api = update_index.refresh_static_api(rebuild=args.rebuild)
+    print(f"静态 API: {len(api.files)} 天 → {api_dir()}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+"""
+测试公共设施：把仓库根目录加入 sys.path，并提供在本地端口上启动 http.server 替身的 serve 夹具
+"""
+
+import os
+import sys
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, 'tests', 'fixtures')
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import output_writer
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+@pytest.fixture
+def serve():
+    """serve(handler_class) 启动本地 HTTP 服务，返回 http://127.0.0.1:<port>；测试结束时关闭"""
+    servers = []
+
+    def start(handler_class):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), handler_class)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+@pytest.fixture(autouse=True)
+def clean_output_stats():
+    """每个测试使用独立的输出统计和写入清单"""
+    output_writer.reset_stats()
+    yield
+    output_writer.reset_stats()
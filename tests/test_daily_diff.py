@@ -0,0 +1,43 @@
+"""
+daily_diff: 滚动窗口记录每天结构化记录的 [mtime_ns, size]，记录被重写或删除后重新读取 / 移出窗口
+"""
+
+import os
+
+import daily_diff
+import project_store
+
+def projects(*names):
+    return [{'name': name, 'source': 'trending', 'stars': '100'} for name in names]
+
+def test_rewritten_day_is_reloaded(tmp_path):
+    repo_dir = str(tmp_path)
+    project_store.write_day(projects('a/a', 'b/b'), '2026-02-03', repo_dir)
+    diff = daily_diff.diff_day(projects('a/a'), '2026-02-04', repo_dir)
+    assert [item['name'] for item in diff['dropped']] == ['b/b']
+
+    # 回填重写了前一天，窗口不能继续使用旧记录
+    project_store.write_day(projects('a/a', 'c/c', 'd/d'), '2026-02-03', repo_dir)
+    diff = daily_diff.diff_day(projects('a/a'), '2026-02-04', repo_dir)
+    assert [item['name'] for item in diff['dropped']] == ['c/c', 'd/d']
+    window = daily_diff.DiffWindow(repo_dir)
+    assert window.states['2026-02-03'] == daily_diff.day_state('2026-02-03', repo_dir)
+
+def test_recorded_day_is_read_back_from_store(tmp_path):
+    repo_dir = str(tmp_path)
+    daily_diff.diff_day(projects('a/a'), '2026-02-03', repo_dir)
+    assert daily_diff.DiffWindow(repo_dir).states['2026-02-03'] is None
+    # 当天的记录文件在对比之后写入，内容以文件为准
+    project_store.write_day(projects('a/a', 'b/b'), '2026-02-03', repo_dir)
+
+    diff = daily_diff.diff_day(projects('b/b'), '2026-02-04', repo_dir)
+    assert (diff['new'], [item['name'] for item in diff['dropped']]) == ([], ['a/a'])
+
+def test_deleted_day_leaves_window(tmp_path):
+    repo_dir = str(tmp_path)
+    project_store.write_day(projects('a/a'), '2026-02-03', repo_dir)
+    daily_diff.diff_day(projects('a/a'), '2026-02-04', repo_dir)
+    os.remove(project_store.day_path('2026-02-03', repo_dir))
+
+    diff = daily_diff.diff_day(projects('a/a'), '2026-02-04', repo_dir)
+    assert diff['previous_date'] is None and [item['name'] for item in diff['new']] == ['a/a']
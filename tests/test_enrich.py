@@ -0,0 +1,109 @@
+"""
+enrich: 本地 http.server 模拟 GitHub GraphQL（/graphql），检查分批、NOT_FOUND、缓存和淘汰顺序
+"""
+
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+import enrich
+import fetcher
+
+ALIAS_RE = re.compile(r'(r\d+): repository\(owner: ("[^"]*"), name: ("[^"]*")\)')
+
+class GraphQLHandler(BaseHTTPRequestHandler):
+    """每个别名返回一个仓库节点；owner 为 ghost 的仓库按 GitHub 的方式返回 null 和 NOT_FOUND 错误"""
+
+    posts = []
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        repositories = [(alias, json.loads(owner), json.loads(name))
+                        for alias, owner, name in ALIAS_RE.findall(body['query'])]
+        with self.lock:
+            self.posts.append({'path': self.path, 'authorization': self.headers.get('Authorization'),
+                               'names': [f"{owner}/{name}" for _, owner, name in repositories]})
+        data, errors = {}, []
+        for index, (alias, owner, name) in enumerate(repositories):
+            if owner == 'ghost':
+                data[alias] = None
+                errors.append({'type': 'NOT_FOUND', 'path': [alias],
+                               'message': f"Could not resolve to a Repository with the name '{owner}/{name}'."})
+                continue
+            data[alias] = {'nameWithOwner': f"{owner}/{name}", 'stargazerCount': 1000 + index, 'forkCount': 10,
+                           'primaryLanguage': {'name': 'Rust'}, 'licenseInfo': {'spdxId': 'MIT', 'name': 'MIT License'},
+                           'repositoryTopics': {'nodes': [{'topic': {'name': 'cli'}}]}}
+        payload = json.dumps({'data': data, 'errors': errors} if errors else {'data': data}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def api_url(serve, monkeypatch):
+    GraphQLHandler.posts = []
+    url = serve(GraphQLHandler)
+    monkeypatch.setenv('GITHUB_API_URL', url)
+    monkeypatch.setattr(fetcher, 'GITHUB_API_URL', url)
+    return url
+
+def projects(names):
+    return [{'name': name, 'url': f"https://github.com/{name}", 'stars': '1', 'language': 'N/A'} for name in names]
+
+def test_one_post_per_batch(api_url, tmp_path):
+    names = [f"owner/repo{index}" for index in range(7)]
+    result = enrich.enrich_projects(projects(names), repo_dir=str(tmp_path), token='test-token', batch_size=3)
+
+    assert [post['names'] for post in GraphQLHandler.posts] == [names[0:3], names[3:6], names[6:7]]
+    assert {post['path'] for post in GraphQLHandler.posts} == {'/graphql'}
+    assert {post['authorization'] for post in GraphQLHandler.posts} == {'Bearer test-token'}
+    assert [project['name'] for project in result] == names
+    assert result[0]['stars'] == '1,000' and result[0]['language'] == 'Rust' and result[0]['license'] == 'MIT'
+
+def test_not_found_alias_maps_to_none(api_url, tmp_path):
+    names = ['owner/real', 'ghost/missing', 'owner/other']
+    session = fetcher.create_session()
+    try:
+        results = enrich.fetch_batch(session, names)
+    finally:
+        session.close()
+
+    assert results['ghost/missing'] is None
+    assert results['owner/real']['stars'] == 1000 and results['owner/other']['stars'] == 1002
+
+    # 不存在的仓库保留原始数据，并作为 None 缓存（TTL 内不再查询）
+    original = projects(['ghost/missing'])
+    assert enrich.enrich_projects(original, repo_dir=str(tmp_path), token='test-token') == original
+    cache = enrich.MetadataCache.load(str(tmp_path))
+    assert cache.get('ghost/missing') == (True, None)
+
+def test_cache_hits_skip_network(api_url, tmp_path):
+    names = ['owner/a', 'owner/b']
+    first = enrich.enrich_projects(projects(names), repo_dir=str(tmp_path), token='test-token')
+    assert len(GraphQLHandler.posts) == 1
+
+    cache = enrich.MetadataCache.load(str(tmp_path))
+    second = enrich.enrich_projects(projects(names), repo_dir=str(tmp_path), token='test-token', cache=cache)
+    assert len(GraphQLHandler.posts) == 1
+    assert cache.stats == {'hits': 2, 'misses': 0, 'evicted': 0}
+    assert second == first
+
+def test_evict_removes_least_recently_accessed(tmp_path):
+    cache = enrich.MetadataCache(str(tmp_path), ttl=3600, max_entries=2)
+    for now, name in enumerate(('owner/a', 'owner/b', 'owner/c'), 1):
+        cache.put(name, {'stars': now}, now=now)
+    # a 最早写入但最近被访问过，应淘汰 b
+    assert cache.get('owner/a', now=10) == (True, {'stars': 1})
+
+    assert cache.evict() == 1
+    assert sorted(cache.entries) == ['owner/a', 'owner/c']
+    assert cache.stats['evicted'] == 1
+    assert cache.evict() == 0
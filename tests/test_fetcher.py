@@ -0,0 +1,90 @@
+"""
+fetcher / http_cache: 本地 http.server 替身提供保存好的 Trending 页面（tests/fixtures/trending.html）
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+import fetcher
+import http_cache
+import trending_parser
+from conftest import read_fixture
+
+TRENDING_HTML = read_fixture('trending.html')
+ETAG = '"trending-v1"'
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """/trending* 返回样本页面（带 ETag，支持 If-None-Match），其它路径 404"""
+
+    requests = []
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with self.lock:
+            self.requests.append((self.path, self.headers.get('If-None-Match')))
+        if not self.path.startswith('/trending'):
+            self.send_error(404)
+            return
+        if self.headers.get('If-None-Match') == ETAG:
+            self.send_response(304)
+            self.send_header('ETag', ETAG)
+            self.end_headers()
+            return
+        body = TRENDING_HTML.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', ETAG)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def base_url(serve):
+    FixtureHandler.requests = []
+    return serve(FixtureHandler)
+
+def test_trending_url_uses_base_url(base_url):
+    assert fetcher.trending_url('C++', 'weekly', base_url) == f"{base_url}/trending/c%2B%2B?since=weekly"
+
+def test_fetch_pages_isolates_failures(base_url):
+    urls = [fetcher.trending_url(None, 'daily', base_url), fetcher.trending_url('rust', 'weekly', base_url),
+            f"{base_url}/missing", fetcher.trending_url('go', 'monthly', base_url)]
+    results = fetcher.fetch_pages(urls, max_workers=4, parse=trending_parser.parse_trending_fast)
+
+    assert set(results) == set(urls)
+    assert isinstance(results[f"{base_url}/missing"], Exception)
+    expected = trending_parser.parse_trending_fast(TRENDING_HTML)
+    for url in urls:
+        if url != f"{base_url}/missing":
+            assert results[url] == expected
+    # 404 不可重试：失败的页面只请求一次
+    assert sum(1 for path, _ in FixtureHandler.requests if path == '/missing') == 1
+
+def test_conditional_request_reuses_parsed_result(base_url, tmp_path):
+    url = fetcher.trending_url(None, 'daily', base_url)
+    # ttl=0: 每次都已过期，第二次必须发条件请求
+    cache = http_cache.ResponseCache(str(tmp_path / 'http'), ttl=0)
+    calls = []
+
+    def parse(html):
+        calls.append(len(html))
+        return trending_parser.parse_trending_fast(html)
+
+    session = fetcher.create_session()
+    try:
+        first = fetcher.fetch_parsed(session, url, parse, cache)
+        second = fetcher.fetch_parsed(session, url, parse, cache)
+    finally:
+        session.close()
+
+    assert second == first
+    assert len(calls) == 1
+    assert FixtureHandler.requests == [('/trending', None), ('/trending', ETAG)]
+    assert cache.stats['misses'] == 1
+    assert cache.stats['revalidated'] == 1
+    assert cache.stats['bytes_saved'] == len(TRENDING_HTML.encode('utf-8'))
@@ -0,0 +1,69 @@
+"""
+git_commit: 只提交变更路径清单中的文件，推送到本地裸仓库
+"""
+
+import os
+import subprocess
+
+import pytest
+
+import git_commit
+import output_writer
+
+def run_git(args, cwd):
+    return subprocess.run(['git', *args], cwd=cwd, capture_output=True, text=True, check=True).stdout
+
+@pytest.fixture
+def repo(tmp_path):
+    """带初始提交的工作仓库，origin 指向本地裸仓库"""
+    remote = tmp_path / 'remote.git'
+    work = tmp_path / 'work'
+    run_git(['init', '-q', '--bare', str(remote)], tmp_path)
+    run_git(['init', '-q', str(work)], tmp_path)
+    for key, value in (('user.name', 'test'), ('user.email', 'test@example.com'), ('commit.gpgsign', 'false')):
+        run_git(['config', key, value], work)
+    (work / 'README.md').write_text("# archive\n", encoding='utf-8')
+    run_git(['add', 'README.md'], work)
+    run_git(['commit', '-q', '-m', 'init'], work)
+    run_git(['remote', 'add', 'origin', str(remote)], work)
+    run_git(['push', '-q', 'origin', 'HEAD:main'], work)
+    return str(work), str(remote)
+
+def write(repo_dir, rel_path, text):
+    path = os.path.join(repo_dir, rel_path)
+    output_writer.write_if_changed(path, text)
+    return path
+
+def test_commits_only_manifest_paths(repo):
+    work, remote = repo
+    write(work, '2026/02-February/2026-02-06.md', "# 2026-02-06\n")
+    write(work, 'README.md', "# archive\n\nupdated\n")
+    assert git_commit.write_changed_paths(work) == ['2026/02-February/2026-02-06.md', 'README.md']
+    # 不在清单中的文件（手工改动、临时文件）不能被提交
+    with open(os.path.join(work, 'notes.txt'), 'w', encoding='utf-8') as f:
+        f.write("scratch\n")
+
+    assert git_commit.commit_changes(work, date_str='2026-02-06') == 'committed'
+
+    committed = run_git(['show', '--name-only', '--format=', 'HEAD'], work).split()
+    assert committed == ['2026/02-February/2026-02-06.md', 'README.md']
+    assert run_git(['status', '--porcelain'], work).split() == ['??', 'notes.txt']
+    assert run_git(['rev-parse', 'main'], remote) == run_git(['rev-parse', 'HEAD'], work)
+    assert not os.path.exists(git_commit.changed_paths_file(work))
+
+def test_empty_manifest_skips_commit(repo):
+    work, remote = repo
+    head = run_git(['rev-parse', 'HEAD'], work)
+    # 内容未变化的写入不进入清单
+    write(work, 'README.md', "# archive\n")
+    assert git_commit.write_changed_paths(work) == []
+
+    assert git_commit.commit_changes(work) == 'skipped'
+    assert run_git(['rev-parse', 'HEAD'], work) == head
+    assert run_git(['rev-parse', 'main'], remote) == head
+    assert not os.path.exists(git_commit.changed_paths_file(work))
+
+def test_missing_manifest_refuses_to_commit(repo):
+    work, _ = repo
+    with pytest.raises(FileNotFoundError):
+        git_commit.commit_changes(work)
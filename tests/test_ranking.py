@@ -0,0 +1,57 @@
+"""
+ranking: 候选池从本地搜索 API 替身刷新，growth 为两次刷新之间的增量，过期判断驱动每日流水线的刷新
+"""
+
+import json
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+import fetcher
+import ranking
+
+class SearchHandler(BaseHTTPRequestHandler):
+    """/search/repositories 每页返回两个仓库，stars 为 SearchHandler.stars + 序号"""
+
+    stars = 1000
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        page = int(parse_qs(url.query)['page'][0])
+        items = [{'full_name': f"owner/repo{page}{index}", 'html_url': f"https://github.com/owner/repo{page}{index}",
+                  'stargazers_count': self.stars + index, 'forks_count': 1, 'language': 'Go', 'topics': []}
+                 for index in range(2)]
+        body = json.dumps({'items': items}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def api_url(serve, monkeypatch):
+    SearchHandler.stars = 1000
+    url = serve(SearchHandler)
+    monkeypatch.setattr(fetcher, 'GITHUB_API_URL', url)
+    return url
+
+def test_refresh_tracks_growth_between_snapshots(api_url, tmp_path):
+    pool = ranking.CandidatePool.load(str(tmp_path), fallback=[{'name': 'seed/repo', 'stars': '5'}])
+    assert pool.is_stale('2026-02-01')
+
+    added, failed = ranking.refresh(pool, pages=2, bands=((1000, None),), date_str='2026-02-01', token='t')
+    assert (added, failed) == (4, 0)
+    assert pool.updated() == '2026-02-01'
+    assert not pool.is_stale('2026-02-07', days=7) and pool.is_stale('2026-02-08', days=7)
+    pool.save(str(tmp_path))
+
+    SearchHandler.stars = 1500
+    pool = ranking.CandidatePool.load(str(tmp_path))
+    assert len(pool) == 5
+    ranking.refresh(pool, pages=2, bands=((1000, None),), date_str='2026-02-08', token='t')
+    assert {candidate['name']: candidate['growth'] for candidate in pool.top(5, by='growth')} == {
+        'owner/repo10': 500, 'owner/repo11': 500, 'owner/repo20': 500, 'owner/repo21': 500, 'seed/repo': 0}
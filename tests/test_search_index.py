@@ -0,0 +1,77 @@
+"""
+search_index: 日常更新只追加段，结果与全量重建一致
+"""
+
+import os
+
+import pytest
+
+import search_index
+
+LANGUAGES = ('Rust', 'Go', 'Python')
+
+def write_day(repo_dir, date_str, names):
+    """写一个每日文件（内容只用于改变 mtime / size，项目由 loader 按文件内容生成）"""
+    path = os.path.join(repo_dir, date_str[:4], f"{date_str[5:7]}-Month", f"{date_str}.md")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(names) + "\n")
+    return path
+
+def loader(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        names = f.read().split()
+    return [{'name': name, 'language': LANGUAGES[index % len(LANGUAGES)], 'source': 'trending',
+             'description': f"{name.split('/')[1]} vector database"} for index, name in enumerate(names)]
+
+def snapshot(index):
+    """按日期排序的现存文档（编号与分段方式无关）"""
+    return [sorted(tuple(index.doc(doc_id).values()) for doc_id in doc_ids)
+            for doc_ids in (index.search(), index.search('vector', language='rust'))]
+
+@pytest.fixture
+def repo(tmp_path):
+    repo_dir = str(tmp_path)
+    for day in range(1, 21):
+        write_day(repo_dir, f"2026-01-{day:02d}", [f"owner{day}/repo{n}" for n in range(5)])
+    search_index.refresh(loader, repo_dir)
+    return repo_dir
+
+def test_daily_update_appends_segment(repo):
+    base = os.path.join(repo, search_index.INDEX_FILE)
+    base_mtime = os.stat(base).st_mtime_ns
+
+    write_day(repo, '2026-01-21', ['owner21/repo0', 'owner21/repo1'])
+    stats = search_index.refresh(loader, repo)
+
+    assert (stats['added'], stats['reused'], stats['docs'], stats['compacted']) == (1, 20, 102, False)
+    assert os.stat(base).st_mtime_ns == base_mtime
+    with open(os.path.join(repo, search_index.LOG_FILE), 'r', encoding='utf-8') as f:
+        assert len(f.readlines()) == 1
+    index = search_index.SearchIndex.load(repo)
+    assert sorted(index.doc(doc_id)['name'] for doc_id in index.search(date_from='2026-01-21')) \
+        == ['owner21/repo0', 'owner21/repo1']
+
+def test_segments_match_rebuild(repo):
+    write_day(repo, '2026-01-21', ['owner21/repo0'])
+    search_index.refresh(loader, repo)
+    write_day(repo, '2026-01-03', ['changed/repo'])
+    os.remove(os.path.join(repo, '2026', '01-Month', '2026-01-05.md'))
+    stats = search_index.refresh(loader, repo)
+    assert (stats['changed'], stats['removed']) == (1, 1)
+
+    incremental = search_index.SearchIndex.load(repo)
+    assert len(incremental) == stats['docs'] == 92
+    search_index.refresh(loader, repo, rebuild=True)
+    assert snapshot(incremental) == snapshot(search_index.SearchIndex.load(repo))
+
+def test_compaction_folds_segments(repo):
+    for day in range(21, 31):
+        write_day(repo, f"2026-01-{day:02d}", [f"owner{day}/repo{n}" for n in range(5)])
+        stats = search_index.refresh(loader, repo)
+        if stats['compacted']:
+            break
+    assert stats['compacted']
+    assert not os.path.exists(os.path.join(repo, search_index.LOG_FILE))
+    assert search_index.read_state(repo)['log_docs'] == 0
+    assert len(search_index.SearchIndex.load(repo)) == stats['docs']
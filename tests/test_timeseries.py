@@ -0,0 +1,52 @@
+"""
+timeseries: 同一天重跑时替换该天的行，日期索引持久化，查询只访问窗口内的行
+"""
+
+import os
+
+import timeseries
+
+def project(name, stars, today=None):
+    return {'name': name, 'stars': f"{stars:,}", 'forks': '1', 'today_stars': today and f"{today} stars today"}
+
+def names_on(store, date_str):
+    day = timeseries.to_day(date_str)
+    return sorted(store.repos[store.columns['repo'][index]] for index in store._window_rows(day, day))
+
+def test_rerun_replaces_the_day(tmp_path):
+    store = timeseries.TimeSeriesStore(str(tmp_path))
+    store.append('2026-01-31', [project('a/a', 90), project('b/b', 10)])
+    store.append('2026-02-01', [project('a/a', 100), project('b/b', 50)])
+    rows_before = len(store)
+    # 重跑：b 不再入选，c 新入选
+    assert store.append('2026-02-01', [project('a/a', 120), project('c/c', 7, today=5)]) == 2
+    assert len(store) == rows_before
+
+    for current in (store, timeseries.TimeSeriesStore(str(tmp_path))):
+        assert names_on(current, '2026-02-01') == ['a/a', 'c/c']
+        assert dict(current.top_gainers('2026-02')) == {'c/c': 5}
+        assert current.star_growth('a/a', 2, '2026-02-01') == 30
+        assert current.star_growth('b/b', 1, '2026-02-01') is None
+        assert current.history('a/a') == [('2026-01-31', 90, 1, -1), ('2026-02-01', 120, 1, -1)]
+
+def test_rerun_of_an_earlier_day(tmp_path):
+    store = timeseries.TimeSeriesStore(str(tmp_path))
+    store.append('2026-02-01', [project('a/a', 100), project('b/b', 50)])
+    store.append('2026-02-02', [project('a/a', 110)])
+    store.append('2026-02-01', [project('c/c', 5)])
+
+    reopened = timeseries.TimeSeriesStore(str(tmp_path))
+    assert names_on(reopened, '2026-02-01') == ['c/c']
+    assert names_on(reopened, '2026-02-02') == ['a/a']
+    assert reopened.history('b/b') == []
+
+def test_store_without_day_index_is_migrated(tmp_path):
+    store = timeseries.TimeSeriesStore(str(tmp_path))
+    store.append('2026-02-01', [project('a/a', 100)])
+    store.append('2026-02-02', [project('a/a', 110), project('b/b', 3)])
+    os.remove(os.path.join(store.root, 'days.i32'))
+
+    reopened = timeseries.TimeSeriesStore(str(tmp_path))
+    assert reopened.days == store.days
+    assert os.path.exists(os.path.join(store.root, 'days.i32'))
+    assert reopened.star_growth('a/a', 2, '2026-02-02') == 10
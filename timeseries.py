@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Star 数时间序列存储
+每次收集的项目按 (repo, date) 追加到 data/timeseries/ 下的列式文件：
+- repos.txt: 仓库名字典，行号即 repo id
+- date / repo / stars / forks / today 各一个 int32 列文件（array 模块直接读写）
+- days.i32: 每天有效行的 (日序号, 首行, 行数)，打开存储时只读这个小文件，查询只访问窗口内的行
+计数字符串（如 '458,524'、'583 stars today'）只在写入时解析一次，缺失值记为 -1；
+同一天重复写入（重跑）时替换该天的全部行
+
+用法:
+    python3 timeseries.py --rebuild                     # 从 data/days/ 重建
+    python3 timeseries.py --growth facebook/react --days 30
+    python3 timeseries.py --top-gainers 2026-02 --limit 10
+"""
+
+import os
+import sys
+import heapq
+import argparse
+from array import array
+from datetime import date, datetime, timedelta
+
+import project_store
+import trending_parser
+
+REPO_DIR = "/home/ubuntu/awesome-github-stars"
+STORE_SUBDIR = os.path.join('data', 'timeseries')
+COLUMNS = ('date', 'repo', 'stars', 'forks', 'today')
+MISSING = -1
+
+def parse_count(text):
+    """把 '458,524' / '583 stars today' 解析为整数，无法解析时返回 MISSING"""
+    if not text:
+        return MISSING
+    match = trending_parser.COUNT_RE.search(str(text))
+    if not match:
+        return MISSING
+    digits = match.group(1).replace(',', '')
+    return int(digits) if digits else MISSING
+
+def to_day(date_str):
+    """YYYY-MM-DD -> 日序号"""
+    return datetime.strptime(date_str, '%Y-%m-%d').toordinal()
+
+def from_day(ordinal):
+    """日序号 -> YYYY-MM-DD"""
+    return date.fromordinal(ordinal).isoformat()
+
+class TimeSeriesStore:
+    """
+    列式、只追加的 (repo, date) 时间序列
+    days 为 {日序号: (首行, 行数)}：每天的有效行是一段连续的行，查询只访问窗口内日期的行
+    """
+
+    def __init__(self, repo_dir=None):
+        self.root = os.path.join(repo_dir or REPO_DIR, STORE_SUBDIR)
+        self.repos = []
+        self.repo_ids = {}
+        self.columns = {name: array('i') for name in COLUMNS}
+        self.days = {}
+        self.load()
+
+    def _column_path(self, name):
+        return os.path.join(self.root, f"{name}.i32")
+
+    def _days_path(self):
+        return os.path.join(self.root, 'days.i32')
+
+    def load(self):
+        """读取字典、列文件和日期索引；列长度不一致（写入中断）时截断到最短的一列"""
+        repos_path = os.path.join(self.root, 'repos.txt')
+        if os.path.exists(repos_path):
+            with open(repos_path, 'r', encoding='utf-8') as f:
+                self.repos = [line.rstrip('\n') for line in f]
+        self.repo_ids = {name: index for index, name in enumerate(self.repos)}
+
+        for name in COLUMNS:
+            column = array('i')
+            path = self._column_path(name)
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    column.frombytes(f.read())
+            self.columns[name] = column
+        rows = min(len(column) for column in self.columns.values())
+        for name, column in self.columns.items():
+            if len(column) > rows:
+                del column[rows:]
+                with open(self._column_path(name), 'r+b') as f:
+                    f.truncate(rows * column.itemsize)
+        self.days = self._load_days(rows)
+
+    def _load_days(self, rows):
+        """
+        days.i32 为 (日序号, 首行, 行数) 三元组，同一天以最后一条为准；超出现有行数的（写入中断）忽略
+        旧版本没有日期索引时按 date 列中连续的行段生成一次（同一天以最后一段为准）并保存
+        """
+        path = self._days_path()
+        if os.path.exists(path):
+            entries = array('i')
+            with open(path, 'rb') as f:
+                entries.frombytes(f.read())
+            days = {}
+            for offset in range(0, len(entries) - 2, 3):
+                day, start, count = entries[offset:offset + 3]
+                if start + count <= rows:
+                    days[day] = (start, count)
+            return days
+        days, dates, start = {}, self.columns['date'], 0
+        for index in range(1, rows + 1):
+            if index == rows or dates[index] != dates[start]:
+                days[dates[start]] = (start, index - start)
+                start = index
+        if days:
+            entries = array('i')
+            for day, (start, count) in days.items():
+                entries.extend((day, start, count))
+            with open(path, 'wb') as f:
+                entries.tofile(f)
+        return days
+
+    def __len__(self):
+        return len(self.columns['date'])
+
+    def _repo_id(self, name, new_repos):
+        repo_id = self.repo_ids.get(name)
+        if repo_id is None:
+            repo_id = len(self.repos)
+            self.repos.append(name)
+            self.repo_ids[name] = repo_id
+            new_repos.append(name)
+        return repo_id
+
+    def append(self, date_str, projects):
+        """
+        写入一天的项目并替换该天之前写入的行（同一天重跑时以最后一次为准），返回写入的行数
+        该天是最后写入的一段时截断文件尾部后重写；更早的日期追加新行，旧行不再被日期索引引用
+        """
+        day = to_day(date_str)
+        new_repos = []
+        rows = {name: array('i') for name in COLUMNS}
+        for project in projects:
+            if not project.get('name'):
+                continue
+            rows['date'].append(day)
+            rows['repo'].append(self._repo_id(project['name'], new_repos))
+            rows['stars'].append(parse_count(project.get('stars')))
+            rows['forks'].append(parse_count(project.get('forks')))
+            rows['today'].append(parse_count(project.get('today_stars')))
+        if not rows['date'] and day not in self.days:
+            return 0
+
+        os.makedirs(self.root, exist_ok=True)
+        previous = self.days.get(day)
+        if previous and previous[0] + previous[1] == len(self):
+            for name, column in self.columns.items():
+                del column[previous[0]:]
+                with open(self._column_path(name), 'r+b') as f:
+                    f.truncate(previous[0] * column.itemsize)
+        start = len(self)
+        # 先写字典，再写列，最后写日期索引：中断时最多留下未被引用的仓库名或行
+        if new_repos:
+            with open(os.path.join(self.root, 'repos.txt'), 'a', encoding='utf-8') as f:
+                f.writelines(name + '\n' for name in new_repos)
+        for name in COLUMNS:
+            with open(self._column_path(name), 'ab') as f:
+                rows[name].tofile(f)
+            self.columns[name].extend(rows[name])
+        with open(self._days_path(), 'ab') as f:
+            array('i', (day, start, len(rows['date']))).tofile(f)
+        self.days[day] = (start, len(rows['date']))
+        return len(rows['date'])
+
+    def _window_rows(self, start_day, end_day, repo_id=None):
+        """日期范围内（含两端）每天的有效行，只访问窗口内的日期"""
+        repos = self.columns['repo']
+        rows = []
+        for day in range(start_day, end_day + 1):
+            span = self.days.get(day)
+            if span is None:
+                continue
+            day_rows = range(span[0], span[0] + span[1])
+            if repo_id is None:
+                rows.extend(day_rows)
+            else:
+                rows.extend(index for index in day_rows if repos[index] == repo_id)
+        return rows
+
+    def _gains(self, rows):
+        """
+        每个仓库在给定行集合上的增长：首尾两次都有总 star 数时取差值，
+        否则累加每日新增（Trending 页面通常只给出今日新增）
+        """
+        dates, repos = self.columns['date'], self.columns['repo']
+        stars, today = self.columns['stars'], self.columns['today']
+        first, last, summed = {}, {}, {}
+        for index in rows:
+            repo, day = repos[index], dates[index]
+            if stars[index] != MISSING:
+                if repo not in first or day < dates[first[repo]]:
+                    first[repo] = index
+                if repo not in last or day > dates[last[repo]]:
+                    last[repo] = index
+            if today[index] != MISSING:
+                summed[repo] = summed.get(repo, 0) + today[index]
+        gains = {}
+        for repo in set(first) | set(summed):
+            if repo in first and first[repo] != last[repo]:
+                gains[repo] = stars[last[repo]] - stars[first[repo]]
+            elif repo in summed:
+                gains[repo] = summed[repo]
+        return gains
+
+    def star_growth(self, repo, days, end_date=None):
+        """仓库最近 days 天的 star 增长，没有记录时返回 None"""
+        repo_id = self.repo_ids.get(repo)
+        if repo_id is None:
+            return None
+        end_day = to_day(end_date) if end_date else max(self.days, default=0)
+        rows = self._window_rows(end_day - days + 1, end_day, repo_id)
+        return self._gains(rows).get(repo_id)
+
+    def top_gainers(self, month=None, limit=10):
+        """某个月（YYYY-MM，默认当月）star 增长最多的仓库 [(repo, gain), ...]"""
+        month = month or datetime.now().strftime('%Y-%m')
+        start = datetime.strptime(month, '%Y-%m')
+        end = (start.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+        gains = self._gains(self._window_rows(start.toordinal(), end.toordinal()))
+        return [(self.repos[repo], gain) for repo, gain in heapq.nlargest(limit, gains.items(), key=lambda item: item[1])]
+
+    def history(self, repo):
+        """仓库的完整记录 [(date, stars, forks, today), ...]"""
+        repo_id = self.repo_ids.get(repo)
+        if repo_id is None:
+            return []
+        columns = self.columns
+        return sorted((from_day(day), columns['stars'][index], columns['forks'][index], columns['today'][index])
+                      for day, (start, count) in self.days.items()
+                      for index in range(start, start + count) if columns['repo'][index] == repo_id)
+
+def rebuild(repo_dir=None):
+    """删除现有列文件，按日期顺序从结构化存储重建"""
+    root = os.path.join(repo_dir or REPO_DIR, STORE_SUBDIR)
+    for file in ('repos.txt', 'days.i32') + tuple(f"{name}.i32" for name in COLUMNS):
+        path = os.path.join(root, file)
+        if os.path.exists(path):
+            os.remove(path)
+    store = TimeSeriesStore(repo_dir)
+    for date_str in project_store.list_days(repo_dir):
+        store.append(date_str, project_store.read_day(date_str, repo_dir) or [])
+    return store
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Star 数时间序列查询')
+    parser.add_argument('--rebuild', action='store_true', help='从 data/days/ 重建时间序列')
+    parser.add_argument('--growth', metavar='REPO', help='查询仓库的 star 增长')
+    parser.add_argument('--days', type=int, default=30, help='--growth 的天数窗口')
+    parser.add_argument('--top-gainers', metavar='YYYY-MM', nargs='?', const='', help='本月（或指定月份）增长最多的仓库')
+    parser.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    store = rebuild() if args.rebuild else TimeSeriesStore()
+    if args.rebuild:
+        print(f"已重建时间序列: {len(store)} 行，{len(store.repos)} 个仓库")
+    if args.growth:
+        growth = store.star_growth(args.growth, args.days)
+        print(f"{args.growth} 最近 {args.days} 天: {'无记录' if growth is None else f'+{growth:,} stars'}")
+    if args.top_gainers is not None:
+        for rank, (repo, gain) in enumerate(store.top_gainers(args.top_gainers or None, args.limit), 1):
+            print(f"{rank}. {repo} +{gain:,}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
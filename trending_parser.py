@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Trending 页面快速解析器
+基于 html.parser 的增量分词，只跟踪 article 内部需要的几个字段，
+不构建完整的 DOM 树；结果与 BeautifulSoup 路径完全一致
+"""
+
+import re
+from html.parser import HTMLParser
+
+COUNT_RE = re.compile(r'([\d,]+)')
+FEED_CHUNK_SIZE = 64 * 1024
+
+VOID_ELEMENTS = frozenset((
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr'
+))
+RAW_TEXT_ELEMENTS = frozenset(('script', 'style', 'template'))
+
+class _Article:
+    """单个 article 的解析状态（所有字段都取文档顺序中的第一个匹配）"""
+
+    def __init__(self, is_box_row):
+        self.is_box_row = is_box_row
+        self.chunks = []
+        self.h2 = None
+        self.h1 = None
+        self.desc_col9 = None
+        self.desc_any = None
+        self.stars = None
+        self.forks = None
+        self.language = None
+        self.today_stars = None
+
+    def text(self, frame):
+        return ''.join(self.chunks[frame['start']:frame['end']])
+
+class TrendingParser(HTMLParser):
+    """逐个 token 处理 Trending 页面，遇到 article 时才开始记录"""
+
+    def __init__(self, limit=None):
+        super().__init__(convert_charrefs=True)
+        self.limit = limit
+        self.articles = []
+        self.box_rows = 0
+        self.done = False
+        self._article = None
+        self._stack = []
+        self._raw_depth = 0
+
+    def _open(self, tag):
+        """打开的元素：记录其在 article 文本中的起止位置"""
+        frame = {'tag': tag, 'start': len(self._article.chunks), 'end': None}
+        self._stack.append(frame)
+        return frame
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        attrs = dict(attrs)
+        classes = (attrs.get('class') or '').split()
+
+        if self._article is None:
+            if tag == 'article':
+                is_box_row = 'Box-row' in classes
+                self.box_rows += is_box_row
+                self._article = _Article(is_box_row)
+                self._stack = [self._open(tag)]
+            return
+
+        article = self._article
+        if tag in RAW_TEXT_ELEMENTS:
+            self._raw_depth += 1
+        parent = self._stack[-1] if self._stack else None
+        if tag in VOID_ELEMENTS:
+            frame = None
+        else:
+            frame = self._open(tag)
+
+        if tag == 'h2' and article.h2 is None:
+            article.h2 = {'frame': frame, 'href': None}
+        elif tag == 'h1' and 'h3' in classes and article.h1 is None:
+            article.h1 = {'frame': frame, 'href': None}
+        elif tag == 'a':
+            for heading in (article.h2, article.h1):
+                # 标题仍未闭合，说明这个链接在标题内部
+                if heading and heading['href'] is None and heading['frame']['end'] is None:
+                    heading['href'] = attrs.get('href') or ''
+        elif tag == 'p':
+            if article.desc_any is None:
+                article.desc_any = frame
+            if article.desc_col9 is None and 'col-9' in classes:
+                article.desc_col9 = frame
+        elif tag == 'svg' and parent is not None:
+            if article.stars is None and 'octicon-star' in classes:
+                article.stars = parent
+            elif article.forks is None and 'octicon-repo-forked' in classes:
+                article.forks = parent
+        elif tag == 'span':
+            if article.language is None and attrs.get('itemprop') == 'programmingLanguage':
+                article.language = frame
+            if article.today_stars is None and ' '.join(classes) == 'd-inline-block float-sm-right':
+                article.today_stars = frame
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if self.done or self._article is None:
+            return
+        for index in range(len(self._stack) - 1, -1, -1):
+            if self._stack[index]['tag'] == tag:
+                break
+        else:
+            return
+        end = len(self._article.chunks)
+        for frame in self._stack[index:]:
+            frame['end'] = end
+            if frame['tag'] in RAW_TEXT_ELEMENTS:
+                self._raw_depth -= 1
+        del self._stack[index:]
+        if not self._stack:
+            self._finish_article()
+
+    def handle_data(self, data):
+        if self._article is not None and not self._raw_depth:
+            self._article.chunks.append(data)
+
+    def _finish_article(self):
+        self.articles.append(self._article)
+        self._article = None
+        self._raw_depth = 0
+        if self.limit is not None and self.box_rows >= self.limit:
+            self.done = True
+
+    def close(self):
+        super().close()
+        if self._article is not None:
+            end = len(self._article.chunks)
+            for frame in self._stack:
+                frame['end'] = end
+            self._stack = []
+            self._finish_article()
+
+def _text(article, frame):
+    return article.text(frame).strip() if frame is not None else None
+
+def _count(article, frame):
+    if frame is None:
+        return "N/A"
+    match = COUNT_RE.search(article.text(frame).strip())
+    return match.group(1) if match else "N/A"
+
+def article_to_project(article):
+    """把 article 状态转换为项目字典，没有仓库链接时返回 None"""
+    heading = article.h2 if article.h2 is not None else article.h1
+    if heading is None or heading['href'] is None:
+        return None
+    href = heading['href']
+    description = _text(article, article.desc_col9 if article.desc_col9 is not None else article.desc_any)
+    language = _text(article, article.language)
+    return {
+        'name': href.strip('/'),
+        'url': f"https://github.com{href}",
+        'description': description if description is not None else "No description available",
+        'stars': _count(article, article.stars),
+        'forks': _count(article, article.forks),
+        'language': language if language is not None else "Unknown",
+        'today_stars': _text(article, article.today_stars) or "",
+        'source': 'trending'
+    }
+
+def parse_trending_fast(html, limit=None):
+    """快速解析 Trending HTML；与 BeautifulSoup 路径一样优先使用 article.Box-row"""
+    parser = TrendingParser(limit)
+    # 分块喂入，取够 limit 个 article 后不再分词剩余页面
+    for offset in range(0, len(html), FEED_CHUNK_SIZE):
+        parser.feed(html[offset:offset + FEED_CHUNK_SIZE])
+        if parser.done:
+            break
+    parser.close()
+    articles = parser.articles
+    if parser.box_rows:
+        articles = [article for article in articles if article.is_box_row]
+    projects = []
+    for article in articles[:limit]:
+        project = article_to_project(article)
+        if project:
+            projects.append(project)
+    return projects
@@ -7,12 +7,33 @@
 """
 
 import os
-import re
+import sys
+import json
+import hashlib
 from datetime import datetime
 from collections import Counter
 
+import aggregate_cache
+import metrics
+import output_writer
+import project_store
+import search_index
+import static_api
+
 REPO_DIR = "/home/ubuntu/awesome-github-stars"
 
+# 月度索引清单：每个月的 {每日文件: 内容哈希} 和生成的 README 状态，只重建输入变化的月份
+MONTH_MANIFEST_FILE = os.path.join('data', 'month_manifest.json')
+MONTH_MANIFEST_VERSION = 1
+# 月度索引模板版本：修改 render_monthly_index 的输出时加 1，所有月份都会重新生成
+MONTH_TEMPLATE_VERSION = 2
+
+# 主 README 导航只列出最近的月份和年份（页面大小固定），更早的年份通过年度索引的「上一年」链接访问
+RECENT_MONTHS = 6
+RECENT_YEARS = 5
+# 年度索引模板版本：修改 render_year_index 的输出时加 1
+YEAR_TEMPLATE_VERSION = 1
+
 def log(message, level="INFO"):
     """日志输出"""
     timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -25,59 +46,50 @@ def log(message, level="INFO"):
     emoji = level_emoji.get(level, "📝")
     print(f"[{timestamp}] {emoji} [{level}] {message}")
 
-def extract_languages_from_file(file_path):
-    """从 Markdown 文件中提取编程语言"""
-    languages = []
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            # 匹配 **编程语言**: `XXX`
-            matches = re.findall(r'\*\*编程语言\*\*:\s*`([^`]+)`', content)
-            languages.extend(matches)
-    except Exception as e:
-        log(f"读取文件失败 {file_path}: {e}", "WARNING")
-    return languages
-
-def update_monthly_index():
-    """更新月度索引（增强版）"""
-    today = datetime.now()
-    year = today.strftime('%Y')
-    month = today.strftime('%m-%B')
-    month_dir = os.path.join(REPO_DIR, year, month)
-    
-    if not os.path.exists(month_dir):
-        log(f"月度目录不存在: {month_dir}", "ERROR")
-        return False
-    
-    # 获取所有日期文件
-    date_files = []
-    for file in os.listdir(month_dir):
-        if file.endswith('.md') and file != 'README.md':
-            date_files.append(file.replace('.md', ''))
-    
-    date_files.sort()
-    
-    if not date_files:
-        log("没有找到任何日期文件", "WARNING")
-        return False
+def load_day_projects(file_path):
+    """读取某个每日文件对应的项目记录（优先使用结构化存储）"""
+    date_str = os.path.basename(file_path)[:-len('.md')]
+    metrics.incr('files_read')
+    projects = project_store.load_day(date_str, markdown_path=file_path, repo_dir=REPO_DIR)
+    if projects is None:
+        log(f"读取项目记录失败 {file_path}", "WARNING")
+        return []
+    return projects
+
+def refresh_cache(rebuild=False, preloaded=None):
+    """增量更新统计缓存，只读取新增或变化的每日文件（preloaded 中已有的直接使用）"""
+    cache, stats = aggregate_cache.update_cache(load_day_projects, repo_dir=REPO_DIR, rebuild=rebuild,
+                                                preloaded=preloaded)
+    aggregate_cache.save_cache(cache, REPO_DIR)
+    log(f"统计缓存: 新增 {stats['added']}，变化 {stats['changed']}，删除 {stats['removed']}，复用 {stats['reused']}", "INFO")
+    return cache
+
+def refresh_search_index(rebuild=False, preloaded=None):
+    """增量更新归档检索索引（只把新增或变化的每日文件追加为新段），返回 stats"""
+    stats = search_index.refresh(load_day_projects, repo_dir=REPO_DIR, preloaded=preloaded, rebuild=rebuild)
+    log(f"检索索引: 新增 {stats['added']}，变化 {stats['changed']}，删除 {stats['removed']}，共 {stats['docs']} 条记录"
+        f"{'（已合并段）' if stats['compacted'] else ''}", "INFO")
+    return stats
+
+def refresh_static_api(rebuild=False, preloaded=None):
+    """增量更新 api/ 下的静态 JSON 分片（只重写受影响的日、月、语言分片）"""
+    api, stats = static_api.refresh(load_day_projects, repo_dir=REPO_DIR, preloaded=preloaded, rebuild=rebuild)
+    log(f"静态 API: 新增 {stats['added']}，变化 {stats['changed']}，删除 {stats['removed']}，"
+        f"写入 {stats['shards']} 个分片", "INFO")
+    return api
+
+def render_monthly_index(year, month, day_counts, language_counter):
+    """逐段生成月度索引内容（生成器）"""
+    date_files = list(day_counts)
+    total_language_count = sum(language_counter.values())
     
     # 统计信息
     total_days = len(date_files)
-    total_projects = total_days * 15
-    
-    # 分析语言分布
-    all_languages = []
-    for date_file in date_files:
-        file_path = os.path.join(month_dir, f"{date_file}.md")
-        languages = extract_languages_from_file(file_path)
-        all_languages.extend(languages)
-    
-    # 统计语言出现次数
-    language_counter = Counter(all_languages)
+    total_projects = sum(day_counts.values())
     top_languages = language_counter.most_common(10)
     
     # 生成索引内容
-    content = f"""# 📅 {year}年{int(month[:2])}月 - GitHub 项目收集
+    yield f"""# 📅 {year}年{int(month[:2])}月 - GitHub 项目收集
 
 ## 📊 本月统计
 
@@ -93,19 +105,19 @@ def update_monthly_index():
 """
     
     for date in date_files:
-        content += f"| {date} | 15 | [查看详情](./{date}.md) |\n"
+        yield f"| {date} | {day_counts[date]} | [查看详情](./{date}.md) |\n"
     
     # 添加语言统计
     if top_languages:
-        content += f"""
+        yield f"""
 ## 🔥 本月热门语言
 
 """
         for idx, (lang, count) in enumerate(top_languages, 1):
-            percentage = (count / len(all_languages)) * 100 if all_languages else 0
-            content += f"{idx}. **{lang}** - {count} 个项目 ({percentage:.1f}%)\n"
+            percentage = (count / total_language_count) * 100 if total_language_count else 0
+            yield f"{idx}. **{lang}** - {count} 个项目 ({percentage:.1f}%)\n"
     
-    content += f"""
+    yield f"""
 ## 📈 趋势分析
 
 本月收集的项目涵盖了 {len(language_counter)} 种编程语言，展现了开源社区的多样性。热门语言反映了当前技术发展趋势和开发者关注重点。
@@ -119,44 +131,271 @@ def update_monthly_index():
 
 ---
 
-**返回**: [主页](../../README.md)  
+**返回**: [{year} 年索引](../README.md) · [主页](../../README.md)  
 **仓库地址**: https://github.com/DannyFish-11/awesome-github-stars
 """
+
+def write_month_index(month_key, cache):
+    """生成某个月（'2026/01-January'）的月度索引，返回 True 表示文件被写入"""
+    year, month = month_key.split('/')
+    entries = aggregate_cache.month_entries(cache, month_key)
+    
+    # 按日期顺序汇总语言分布
+    day_counts = {}
+    language_counter = Counter()
+    for rel_path, entry in entries:
+        day_counts[os.path.basename(rel_path)[:-len('.md')]] = entry['projects']
+        language_counter.update(entry['languages'])
+    
+    # 保存索引文件（逐段写入）
+    index_file = os.path.join(REPO_DIR, year, month, 'README.md')
+    if output_writer.write_if_changed(index_file, render_monthly_index(year, month, day_counts, language_counter)):
+        log(f"月度索引已更新: {index_file}", "SUCCESS")
+        return True
+    log(f"月度索引内容未变化，跳过写入: {index_file}", "INFO")
+    return False
+
+def update_monthly_index(cache=None, date=None):
+    """更新单个月份的月度索引（增强版），date 指定要更新的月份，默认当月"""
+    target = date or datetime.now()
+    year = target.strftime('%Y')
+    month = target.strftime('%m-%B')
+    month_dir = os.path.join(REPO_DIR, year, month)
+    
+    if not os.path.exists(month_dir):
+        log(f"月度目录不存在: {month_dir}", "ERROR")
+        return False
     
-    # 保存索引文件
-    index_file = os.path.join(month_dir, 'README.md')
-    with open(index_file, 'w', encoding='utf-8') as f:
-        f.write(content)
+    if cache is None:
+        cache = refresh_cache()
     
-    log(f"月度索引已更新: {index_file}", "SUCCESS")
+    if not aggregate_cache.month_entries(cache, f"{year}/{month}"):
+        log("没有找到任何日期文件", "WARNING")
+        return False
+    
+    write_month_index(f"{year}/{month}", cache)
     return True
 
-def update_main_readme():
-    """更新主 README（增强版）"""
+def empty_month_manifest():
+    """空清单结构"""
+    return {'version': MONTH_MANIFEST_VERSION, 'template': MONTH_TEMPLATE_VERSION, 'months': {}}
+
+def load_month_manifest():
+    """读取月度索引清单，不存在、版本或模板版本不符时返回空清单（所有月份都会重建）"""
+    path = os.path.join(REPO_DIR, MONTH_MANIFEST_FILE)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return empty_month_manifest()
+    if manifest.get('version') != MONTH_MANIFEST_VERSION or manifest.get('template') != MONTH_TEMPLATE_VERSION:
+        return empty_month_manifest()
+    return manifest
+
+def save_month_manifest(manifest):
+    """原子保存清单（可随时重建，不纳入版本控制，不计入输出统计）"""
+    path = os.path.join(REPO_DIR, MONTH_MANIFEST_FILE)
+    output_writer.write_if_changed(path, json.dumps(manifest, ensure_ascii=False, separators=(',', ':')), track=False)
+    return path
+
+def month_file_hashes(entries, previous):
+    """
+    某月每日文件的 {文件名: [mtime_ns, size, sha256]}
+    mtime 和 size 与上次相同的文件沿用记录的哈希，不重新读取
+    """
+    hashes = {}
+    for rel_path, entry in entries:
+        name = rel_path.rsplit('/', 1)[1]
+        old = previous.get(name)
+        if old and old[0] == entry['mtime_ns'] and old[1] == entry['size']:
+            hashes[name] = old
+        else:
+            hashes[name] = [entry['mtime_ns'], entry['size'], output_writer.file_digest(os.path.join(REPO_DIR, rel_path))]
+    return hashes
+
+def readme_state(month_key):
+    """月度 README 的 [mtime_ns, size]，不存在时为 None"""
+    try:
+        stat = os.stat(os.path.join(REPO_DIR, month_key, 'README.md'))
+    except FileNotFoundError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+def update_month_indexes(cache=None, force=False):
+    """
+    重建所有输入发生变化的月份的月度索引
+    某月需要重建：每日文件增删或内容哈希变化、README 缺失或被改动、模板版本变化（force 时全部重建）；
+    渲染是纯 CPU 工作，受 GIL 限制线程池没有收益，逐月生成；返回是否全部成功
+    """
+    if cache is None:
+        cache = refresh_cache()
+    manifest = load_month_manifest()
+    
+    months = {}
+    for rel_path, entry in sorted(cache['files'].items()):
+        months.setdefault(entry['month'], []).append((rel_path, entry))
+    
+    dirty, hashes = [], {}
+    for month_key, entries in months.items():
+        old = manifest['months'].get(month_key, {})
+        hashes[month_key] = month_file_hashes(entries, old.get('files', {}))
+        digests = {name: state[2] for name, state in hashes[month_key].items()}
+        old_digests = {name: state[2] for name, state in old.get('files', {}).items()}
+        if force or digests != old_digests or readme_state(month_key) != old.get('readme'):
+            dirty.append(month_key)
+    
+    if not months:
+        log("没有找到任何日期文件", "WARNING")
+        return False
+    log(f"月度索引: {len(dirty)} 个月需要重建，{len(months) - len(dirty)} 个月未变化", "INFO")
+    
+    failed = []
+    for month_key in dirty:
+        try:
+            write_month_index(month_key, cache)
+        except Exception as e:
+            log(f"生成月度索引失败 {month_key}: {e}", "ERROR")
+            failed.append(month_key)
+    
+    # 失败的月份不记录，下次运行仍会重建；已没有每日文件的月份从清单中移除
+    manifest['months'] = {month_key: {'files': hashes[month_key], 'readme': readme_state(month_key)}
+                          for month_key in months if month_key not in failed}
+    save_month_manifest(manifest)
+    return not failed
+
+def month_label(month_key):
+    """'2026/01-January' -> '2026年1月'"""
+    year, month = month_key.split('/')
+    return f"{year}年{int(month[:2])}月"
+
+def navigation_months(cache):
+    """
+    导航用的月份列表 [(month_key, 天数, 项目数)]（按时间升序），月份和每日文件来自月度索引清单，
+    项目数来自统计缓存；清单与缓存的月份不一致（月度索引尚未更新）时先更新月度索引
+    """
+    manifest = load_month_manifest()
+    if set(manifest['months']) != set(cache['months']):
+        update_month_indexes(cache)
+        manifest = load_month_manifest()
+    return manifest, [(month_key, len(manifest['months'][month_key]['files']),
+                       cache['months'].get(month_key, {}).get('projects', 0))
+                      for month_key in sorted(manifest['months'])]
+
+def render_year_index(year, months, cache, previous_year):
+    """年度索引（每年最多 12 行，页面大小固定）"""
+    language_counter = Counter()
+    for month_key, _, _ in months:
+        language_counter.update(cache['months'].get(month_key, {}).get('languages', {}))
+    top_languages = [lang for lang, _ in aggregate_cache.top_languages(language_counter, 5)]
+    previous = f"[{previous_year} 年](../{previous_year}/) · " if previous_year else ''
+    
+    lines = [f"""# 📆 {year} 年 - GitHub 项目收集
+
+## 📊 年度统计
+
+- **收集月份**: {len(months)} 个月
+- **收集天数**: {sum(days for _, days, _ in months)} 天
+- **项目总数**: {sum(projects for _, _, projects in months)} 个
+- **热门语言**: {', '.join(top_languages) or '-'}
+
+## 📋 每月记录
+
+| 月份 | 天数 | 项目数 | 热门语言 |
+|------|------|--------|----------|
+"""]
+    for month_key, days, projects in months:
+        month_languages = cache['months'].get(month_key, {}).get('languages', {})
+        top = ', '.join(lang for lang, _ in aggregate_cache.top_languages(month_languages, 3)) or '-'
+        lines.append(f"| [{month_label(month_key)}](./{month_key.split('/')[1]}/) | {days} | {projects} | {top} |\n")
+    lines.append(f"""
+---
+
+**返回**: {previous}[主页](../README.md)  
+**仓库地址**: https://github.com/DannyFish-11/awesome-github-stars
+""")
+    return ''.join(lines)
+
+def year_signature(year, months, manifest, previous_year):
+    """年度索引的输入摘要：各月每日文件的内容哈希、上一年和模板版本"""
+    digests = {month_key: sorted(state[2] for state in manifest['months'][month_key]['files'].values())
+               for month_key, _, _ in months}
+    data = json.dumps([YEAR_TEMPLATE_VERSION, year, previous_year, digests], sort_keys=True)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+def update_year_indexes(manifest, months, cache):
+    """
+    重新生成输入变化的年度索引（YYYY/README.md），返回生成的年份
+    日常运行只有当年的摘要变化，其它年份不读不写
+    """
+    by_year = {}
+    for row in months:
+        by_year.setdefault(row[0].split('/')[0], []).append(row)
+    signatures = manifest.get('years', {})
+    updated = []
+    previous_year = None
+    for year, year_months in sorted(by_year.items()):
+        signature = year_signature(year, year_months, manifest, previous_year)
+        path = os.path.join(REPO_DIR, year, 'README.md')
+        if signatures.get(year) != signature or not os.path.exists(path):
+            output_writer.write_if_changed(path, render_year_index(year, year_months, cache, previous_year))
+            signatures[year] = signature
+            updated.append(year)
+        previous_year = year
+    manifest['years'] = {year: signature for year, signature in signatures.items() if year in by_year}
+    if updated:
+        save_month_manifest(manifest)
+    return updated
+
+def render_navigation(months, manifest):
+    """
+    主 README 的快速导航：最新一天、最近 RECENT_MONTHS 个月和最近 RECENT_YEARS 年
+    返回 (Markdown, 最新每日文件的相对路径)
+    """
+    if not months:
+        return "### 最新收集\n暂无收集记录\n", None
+    latest_month = months[-1][0]
+    latest_day = max(manifest['months'][latest_month]['files'])[:-len('.md')]
+    lines = [f"""### 最新收集
+查看最新收集的项目：[{latest_day}](./{latest_month}/{latest_day}.md) · [{month_label(latest_month)}](./{latest_month}/)
+
+### 最近 {RECENT_MONTHS} 个月
+"""]
+    for month_key, days, projects in reversed(months[-RECENT_MONTHS:]):
+        lines.append(f"- [{month_label(month_key)}](./{month_key}/) - {days} 天，{projects} 个项目\n")
+    
+    years = {}
+    for month_key, days, projects in months:
+        year = years.setdefault(month_key.split('/')[0], [0, 0, 0])
+        year[0] += 1
+        year[1] += days
+        year[2] += projects
+    recent_years = sorted(years, reverse=True)[:RECENT_YEARS]
+    lines.append("\n### 按年浏览\n")
+    for year in recent_years:
+        month_count, days, projects = years[year]
+        lines.append(f"- [{year} 年](./{year}/) - {month_count} 个月，{days} 天，{projects} 个项目\n")
+    if len(years) > RECENT_YEARS:
+        lines.append(f"- 更早的 {len(years) - RECENT_YEARS} 年：从 [{recent_years[-1]} 年](./{recent_years[-1]}/) 的「上一年」链接依次查看\n")
+    return ''.join(lines), f"{latest_month}/{latest_day}.md"
+
+def update_main_readme(cache=None):
+    """更新主 README（增强版）：导航只包含最近的月份和年份，完整列表在各年的年度索引中"""
     today = datetime.now().strftime('%Y-%m-%d')
     
     readme_path = os.path.join(REPO_DIR, 'README.md')
     
-    # 统计总项目数和天数
-    total_days = 0
-    total_projects = 0
-    all_languages = []
+    if cache is None:
+        cache = refresh_cache()
     
-    for root, dirs, files in os.walk(REPO_DIR):
-        for file in files:
-            if file.endswith('.md') and file != 'README.md' and '/' in root:
-                # 排除根目录的 README
-                if root != REPO_DIR:
-                    total_days += 1
-                    total_projects += 15
-                    # 提取语言信息
-                    file_path = os.path.join(root, file)
-                    languages = extract_languages_from_file(file_path)
-                    all_languages.extend(languages)
+    manifest, months = navigation_months(cache)
+    update_year_indexes(manifest, months, cache)
+    navigation, latest_path = render_navigation(months, manifest)
     
-    # 统计语言
-    language_counter = Counter(all_languages)
-    top_5_languages = [lang for lang, _ in language_counter.most_common(5)]
+    # 统计总项目数和天数（来自增量缓存）
+    total_days = cache['totals']['days']
+    total_projects = cache['totals']['projects']
+    language_counter = cache['languages']
+    top_5_languages = [lang for lang, _ in aggregate_cache.top_languages(language_counter, 5)]
     
     content = f"""# 🌟 Awesome GitHub Stars Collection
 
@@ -191,11 +430,17 @@ awesome-github-stars/
 ├── README.md                    # 项目说明（本文件）
 ├── PROJECT_DOCUMENTATION.md     # 完整项目文档
 ├── daily_collect.sh            # 每日自动收集脚本
+├── pipeline.py                 # 每日流水线入口
+├── git_commit.py               # Git 提交阶段
 ├── collect_projects.py         # 项目收集核心脚本
 ├── update_index.py             # 索引更新脚本
 ├── logs/                       # 运行日志
 │   └── collect_YYYY-MM-DD.log
+├── data/                       # 结构化数据
+│   └── days/YYYY/YYYY-MM-DD.jsonl
+├── api/                        # 静态 JSON API（days/ months/ languages/ manifest.json）
 ├── 2026/                       # 按年份分类
+│   ├── README.md              # 年度索引
 │   └── 01-January/            # 按月份分类
 │       ├── README.md          # 月度索引
 │       ├── 2026-01-20.md      # 每日收集记录
@@ -226,12 +471,7 @@ awesome-github-stars/
 
 ## 🔗 快速导航
 
-### 最新收集
-查看最新收集的项目：[点击这里](./2026/01-January/)
-
-### 按月浏览
-- [2026年1月](./2026/01-January/) - {total_days} 天，{total_projects} 个项目
-
+{navigation}
 ## 🚀 使用说明
 
 ### 浏览项目
@@ -248,7 +488,7 @@ git clone https://github.com/DannyFish-11/awesome-github-stars.git
 cd awesome-github-stars
 
 # 查看项目
-cat 2026/01-January/2026-01-22.md
+cat {latest_path or '2026/01-January/2026-01-22.md'}
 ```
 
 ### 自动化部署
@@ -284,26 +524,50 @@ MIT License - 数据来源于 GitHub 公开信息
 **维护状态**: 🟢 活跃维护中
 """
     
-    with open(readme_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-    
-    log(f"主 README 已更新 (总计 {total_days} 天, {total_projects} 个项目)", "SUCCESS")
+    if output_writer.write_if_changed(readme_path, content):
+        log(f"主 README 已更新 (总计 {total_days} 天, {total_projects} 个项目)", "SUCCESS")
+    else:
+        log("主 README 内容未变化，跳过写入", "INFO")
     return True
 
-def main():
-    """主函数"""
+def verify_cache():
+    """从头重新计算统计，并与现有缓存对比"""
+    cached = aggregate_cache.load_cache(REPO_DIR)
+    cache = refresh_cache(rebuild=True)
+    if cached['files']:
+        differences = aggregate_cache.compare_caches(cache, cached)
+        if differences:
+            log(f"缓存与重新计算的结果不一致: {', '.join(differences)}，已用重新计算的结果替换", "WARNING")
+        else:
+            log("缓存校验通过，与重新计算的结果一致", "SUCCESS")
+    return cache
+
+def main(argv=None):
+    """主函数（--rebuild: 从头重新计算统计缓存并重建所有月度索引）"""
+    argv = sys.argv[1:] if argv is None else argv
+    rebuild = '--rebuild' in argv
+    
     log("=" * 60, "INFO")
     log("开始更新索引文件", "INFO")
     log("=" * 60, "INFO")
     
     try:
-        # 更新月度索引
-        log("步骤 1/2: 更新月度索引...", "INFO")
-        success1 = update_monthly_index()
+        with metrics.stage('index'):
+            cache = verify_cache() if rebuild else refresh_cache()
+            
+            # 更新月度索引
+            log("步骤 1/2: 更新月度索引...", "INFO")
+            success1 = update_month_indexes(cache, force=rebuild)
+            
+            # 更新主 README
+            log("步骤 2/2: 更新主 README...", "INFO")
+            success2 = update_main_readme(cache)
+            
+            refresh_search_index(rebuild)
+            refresh_static_api(rebuild)
         
-        # 更新主 README
-        log("步骤 2/2: 更新主 README...", "INFO")
-        success2 = update_main_readme()
+        log(f"输出文件: {output_writer.summary()}", "INFO")
+        metrics.write_report('index', 'success' if success1 and success2 else 'failed', REPO_DIR)
         
         if success1 and success2:
             log("=" * 60, "INFO")
@@ -318,8 +582,8 @@ def main():
         log(f"更新失败: {e}", "ERROR")
         import traceback
         log(traceback.format_exc(), "ERROR")
+        metrics.write_report('index', 'failed', REPO_DIR)
         return 1
 
 if __name__ == "__main__":
-    import sys
     sys.exit(main())